@@ -0,0 +1,97 @@
+"""Full-text search latency on a synthetic corpus.
+
+Builds an on-disk ``ArticleSearchIndex`` over the Zipf corpus from
+``bench_related_articles`` and times prefix, multi-word and filtered queries.
+
+    python -m benchmarks.bench_article_search --articles 50000 --queries 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_related_articles import CATEGORIES, synthetic_corpus
+from content_manager.services.article_search import ArticleSearchIndex
+
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "sa", "to", "vel", "na", "pri", "ush", "el", "gor", "fa", "tin", "ob", "ze"]
+
+
+def syllable_vocabulary(size: int, rng: random.Random) -> list[str]:
+    # "word123"-style terms all share one prefix, which makes every prefix query match everything.
+    words: set[str] = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words, key=lambda word: (len(word), word))
+
+
+class StaticCorpus:
+    def __init__(self, records) -> None:
+        self._records = records
+
+    def snapshot(self):
+        return 1, self._records
+
+
+def make_queries(records, count: int, rng: random.Random) -> list[dict]:
+    queries = []
+    for _ in range(count):
+        words = rng.choice(records).body.split()
+        shape = rng.choice(["prefix", "words", "filtered"])
+        if shape == "prefix":
+            queries.append({"query": rng.choice(words)[:4]})
+        elif shape == "words":
+            queries.append({"query": " ".join(rng.sample(words, 2))})
+        else:
+            queries.append({"query": rng.choice(words), "category": rng.choice(CATEGORIES), "tags": ["Tag 1"]})
+    return queries
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_article_search")
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    records = synthetic_corpus(args.articles, rng, syllable_vocabulary(5000, rng))
+    with tempfile.TemporaryDirectory(prefix="bench-search-") as tmp:
+        db_path = Path(tmp) / "search.sqlite3"
+        index = ArticleSearchIndex(StaticCorpus(records), db_path)
+        started = time.perf_counter()
+        index.sync()
+        build_ms = (time.perf_counter() - started) * 1000
+
+        reopened = ArticleSearchIndex(StaticCorpus(records), db_path)
+        started = time.perf_counter()
+        reopened.sync()
+        warm_sync_ms = (time.perf_counter() - started) * 1000
+
+        samples = []
+        for query in make_queries(records, args.queries, rng):
+            started = time.perf_counter()
+            reopened.search(**query)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        print(json.dumps({
+            "articles": args.articles,
+            "index_build_ms": round(build_ms, 1),
+            "warm_sync_ms": round(warm_sync_ms, 1),
+            "index_mb": round(db_path.stat().st_size / (1024 * 1024), 1),
+            "query_ms": {
+                "median": round(statistics.median(samples), 2),
+                "p95": round(samples[min(int(len(samples) * 0.95), len(samples) - 1)], 2),
+                "max": round(samples[-1], 2),
+            },
+        }))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
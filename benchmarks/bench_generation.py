@@ -0,0 +1,184 @@
+"""End-to-end generation benchmark against the local Responses API stand-in.
+
+Runs the same steps as ``generate_article_from_sources`` against the real article
+corpus and timestamps each one: preparation (taxonomy and related posts), video
+frame extraction, payload budgeting, and the model request. Synthetic media is
+registered as finished upload jobs, so no EXIF reads or geocoding lookups happen.
+Request sizes come from the stub server's payload log.
+
+    python -m benchmarks.bench_generation --iterations 5 --latency-ms 300 --stream
+
+Video mixes need ffmpeg and ffprobe on PATH; they are skipped when either is missing.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from benchmarks.stub_responses_server import StubResponsesServer, StubSettings
+from content_manager.config import load_config
+from content_manager.services.article_generation import ArticleGenerator
+from content_manager.services.generation_workflow import (
+    finalize_generation,
+    payload_budget_for,
+    prepare_generation,
+    prepare_media_context_for_generation,
+)
+from content_manager.services.http_transport import PooledTransport
+from content_manager.services.payload_budget import fit_request_to_budget
+from content_manager.state import AppState
+
+# name -> (image count, video count)
+MEDIA_MIXES = {
+    "1-image": (1, 0),
+    "6-images": (6, 0),
+    "1-video": (0, 1),
+    "mixed": (3, 2),
+}
+JOB_METADATA = {
+    "location_name": "Kirkland, Washington, United States",
+    "captured_at": "2026-03-17T19:00:00",
+    "time_of_day": "evening",
+}
+
+
+def make_image(path: Path, width: int, height: int) -> None:
+    from PIL import Image
+
+    # Noise defeats JPEG compression, so this is a worst case for request size.
+    Image.frombytes("RGB", (width, height), os.urandom(width * height * 3)).save(path, "JPEG", quality=85)
+
+
+def make_video(path: Path, seconds: int) -> None:
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-f", "lavfi", "-i", f"testsrc=duration={seconds}:size=1280x720:rate=30",
+            "-pix_fmt", "yuv420p", str(path),
+        ],
+        capture_output=True,
+        check=True,
+    )
+
+
+def register_jobs(state: AppState, media_dir: Path, image_count: int, video_count: int, args) -> list[str]:
+    job_ids = []
+    for index in range(image_count):
+        path = media_dir / f"image-{index:02d}.jpg"
+        if not path.exists():
+            make_image(path, args.image_width, args.image_height)
+        job_ids.append(f"image-{index:02d}")
+        state.media_jobs[job_ids[-1]] = {
+            "name": path.stem, "media_type": "image", "status": "done", "input_path": str(path), **JOB_METADATA,
+        }
+    for index in range(video_count):
+        path = media_dir / f"video-{index:02d}.mp4"
+        if not path.exists():
+            make_video(path, args.video_seconds)
+        job_ids.append(f"video-{index:02d}")
+        state.media_jobs[job_ids[-1]] = {
+            "name": path.stem, "media_type": "video", "status": "done",
+            "input_path": str(path), "output_path": str(path), **JOB_METADATA,
+        }
+    return job_ids
+
+
+def run_once(config, generator: ArticleGenerator, state: AppState, job_ids: list[str], stream: bool) -> dict:
+    started = time.perf_counter()
+    prepared = prepare_generation(config=config, media_job_ids=job_ids, state=state, force_regenerate=True)
+    prepared_at = time.perf_counter()
+    prepared_context, temp_dir = prepare_media_context_for_generation(prepared.media_context)
+    frames_at = time.perf_counter()
+    budget_dir = None
+    try:
+        request, trim_warnings, budget_dir = fit_request_to_budget(
+            replace(prepared.request, media_context=prepared_context),
+            payload_budget_for(config),
+        )
+        budgeted_at = time.perf_counter()
+        if stream:
+            generated = next(
+                event["result"] for event in generator.generate_stream(request) if event["type"] == "result"
+            )
+        else:
+            generated = generator.generate(request)
+    finally:
+        for directory in (temp_dir, budget_dir):
+            if directory is not None:
+                directory.cleanup()
+    requested_at = time.perf_counter()
+    finalize_generation(prepared, generated, trim_warnings=trim_warnings)
+    return {
+        "total_ms": (time.perf_counter() - started) * 1000,
+        "prepare_ms": (prepared_at - started) * 1000,
+        "frames_ms": (frames_at - prepared_at) * 1000,
+        "budget_ms": (budgeted_at - frames_at) * 1000,
+        "request_ms": (requested_at - budgeted_at) * 1000,
+        "trimmed": bool(trim_warnings),
+    }
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "median": round(statistics.median(ordered), 1),
+        "p95": round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)], 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_generation")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--mix", action="append", choices=sorted(MEDIA_MIXES), help="Limit to these media mixes")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stream", action="store_true", help="Use the streaming generation path")
+    parser.add_argument("--image-width", type=int, default=1920)
+    parser.add_argument("--image-height", type=int, default=1080)
+    parser.add_argument("--video-seconds", type=int, default=6)
+    args = parser.parse_args(argv)
+
+    has_ffmpeg = bool(shutil.which("ffmpeg") and shutil.which("ffprobe"))
+    settings = StubSettings(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    with StubResponsesServer(settings=settings, seed=0) as server, tempfile.TemporaryDirectory(prefix="bench-generation-") as tmp:
+        config = replace(load_config(), openai_api_key="stub", openai_base_url=server.url)
+        generator = ArticleGenerator(
+            api_key=config.openai_api_key,
+            model=config.openai_model,
+            api_base=config.openai_base_url,
+            request_fn=PooledTransport(backoff_base_seconds=0.01, backoff_max_seconds=0.05),
+        )
+        for name in args.mix or list(MEDIA_MIXES):
+            image_count, video_count = MEDIA_MIXES[name]
+            if video_count and not has_ffmpeg:
+                print(json.dumps({"mix": name, "skipped": "ffmpeg/ffprobe not found in PATH"}))
+                continue
+            state = AppState()
+            job_ids = register_jobs(state, Path(tmp), image_count, video_count, args)
+            first_record = len(server.records)
+            runs = [run_once(config, generator, state, job_ids, args.stream) for _ in range(args.iterations)]
+            records = [record for record in server.records[first_record:] if record.status == 200]
+            print(json.dumps({
+                "mix": name,
+                "iterations": args.iterations,
+                "stream": args.stream,
+                **{key: summarize([run[key] for run in runs]) for key in ("total_ms", "prepare_ms", "frames_ms", "budget_ms", "request_ms")},
+                "trimmed_runs": sum(run["trimmed"] for run in runs),
+                "request_bytes": max((record.request_bytes for record in records), default=0),
+                "images_sent": max((record.image_count for record in records), default=0),
+                "retried_requests": len(server.records) - first_record - len(records),
+            }))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
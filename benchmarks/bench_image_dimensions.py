@@ -0,0 +1,85 @@
+"""Header-sniffing image dimensions versus Pillow on the site's media library.
+
+``headers`` is ``image_dimensions`` from the carousel_embed plugin. ``pillow``
+is ``Image.open(...).size``, which is what the plugin used before. Pillow's
+size ignores EXIF orientation and fails on AVIF without an AVIF plugin, so its
+failures are counted separately. The header reader's agreement with Pillow is
+checked on every file both can read, after applying EXIF orientation.
+
+    python -m benchmarks.bench_image_dimensions --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "pelican-plugins"))
+
+from carousel_embed.image_dimensions import image_dimensions  # noqa: E402
+
+EXTENSIONS = {".avif", ".heic", ".jpg", ".jpeg", ".png", ".webp"}
+
+
+def pillow_dimensions(path: Path):
+    try:
+        with Image.open(path) as image:
+            return image.size, image.getexif().get(0x0112, 1)
+    except OSError:
+        return None, 1
+
+
+def timed_pass(paths: list[Path], reader) -> float:
+    started = time.perf_counter()
+    for path in paths:
+        reader(path)
+    return (time.perf_counter() - started) * 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_image_dimensions")
+    parser.add_argument("--media-dir", type=Path, default=REPO_ROOT / "content" / "media")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    paths = sorted(path for path in args.media_dir.rglob("*") if path.suffix.lower() in EXTENSIONS and path.is_file())
+    by_extension: dict[str, int] = {}
+    for path in paths:
+        by_extension[path.suffix.lower()] = by_extension.get(path.suffix.lower(), 0) + 1
+
+    mismatches = []
+    header_failures = 0
+    pillow_failures = 0
+    for path in paths:
+        sniffed = image_dimensions(path)
+        size, orientation = pillow_dimensions(path)
+        header_failures += sniffed is None
+        pillow_failures += size is None
+        if sniffed is not None and size is not None:
+            expected = (size[1], size[0]) if orientation >= 5 else tuple(size)
+            if sniffed != expected:
+                mismatches.append({"path": str(path.relative_to(args.media_dir)), "headers": sniffed, "pillow": expected})
+
+    header_ms = [timed_pass(paths, image_dimensions) for _ in range(args.repeat)]
+    pillow_ms = [timed_pass(paths, pillow_dimensions) for _ in range(args.repeat)]
+    print(json.dumps({
+        "files": len(paths),
+        "by_extension": by_extension,
+        "headers_ms": round(statistics.median(header_ms), 2),
+        "pillow_ms": round(statistics.median(pillow_ms), 2),
+        "speedup": round(statistics.median(pillow_ms) / max(statistics.median(header_ms), 1e-6), 1),
+        "header_failures": header_failures,
+        "pillow_failures": pillow_failures,
+        "mismatches": mismatches,
+    }))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+"""Related-article selection on a synthetic corpus: full scan versus inverted index.
+
+``legacy`` re-implements the previous per-call scoring, which rebuilt keyword sets
+and lowercased the full text of every article for each draft. ``indexed`` is
+``RelatedArticleIndex.search`` after a one-off build.
+
+    python -m benchmarks.bench_related_articles --articles 10000 --queries 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from content_manager.services.article_corpus import ArticleRecord
+from content_manager.services.related_articles import RelatedArticleIndex, keyword_terms
+
+CATEGORIES = ["Pole Dance", "Self", "Travel", "Food", "Music", "Fitness"]
+LOCATIONS = ["Trinity Pole Studio", "Kirkland Waterfront", "Pike Place Market", "Gas Works Park"]
+
+
+def synthetic_corpus(count: int, rng: random.Random, vocabulary: list[str] | None = None) -> list[ArticleRecord]:
+    vocabulary = vocabulary or [f"word{index}" for index in range(5000)]
+    # Zipf (s=1) word frequencies: a few common terms and a long tail of rare ones.
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    tags = [f"Tag {index}" for index in range(300)]
+    start = datetime(2015, 1, 1)
+    records = []
+    for index in range(count):
+        words = rng.choices(vocabulary, weights=weights, k=rng.randint(80, 400))
+        if rng.random() < 0.05:
+            words.insert(rng.randrange(len(words)), rng.choice(LOCATIONS))
+        body = " ".join(words)
+        records.append(ArticleRecord(
+            source=Path(f"{index:05d}.md"),
+            path=f"{2015 + index % 11}/{index % 12 + 1:02d}/post-{index:05d}.md",
+            mtime_ns=0,
+            size=len(body),
+            title=" ".join(rng.sample(vocabulary[:500], 4)),
+            summary=" ".join(rng.sample(vocabulary[:1000], 12)),
+            category=rng.choice(CATEGORIES),
+            tags=rng.sample(tags, rng.randint(2, 6)),
+            date=start + timedelta(days=rng.randint(0, 4000)),
+            body=body,
+            excerpt=body[:360],
+        ))
+    return records
+
+
+def legacy_select(records: list[ArticleRecord], query: dict, limit: int) -> list[ArticleRecord]:
+    draft_keywords = set(keyword_terms(query["draft_title"], query["draft_content"], " ".join(query["draft_tags"])))
+    draft_tag_keys = {tag.lower() for tag in query["draft_tags"]}
+
+    def score(article: ArticleRecord):
+        value = 0
+        same_category = int(article.category.lower() == query["draft_category"].lower())
+        value += 100 * same_category
+        value += 12 * len(draft_tag_keys & {tag.lower() for tag in article.tags})
+        text = " ".join([article.title, article.summary, article.body]).lower()
+        for location in query["likely_named_locations"]:
+            if location.lower() in text:
+                value += 8
+        article_keywords = set(keyword_terms(article.title, article.summary, article.body, " ".join(article.tags)))
+        value += min(len(draft_keywords & article_keywords), 8)
+        return (-value, -same_category, -article.date.timestamp(), article.path)
+
+    return sorted((record for record in records if record.title), key=score)[:limit]
+
+
+def make_queries(records: list[ArticleRecord], count: int, rng: random.Random) -> list[dict]:
+    queries = []
+    for _ in range(count):
+        sample = rng.choice(records)
+        queries.append({
+            "draft_category": sample.category,
+            "draft_tags": sample.tags[:2],
+            "likely_named_locations": [rng.choice(LOCATIONS)],
+            "draft_title": sample.title,
+            "draft_content": " ".join(sample.body.split()[:120]),
+        })
+    return queries
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_related_articles")
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--legacy-queries", type=int, default=5, help="Full-scan queries to time (they are slow)")
+    parser.add_argument("--limit", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    records = synthetic_corpus(args.articles, rng)
+    queries = make_queries(records, args.queries, rng)
+
+    build_started = time.perf_counter()
+    index = RelatedArticleIndex(records)
+    build_ms = (time.perf_counter() - build_started) * 1000
+
+    indexed = [timed(lambda query=query: index.search(limit=args.limit, **query)) for query in queries]
+    legacy = [timed(lambda query=query: legacy_select(records, query, args.limit)) for query in queries[:args.legacy_queries]]
+    print(json.dumps({
+        "articles": args.articles,
+        "index_build_ms": round(build_ms, 1),
+        "indexed_query_ms": {
+            "median": round(statistics.median(indexed), 2),
+            "max": round(max(indexed), 2),
+            "queries": len(indexed),
+        },
+        "legacy_query_ms": {
+            "median": round(statistics.median(legacy), 2) if legacy else None,
+            "queries": len(legacy),
+        },
+        "terms": len(index.postings),
+    }))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""Peak-memory benchmark for generation request bodies.
+
+Compares the materialized ``json=`` payload against ``StreamingJSONBody`` by sending
+a ten-image generation request to the local Responses API stand-in. Each mode runs
+in a fresh interpreter so its peak RSS reflects only that mode.
+
+    python -m benchmarks.bench_request_body --images 10 --image-mb 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.stub_responses_server import StubResponsesServer
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss survives exec and starts at the forking parent's footprint, so prefer
+    # the per-address-space high-water mark where the kernel exposes it.
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_worker(mode: str, image_dir: Path, api_base: str) -> dict:
+    from content_manager.services.article_generation import ArticleGenerator, GenerationRequest
+    from content_manager.services.http_transport import PooledTransport
+
+    transport = PooledTransport(max_retries=0)
+    if mode == "materialized":
+        transport.supports_streaming_body = False
+    generator = ArticleGenerator(api_key="bench", model="bench-model", request_fn=transport, api_base=api_base)
+    images = sorted(image_dir.glob("*.jpg"))
+    request = GenerationRequest(
+        media_context=[{"name": path.stem, "media_type": "image", "model_input_paths": [path]} for path in images],
+        canonical_job={"location_name": "Seattle", "captured_at": "2026-03-17T19:00:00", "time_of_day": "evening"},
+        warnings=[],
+        allowed_categories=["Self"],
+        allowed_tags=[],
+        likely_named_locations=[],
+    )
+    baseline_mb = _max_rss_mb()
+    started = time.perf_counter()
+    generator.generate(request)
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": mode,
+        "elapsed_seconds": round(elapsed, 3),
+        "baseline_rss_mb": round(baseline_mb, 1),
+        "peak_rss_mb": round(_max_rss_mb(), 1),
+        "peak_over_baseline_mb": round(_max_rss_mb() - baseline_mb, 1),
+        "media_mb": round(sum(path.stat().st_size for path in images) / (1024 * 1024), 1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_request_body")
+    parser.add_argument("--images", type=int, default=10)
+    parser.add_argument("--image-mb", type=float, default=4.0)
+    parser.add_argument("--worker", choices=["materialized", "streaming"], help=argparse.SUPPRESS)
+    parser.add_argument("--image-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--api-base", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, Path(args.image_dir), args.api_base)))
+        return 0
+
+    with StubResponsesServer() as server, tempfile.TemporaryDirectory(prefix="bench-request-body-") as tmp:
+        image_dir = Path(tmp)
+        image_bytes = int(args.image_mb * 1024 * 1024)
+        for index in range(args.images):
+            (image_dir / f"image-{index:02d}.jpg").write_bytes(os.urandom(image_bytes))
+        for mode in ("materialized", "streaming"):
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_request_body", "--worker", mode, "--image-dir", tmp, "--api-base", server.url],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            result = json.loads(completed.stdout)
+            result["request_bytes"] = server.records[-1].request_bytes
+            print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
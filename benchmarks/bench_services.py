@@ -0,0 +1,263 @@
+"""Scaling benchmark for the content manager's article and media services.
+
+Writes a synthetic site (article tree, image library and drafts that reference
+it) for each size and measures, per service, a cold call (shared indexes and
+on-disk caches dropped first), the median warm call, and the peak traced Python
+allocation of a cold call:
+
+    load_site_taxonomy        site_taxonomy.load_site_taxonomy
+    select_related_articles   generation_workflow.select_related_articles
+    suggested_tags            TagSuggestionIndex.suggestions (GET /api/article/tags/suggestions)
+    list_drafts               article_authoring.list_drafts (one draft per 10 entries)
+
+Reverse geocoding is replaced by a fixed local answer so runs stay offline and
+only measure local work. Results can be stored as a baseline; later runs with
+``--check`` report every metric that grew by more than ``--threshold`` (and by
+more than a small absolute noise floor) and exit with status 1.
+
+    python -m benchmarks.bench_services --sizes 100,1000,10000,50000 --save-baseline
+    python -m benchmarks.bench_services --sizes 100,1000 --check
+
+Baselines are machine specific; record them on the machine that runs the check.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import replace
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+from benchmarks.bench_article_search import syllable_vocabulary
+from benchmarks.bench_related_articles import LOCATIONS, synthetic_corpus
+from content_manager.config import AppConfig, load_config
+from content_manager.services import article_corpus, media_metadata, related_articles, site_taxonomy
+from content_manager.services.article_authoring import list_drafts
+from content_manager.services.article_corpus import ArticleRecord, shared_corpus_index
+from content_manager.services.generation_workflow import select_related_articles
+from content_manager.services.site_taxonomy import load_site_taxonomy
+from content_manager.services.tag_suggestions import TagSuggestionIndex
+from content_manager.state import AppState
+
+BASELINE_FORMAT = 1
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "bench_services.json"
+DEFAULT_SIZES = "100,1000,10000,50000"
+DRAFTS_PER_ENTRY = 0.1
+MEDIA_PER_DRAFT = 2
+# Growth below these is treated as noise whatever the relative change.
+NOISE_FLOOR = {"cold_ms": 5.0, "warm_ms": 2.0, "peak_kib": 256.0}
+
+
+def offline_reverse_geocode(latitude, longitude, **_):
+    if latitude is None or longitude is None:
+        return (None, None)
+    return ("Seattle, Washington, United States", None)
+
+
+def sample_jpeg(captured_at: str) -> bytes:
+    """A tiny JPEG with capture time and GPS, so metadata extraction takes its full path."""
+    exif = Image.Exif()
+    exif.get_ifd(0x8769)[0x9003] = captured_at  # DateTimeOriginal
+    gps = exif.get_ifd(0x8825)
+    gps.update({1: "N", 2: (47.0, 36.0, 30.0), 3: "W", 4: (122.0, 20.0, 12.0)})
+    buffer = io.BytesIO()
+    Image.new("RGB", (16, 16), (220, 120, 160)).save(buffer, "JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+def write_article(articles_dir: Path, record: ArticleRecord) -> None:
+    path = articles_dir / record.path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f"Title: {record.title}\nDate: {record.date:%Y-%m-%d}\nSummary: {record.summary}\n"
+        f"Category: {record.category}\nTags: {', '.join(record.tags)}\n\n{record.body}\n",
+        encoding="utf-8",
+    )
+
+
+def build_site(root: Path, size: int, rng: random.Random) -> tuple[AppConfig, AppState, list[ArticleRecord]]:
+    config = replace(
+        load_config(),
+        repo_root=root,
+        articles_dir=root / "content" / "articles",
+        images_dir=root / "content" / "media" / "images",
+        cache_dir=root / ".cache",
+        auto_commit=False,
+    )
+    records = synthetic_corpus(size, rng, syllable_vocabulary(5000, rng))
+    for record in records:
+        write_article(config.articles_dir, record)
+
+    image_bytes = sample_jpeg("2026:03:17 19:05:00")
+    media_paths = []
+    for index in range(size):
+        relative = Path("images") / f"{2015 + index % 11}" / f"img-{index:05d}.jpg"
+        (root / "content" / "media" / relative).parent.mkdir(parents=True, exist_ok=True)
+        (root / "content" / "media" / relative).write_bytes(image_bytes)
+        media_paths.append(relative.as_posix())
+
+    state = AppState()
+    for index in range(max(int(size * DRAFTS_PER_ENTRY), 1)):
+        state.drafts[f"draft-{index:05d}"] = {
+            "title": f"Draft {index}",
+            "updated_at": f"2026-03-{index % 28 + 1:02d}T12:00:00+00:00",
+            "existing_media_paths": "\n".join(rng.sample(media_paths, min(MEDIA_PER_DRAFT, len(media_paths)))),
+        }
+    return config, state, records
+
+
+def reset_caches(config: AppConfig) -> None:
+    """Forget every shared index and on-disk snapshot, as after a fresh deploy."""
+    for registry in (article_corpus._shared_indexes, related_articles._indexes, site_taxonomy._shared_indexes):
+        registry.clear()
+    shutil.rmtree(config.cache_dir, ignore_errors=True)
+    config.cache_dir.mkdir(parents=True, exist_ok=True)
+
+
+def service_calls(config: AppConfig, state: AppState, records: list[ArticleRecord], rng: random.Random) -> dict:
+    """``{service: factory}``; each factory returns a callable bound to fresh per-run state."""
+
+    def related_query():
+        sample = rng.choice(records)
+        return {
+            "draft_category": sample.category,
+            "draft_tags": sample.tags[:2],
+            "likely_named_locations": [rng.choice(LOCATIONS)],
+            "draft_title": sample.title,
+            "draft_content": " ".join(sample.body.split()[:120]),
+        }
+
+    tag_index: dict[str, TagSuggestionIndex] = {}
+
+    def suggested_tags(cold: bool):
+        if cold or "index" not in tag_index:
+            tag_index["index"] = TagSuggestionIndex(shared_corpus_index(config.articles_dir))
+        return tag_index["index"].suggestions
+
+    return {
+        "load_site_taxonomy": lambda cold: lambda: load_site_taxonomy(config.articles_dir, cache_dir=config.cache_dir),
+        "select_related_articles": lambda cold: (
+            lambda query=related_query(): select_related_articles(config.articles_dir, **query)
+        ),
+        "suggested_tags": suggested_tags,
+        "list_drafts": lambda cold: lambda: list_drafts(state, config),
+    }
+
+
+def elapsed_ms(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def measure(config: AppConfig, factory, warm_runs: int) -> dict:
+    reset_caches(config)
+    tracemalloc.start()
+    try:
+        factory(True)()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    reset_caches(config)
+    cold_ms = elapsed_ms(factory(True))
+    warm = [elapsed_ms(factory(False)) for _ in range(warm_runs)]
+    return {
+        "cold_ms": round(cold_ms, 2),
+        "warm_ms": round(statistics.median(warm), 2),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_size(size: int, seed: int, warm_runs: int) -> dict:
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory(prefix=f"bench-services-{size}-") as tmp:
+        started = time.perf_counter()
+        config, state, records = build_site(Path(tmp), size, rng)
+        print(f"[{size}] site written in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        results = {}
+        with mock.patch.object(media_metadata, "reverse_geocode", offline_reverse_geocode):
+            for service, factory in service_calls(config, state, records, rng).items():
+                results[service] = measure(config, factory, warm_runs)
+                print(f"[{size}] {service}: {json.dumps(results[service])}", file=sys.stderr)
+        reset_caches(config)
+    return results
+
+
+def find_regressions(baseline: dict, results: dict, threshold: float) -> list[dict]:
+    regressions = []
+    for size, services in results.items():
+        for service, metrics in services.items():
+            previous = baseline.get("results", {}).get(size, {}).get(service, {})
+            for metric, value in metrics.items():
+                before = previous.get(metric)
+                if before is None:
+                    continue
+                if value > before * (1 + threshold) and value - before > NOISE_FLOOR[metric]:
+                    regressions.append({
+                        "size": int(size),
+                        "service": service,
+                        "metric": metric,
+                        "baseline": before,
+                        "current": value,
+                        "change": f"+{(value / before - 1) * 100:.0f}%" if before else "new",
+                    })
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_services")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated entry counts")
+    parser.add_argument("--warm-runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Merge these results into the baseline file")
+    parser.add_argument("--check", action="store_true", help="Compare against the baseline; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative growth per metric")
+    args = parser.parse_args(argv)
+
+    sizes = [int(value) for value in args.sizes.split(",") if value.strip()]
+    results = {str(size): run_size(size, args.seed, args.warm_runs) for size in sizes}
+    report: dict = {"results": results}
+
+    exit_code = 0
+    if args.check:
+        try:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as err:
+            parser.error(f"cannot read baseline {args.baseline}: {err}")
+        if baseline.get("format") != BASELINE_FORMAT:
+            parser.error(f"unsupported baseline format in {args.baseline}")
+        report["regressions"] = find_regressions(baseline, results, args.threshold)
+        exit_code = 1 if report["regressions"] else 0
+
+    if args.save_baseline:
+        try:
+            stored = json.loads(args.baseline.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            stored = {}
+        if stored.get("format") != BASELINE_FORMAT:
+            stored = {"format": BASELINE_FORMAT, "results": {}}
+        stored["python"] = platform.python_version()
+        stored["machine"] = platform.machine()
+        stored["results"].update(results)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    print(json.dumps(report))
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
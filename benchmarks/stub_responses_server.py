@@ -0,0 +1,259 @@
+"""Local stand-in for the OpenAI Responses API.
+
+Serves ``POST /v1/responses`` with a canned draft pack in the shape that
+``extract_output_text`` and ``ArticleGenerator.generate_stream`` parse, so the
+generation workflow can be benchmarked without network access or API spend.
+
+    python -m benchmarks.stub_responses_server --port 8765 --latency-ms 800 --error-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub python -m content_manager.cli generate ...
+
+Every request is logged as one JSON line (to stderr, or ``--log-file``) with its
+body size, image count, status and server-side latency.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TextIO
+
+DEFAULT_OUTPUT = {
+    "title_ideas": ["Evening Practice Notes", "A Quiet Session", "Small Wins on the Pole"],
+    "summary": "A short practice recap written by the local stand-in server.",
+    "category": "Self",
+    "tags": ["Practice", "Notes", "Evening", "Recap", "Progress"],
+    "content_markdown": (
+        "This draft was produced by the benchmark stand-in server.\n\n"
+        "It mirrors the structure of a real draft pack so the full workflow runs end to end.\n\n"
+        "Nothing here came from a model."
+    ),
+}
+
+
+@dataclass
+class StubSettings:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    stream_chunks: int = 24
+    stream_delay_ms: float = 5.0
+    output: dict = field(default_factory=lambda: dict(DEFAULT_OUTPUT))
+
+
+@dataclass(frozen=True)
+class StubRequestRecord:
+    path: str
+    request_bytes: int
+    image_count: int
+    text_bytes: int
+    streamed: bool
+    status: int
+    elapsed_ms: float
+
+
+class StubResponsesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StubResponsesServer"
+
+    def do_POST(self) -> None:  # noqa: N802
+        started = time.perf_counter()
+        body = self._read_body()
+        if self.path.rstrip("/") not in {"/v1/responses", "/responses"}:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            self.server.record(self.path, body, {}, False, 404, started)
+            return
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "request body is not valid JSON"}})
+            self.server.record(self.path, body, {}, False, 400, started)
+            return
+
+        settings = self.server.settings
+        delay = max(settings.latency_ms + self.server.rng.uniform(-settings.jitter_ms, settings.jitter_ms), 0.0)
+        time.sleep(delay / 1000)
+        streamed = bool(payload.get("stream"))
+        if settings.error_rate and self.server.rng.random() < settings.error_rate:
+            self._send_json(
+                settings.error_status,
+                {"error": {"message": "injected failure from stub server", "type": "server_error"}},
+                extra_headers={"Retry-After": "0"},
+            )
+            self.server.record(self.path, body, payload, streamed, settings.error_status, started)
+            return
+
+        text = json.dumps(settings.output)
+        if streamed:
+            self._send_stream(text)
+        else:
+            self._send_json(200, {
+                "id": "resp_stub",
+                "object": "response",
+                "status": "completed",
+                "output": [{"type": "message", "role": "assistant", "content": [{"type": "output_text", "text": text}]}],
+            })
+        self.server.record(self.path, body, payload, streamed, 200, started)
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().strip().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(chunks)
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _send_json(self, status: int, payload: dict, *, extra_headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, text: str) -> None:
+        settings = self.server.settings
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(event: dict) -> None:
+            self.wfile.write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        send({"type": "response.created", "response": {"id": "resp_stub", "status": "in_progress"}})
+        step = max(len(text) // max(settings.stream_chunks, 1), 1)
+        for offset in range(0, len(text), step):
+            send({"type": "response.output_text.delta", "delta": text[offset:offset + step]})
+            time.sleep(settings.stream_delay_ms / 1000)
+        send({"type": "response.output_text.done", "text": text})
+        send({
+            "type": "response.completed",
+            "response": {
+                "id": "resp_stub",
+                "status": "completed",
+                "output": [{"type": "message", "role": "assistant", "content": [{"type": "output_text", "text": text}]}],
+            },
+        })
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        return None
+
+
+class StubResponsesServer(ThreadingHTTPServer):
+    """Threaded stand-in server; use as a context manager to run it in the background."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        settings: StubSettings | None = None,
+        log_stream: TextIO | None = None,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__((host, port), StubResponsesHandler)
+        self.settings = settings or StubSettings()
+        self.log_stream = log_stream
+        self.rng = random.Random(seed)
+        self.records: list[StubRequestRecord] = []
+        self._records_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def record(self, path: str, body: bytes, payload: dict, streamed: bool, status: int, started: float) -> None:
+        image_count = 0
+        text_bytes = 0
+        for message in payload.get("input", []) or []:
+            for part in message.get("content", []) or []:
+                if part.get("type") == "input_image":
+                    image_count += 1
+                elif part.get("type") == "input_text":
+                    text_bytes += len(str(part.get("text", "")).encode("utf-8"))
+        entry = StubRequestRecord(
+            path=path,
+            request_bytes=len(body),
+            image_count=image_count,
+            text_bytes=text_bytes,
+            streamed=streamed,
+            status=status,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+        with self._records_lock:
+            self.records.append(entry)
+            if self.log_stream is not None:
+                self.log_stream.write(json.dumps(asdict(entry)) + "\n")
+                self.log_stream.flush()
+
+    def __enter__(self) -> "StubResponsesServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.stub_responses_server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed delay before responding")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter added to the delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--stream-chunks", type=int, default=24, help="Delta events per streamed response")
+    parser.add_argument("--stream-delay-ms", type=float, default=5.0, help="Delay between streamed delta events")
+    parser.add_argument("--seed", type=int, help="Seed for jitter and error injection")
+    parser.add_argument("--log-file", help="Append request records here instead of stderr")
+    args = parser.parse_args(argv)
+
+    settings = StubSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        stream_chunks=args.stream_chunks,
+        stream_delay_ms=args.stream_delay_ms,
+    )
+    log_stream = Path(args.log_file).open("a", encoding="utf-8") if args.log_file else sys.stderr
+    server = StubResponsesServer(args.host, args.port, settings=settings, log_stream=log_stream, seed=args.seed)
+    print(f"stub Responses API listening on {server.url}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if log_stream is not sys.stderr:
+            log_stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
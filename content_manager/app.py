@@ -1,14 +1,14 @@
 from __future__ import annotations
 
+import json
 import re
 import subprocess
 import threading
 import uuid
-from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
 
-from flask import Flask, abort, jsonify, redirect, render_template, request, send_file
+from flask import Flask, Response, abort, jsonify, redirect, render_template, request, send_file, stream_with_context
 from werkzeug.utils import secure_filename
 
 from content_manager.config import load_config
@@ -23,13 +23,21 @@ from content_manager.services.article_authoring import (
     unique_article_path as authoring_unique_article_path,
     validate_publish_request,
 )
+from content_manager.services.article_corpus import shared_corpus_index
 from content_manager.services.article_generation import ArticleGenerator
-from content_manager.services.generation_workflow import generate_article_from_sources, resolve_library_media_path
+from content_manager.services.article_search import SEARCH_INDEX_FILENAME, ArticleSearchIndex
+from content_manager.services.generation_cache import GenerationCache
+from content_manager.services.generation_workflow import (
+    generate_article_from_sources,
+    resolve_library_media_path,
+    stream_article_from_sources,
+)
 from content_manager.services.media_metadata import (
     extract_media_metadata,
     extract_video_tags,
     normalize_media_basename,
 )
+from content_manager.services.tag_suggestions import TagSuggestionIndex
 from content_manager.state import AppState
 
 app = Flask(__name__)
@@ -38,8 +46,17 @@ state = AppState()
 generator = ArticleGenerator(
     api_key=config.openai_api_key,
     model=config.openai_model,
+    api_base=config.openai_base_url,
+    cache=GenerationCache(
+        config.cache_dir / "generation",
+        ttl_seconds=config.generation_cache_ttl_hours * 3600,
+        max_bytes=config.generation_cache_max_mb * 1024 * 1024,
+    ),
 )
 
+tag_suggestions = TagSuggestionIndex(shared_corpus_index(config.articles_dir))
+article_search = ArticleSearchIndex(shared_corpus_index(config.articles_dir), config.cache_dir / SEARCH_INDEX_FILENAME)
+
 app.secret_key = config.secret_key
 app.config["MAX_CONTENT_LENGTH"] = config.max_upload_mb * 1024 * 1024
 app.config["TEMPLATES_AUTO_RELOAD"] = True
@@ -88,7 +105,6 @@ def _ffprobe_json(input_path: Path) -> dict:
         text=True,
         check=True,
     )
-    import json
     return json.loads(result.stdout or "{}")
 
 
@@ -303,35 +319,6 @@ def _build_media_prefix(media_job_ids: list[str], title: str, media_paths: list[
     return authoring_build_media_prefix(config, state, media_job_ids, title, media_paths)
 
 
-def _read_article_metadata(article_path: Path) -> dict:
-    try:
-        raw = article_path.read_text(encoding="utf-8", errors="ignore")
-    except OSError:
-        return {"date": None, "tags": []}
-    date_value = None
-    tags_value = ""
-    for line in raw.splitlines():
-        if not line.strip():
-            break
-        if ":" not in line:
-            continue
-        key, value = line.split(":", 1)
-        key = key.strip().lower()
-        value = value.strip()
-        if key == "date":
-            date_value = value
-        elif key == "tags":
-            tags_value = value
-    parsed_date = None
-    if date_value:
-        try:
-            parsed_date = datetime.strptime(date_value[:10], "%Y-%m-%d").date()
-        except ValueError:
-            pass
-    tags = [tag.strip() for tag in tags_value.split(",") if tag.strip()]
-    return {"date": parsed_date, "tags": tags}
-
-
 @app.get("/health")
 def health():
     return jsonify({"status": "ok"})
@@ -510,48 +497,35 @@ def new_article():
 
 @app.get("/api/article/tags/suggestions")
 def suggested_tags():
-    articles = []
-    for article_path in config.articles_dir.rglob("*.md"):
-        articles.append(_read_article_metadata(article_path))
-    sorted_articles = sorted(articles, key=lambda item: item["date"] or datetime.min.date(), reverse=True)
-
-    recent_tags = []
-    recent_keys = set()
-    for article in sorted_articles:
-        for tag in article["tags"]:
-            key = tag.lower()
-            if key in recent_keys:
-                continue
-            recent_keys.add(key)
-            recent_tags.append(tag)
-            if len(recent_tags) >= 6:
-                break
-        if len(recent_tags) >= 6:
-            break
-
-    counts = Counter()
-    last_used = {}
-    display = {}
-    for article in sorted_articles:
-        seen = set()
-        for tag in article["tags"]:
-            key = tag.lower()
-            if key in seen:
-                continue
-            seen.add(key)
-            counts[key] += 1
-            display.setdefault(key, tag)
-            if key not in last_used or (article["date"] and article["date"] > last_used[key]):
-                last_used[key] = article["date"]
-    common_candidates = sorted(counts.keys(), key=lambda key: (-counts[key], -(last_used.get(key) or datetime.min.date()).toordinal(), key))
-    common_tags = []
-    for key in common_candidates:
-        if key in recent_keys:
-            continue
-        common_tags.append(display[key])
-        if len(common_tags) >= 6:
-            break
-    return jsonify({"recent": recent_tags, "common": common_tags})
+    payload, etag = tag_suggestions.suggestions()
+    response = jsonify(payload)
+    response.set_etag(etag)
+    # Revalidate on every load; an unchanged corpus answers 304 without a body.
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@app.get("/api/articles/search")
+def search_articles():
+    try:
+        limit = int(request.args.get("limit", 20))
+    except ValueError:
+        return _json_error("limit must be an integer")
+    kind = request.args.get("kind", "").strip()
+    if kind not in {"", "article", "draft"}:
+        return _json_error("kind must be article or draft")
+    with state.jobs_lock:
+        drafts = {draft_id: dict(payload) for draft_id, payload in state.drafts.items()}
+    article_search.sync(drafts)
+    query = request.args.get("q", "")
+    hits = article_search.search(
+        query,
+        tags=request.args.getlist("tag"),
+        category=request.args.get("category", ""),
+        kind=kind,
+        limit=limit,
+    )
+    return jsonify({"query": query, "results": [hit.to_dict() for hit in hits]})
 
 
 @app.post("/api/article/draft")
@@ -592,32 +566,47 @@ def get_draft(draft_id: str):
     return jsonify(draft.to_dict())
 
 
-@app.post("/api/article/generate")
-def generate_article():
-    data = request.get_json(silent=True)
-    if not data:
-        return _json_error("invalid JSON body")
+def _generation_options(data: dict) -> dict:
     media_job_ids = data.get("media_jobs", []) or []
     media_paths = data.get("media_paths", []) or []
     if not isinstance(media_job_ids, list) or not isinstance(media_paths, list):
-        return _json_error("media_jobs and media_paths must be arrays")
+        raise ValueError("media_jobs and media_paths must be arrays")
     draft_tags_value = data.get("tags", "")
     if isinstance(draft_tags_value, list):
         draft_tags = [str(item).strip() for item in draft_tags_value if str(item).strip()]
     else:
         draft_tags = [item.strip() for item in str(draft_tags_value or "").split(",") if item.strip()]
+    return {
+        "media_job_ids": media_job_ids,
+        "media_paths": media_paths,
+        "draft_title": str(data.get("title") or "").strip(),
+        "draft_summary": str(data.get("summary") or "").strip(),
+        "draft_category": str(data.get("category") or "").strip(),
+        "draft_tags": draft_tags,
+        "draft_content": str(data.get("content") or "").strip(),
+        "force_regenerate": bool(data.get("force_regenerate")),
+    }
+
+
+def _sse_event(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+@app.post("/api/article/generate")
+def generate_article():
+    data = request.get_json(silent=True)
+    if not data:
+        return _json_error("invalid JSON body")
+    try:
+        options = _generation_options(data)
+    except ValueError as err:
+        return _json_error(str(err))
     try:
         generated = generate_article_from_sources(
             config=config,
             generator=generator,
-            media_job_ids=media_job_ids,
-            media_paths=media_paths,
-            draft_title=str(data.get("title") or "").strip(),
-            draft_summary=str(data.get("summary") or "").strip(),
-            draft_category=str(data.get("category") or "").strip(),
-            draft_tags=draft_tags,
-            draft_content=str(data.get("content") or "").strip(),
             state=state,
+            **options,
         )
     except ValueError as err:
         return _json_error(str(err))
@@ -628,6 +617,30 @@ def generate_article():
     return jsonify(generated.to_dict())
 
 
+@app.post("/api/article/generate/stream")
+def generate_article_stream():
+    data = request.get_json(silent=True)
+    if not data:
+        return _json_error("invalid JSON body")
+    try:
+        options = _generation_options(data)
+    except ValueError as err:
+        return _json_error(str(err))
+
+    def event_stream():
+        try:
+            for event in stream_article_from_sources(config=config, generator=generator, state=state, **options):
+                yield _sse_event(event)
+        except Exception as err:
+            yield _sse_event({"type": "error", "error": str(err) or "generation failed"})
+
+    return Response(
+        stream_with_context(event_stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/api/article/publish")
 def publish_article():
     data = request.get_json(silent=True)
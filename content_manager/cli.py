@@ -3,10 +3,18 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import TextIO
 
-from content_manager.config import load_config
+from content_manager.config import AppConfig, load_config
 from content_manager.services.article_generation import ArticleGenerator
+from content_manager.services.generation_cache import GenerationCache
 from content_manager.services.generation_workflow import generate_article_from_sources
+from content_manager.services.http_transport import PooledTransport
+from content_manager.services.site_taxonomy import load_site_taxonomy
+
+DEFAULT_BATCH_WORKERS = 4
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -20,21 +28,64 @@ def build_parser() -> argparse.ArgumentParser:
         default=[],
         help="Path relative to content/media, for example video/bungle-babes-duo-choreo.mp4",
     )
+    generate_parser.add_argument(
+        "--force-regenerate",
+        action="store_true",
+        help="Bypass the generation result cache",
+    )
     generate_parser.add_argument(
         "--pretty",
         action="store_true",
         help="Pretty-print JSON output",
     )
+
+    batch_parser = subparsers.add_parser(
+        "generate-batch",
+        help="Generate article text for every media group in a JSON-lines manifest",
+    )
+    batch_parser.add_argument(
+        "manifest",
+        help=(
+            "JSON-lines file (or - for stdin); each line is an object with media_paths and optional "
+            "id, title, summary, category, tags, content, force_regenerate"
+        ),
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_BATCH_WORKERS,
+        help=f"Maximum concurrent generations (default {DEFAULT_BATCH_WORKERS})",
+    )
+    batch_parser.add_argument(
+        "--force-regenerate",
+        action="store_true",
+        help="Bypass the generation result cache for every entry",
+    )
     return parser
 
 
+def build_generator(config: AppConfig, **kwargs) -> ArticleGenerator:
+    return ArticleGenerator(
+        api_key=config.openai_api_key,
+        model=config.openai_model,
+        api_base=config.openai_base_url,
+        cache=GenerationCache(
+            config.cache_dir / "generation",
+            ttl_seconds=config.generation_cache_ttl_hours * 3600,
+            max_bytes=config.generation_cache_max_mb * 1024 * 1024,
+        ),
+        **kwargs,
+    )
+
+
 def cmd_generate(args: argparse.Namespace) -> int:
     config = load_config()
-    generator = ArticleGenerator(api_key=config.openai_api_key, model=config.openai_model)
+    generator = build_generator(config)
     result = generate_article_from_sources(
         config=config,
         generator=generator,
         media_paths=args.media_path,
+        force_regenerate=args.force_regenerate,
     )
     if args.pretty:
         print(json.dumps(result.to_dict(), indent=2))
@@ -43,12 +94,101 @@ def cmd_generate(args: argparse.Namespace) -> int:
     return 0
 
 
+def read_batch_manifest(handle: TextIO) -> list[tuple[str, dict | None, str]]:
+    """Return ``(entry_id, options, error)`` per non-blank manifest line.
+
+    Malformed lines are reported as per-entry errors instead of aborting the batch.
+    """
+    entries: list[tuple[str, dict | None, str]] = []
+    for line_number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        entry_id = f"line-{line_number}"
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as err:
+            entries.append((entry_id, None, f"invalid JSON: {err.msg}"))
+            continue
+        if not isinstance(data, dict):
+            entries.append((entry_id, None, "manifest entries must be JSON objects"))
+            continue
+        entry_id = str(data.get("id") or entry_id)
+        media_paths = data.get("media_paths")
+        if not isinstance(media_paths, list) or not media_paths:
+            entries.append((entry_id, None, "media_paths must be a non-empty array"))
+            continue
+        tags = data.get("tags", "")
+        if isinstance(tags, list):
+            draft_tags = [str(item).strip() for item in tags if str(item).strip()]
+        else:
+            draft_tags = [item.strip() for item in str(tags or "").split(",") if item.strip()]
+        entries.append((entry_id, {
+            "media_paths": [str(item) for item in media_paths],
+            "draft_title": str(data.get("title") or "").strip(),
+            "draft_summary": str(data.get("summary") or "").strip(),
+            "draft_category": str(data.get("category") or "").strip(),
+            "draft_tags": draft_tags,
+            "draft_content": str(data.get("content") or "").strip(),
+            "force_regenerate": bool(data.get("force_regenerate")),
+        }, ""))
+    return entries
+
+
+def cmd_generate_batch(args: argparse.Namespace) -> int:
+    if args.workers < 1:
+        raise ValueError("--workers must be at least 1")
+    if args.manifest == "-":
+        entries = read_batch_manifest(sys.stdin)
+    else:
+        with Path(args.manifest).open(encoding="utf-8") as handle:
+            entries = read_batch_manifest(handle)
+
+    config = load_config()
+    # One taxonomy snapshot and one pooled session serve every worker.
+    taxonomy = load_site_taxonomy(config.articles_dir, cache_dir=config.cache_dir)
+    generator = build_generator(config, request_fn=PooledTransport(pool_size=args.workers))
+
+    def run(options: dict) -> dict:
+        if args.force_regenerate:
+            options = {**options, "force_regenerate": True}
+        return generate_article_from_sources(
+            config=config,
+            generator=generator,
+            taxonomy=taxonomy,
+            **options,
+        ).to_dict()
+
+    failures = 0
+
+    def emit(record: dict) -> None:
+        print(json.dumps(record), flush=True)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {}
+        for entry_id, options, error in entries:
+            if options is None:
+                failures += 1
+                emit({"id": entry_id, "status": "error", "error": error})
+                continue
+            futures[executor.submit(run, options)] = entry_id
+        for future in as_completed(futures):
+            entry_id = futures[future]
+            try:
+                emit({"id": entry_id, **future.result()})
+            except Exception as err:
+                failures += 1
+                emit({"id": entry_id, "status": "error", "error": str(err) or type(err).__name__})
+    return 1 if failures else 0
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
     try:
         if args.command == "generate":
             return cmd_generate(args)
+        if args.command == "generate-batch":
+            return cmd_generate_batch(args)
     except Exception as err:
         print(json.dumps({"error": str(err)}), file=sys.stderr)
         return 1
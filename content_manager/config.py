@@ -16,6 +16,7 @@ class AppConfig:
     images_dir: Path
     video_dir: Path
     articles_dir: Path
+    cache_dir: Path
     output_format: str
     clip_id_pattern: re.Pattern[str]
     auto_commit: bool
@@ -23,6 +24,11 @@ class AppConfig:
     git_branch: str
     openai_api_key: str
     openai_model: str
+    openai_base_url: str
+    generation_cache_ttl_hours: int
+    generation_cache_max_mb: int
+    generation_max_request_mb: int
+    generation_max_input_tokens: int
     geocoder_user_agent: str
     max_upload_mb: int
     max_dimension: int
@@ -47,6 +53,7 @@ def load_config() -> AppConfig:
         images_dir=repo_root / "content" / "media" / "images",
         video_dir=repo_root / "content" / "media" / "video",
         articles_dir=repo_root / "content" / "articles",
+        cache_dir=repo_root / os.getenv("CACHE_DIR", ".cache"),
         output_format="m4a",
         clip_id_pattern=re.compile(r"(\d{2}-\d{2})"),
         auto_commit=os.getenv("AUTO_COMMIT", "false").lower() == "true",
@@ -54,6 +61,11 @@ def load_config() -> AppConfig:
         git_branch=os.getenv("GIT_BRANCH", "main"),
         openai_api_key=os.getenv("OPENAI_API_KEY", "").strip(),
         openai_model=os.getenv("OPENAI_MODEL", "gpt-4.1-mini").strip(),
+        openai_base_url=os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").strip(),
+        generation_cache_ttl_hours=int(os.getenv("GENERATION_CACHE_TTL_HOURS", "168")),
+        generation_cache_max_mb=int(os.getenv("GENERATION_CACHE_MAX_MB", "64")),
+        generation_max_request_mb=int(os.getenv("GENERATION_MAX_REQUEST_MB", "20")),
+        generation_max_input_tokens=int(os.getenv("GENERATION_MAX_INPUT_TOKENS", "30000")),
         geocoder_user_agent=os.getenv("GEOCODER_USER_AGENT", "eloise-rip-content-manager/1.0"),
         max_upload_mb=int(os.getenv("MAX_UPLOAD_MB", "200")),
         max_dimension=1080,
@@ -70,6 +82,7 @@ def load_config() -> AppConfig:
         config.images_dir,
         config.video_dir,
         config.articles_dir,
+        config.cache_dir,
     ):
         directory.mkdir(parents=True, exist_ok=True)
 
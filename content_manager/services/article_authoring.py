@@ -5,8 +5,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from content_manager.config import AppConfig
+from content_manager.services.article_corpus import shared_corpus_index
 from content_manager.services.generation_workflow import classify_media_path, resolve_library_media_path
 from content_manager.services.metadata_resolution import DraftMetadataSnapshot, resolve_draft_metadata
+from content_manager.services.near_duplicates import near_duplicate_index, near_duplicate_warnings
+from content_manager.services.site_taxonomy import shared_taxonomy_index
 from content_manager.state import AppState
 
 
@@ -269,6 +272,9 @@ def publish_article(config: AppConfig, state: AppState, command: PublishArticleC
             if job.get("poster_path"):
                 media_paths.append(Path(job["poster_path"]))
 
+    # Checked before writing so the new article cannot match itself.
+    near_duplicates = near_duplicate_index(config.articles_dir).find(content=command.content, summary=command.summary)
+
     date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     article_path = unique_article_path(config, slugify(command.title), date_str)
     lines = [f"Title: {command.title}", f"Date: {date_str}"]
@@ -285,10 +291,14 @@ def publish_article(config: AppConfig, state: AppState, command: PublishArticleC
     lines.append(command.content)
     lines.append("")
     article_path.write_text("\n".join(lines), encoding="utf-8")
+    shared_corpus_index(config.articles_dir).notify_changed(article_path)
+    shared_taxonomy_index(config.articles_dir, cache_dir=config.cache_dir).notify_changed(article_path)
     push_error = git_push_fn(article_path, media_paths)
     return {
         "status": "published",
         "slug": article_path.stem,
         "path": str(article_path.relative_to(config.repo_root)),
         "push_error": push_error,
+        "near_duplicates": [match.to_dict() for match in near_duplicates],
+        "warnings": near_duplicate_warnings(near_duplicates),
     }
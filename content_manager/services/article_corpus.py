@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable
+
+ARTICLE_EXCERPT_LENGTH = 360
+# Front matter is a dozen short lines; anything past this is treated as body.
+ARTICLE_HEADER_MAX_BYTES = 16 * 1024
+DEFAULT_REFRESH_INTERVAL_SECONDS = 2.0
+
+
+@dataclass(frozen=True)
+class ArticleRecord:
+    """Parsed front matter of one published article.
+
+    ``body`` and ``excerpt`` stay ``None`` until ``load_body`` / ``load_excerpt``
+    read them from ``body_offset`` onwards, so header-only consumers never read
+    past the front matter.
+    """
+
+    source: Path
+    path: str
+    mtime_ns: int
+    size: int
+    title: str
+    summary: str
+    category: str
+    tags: list[str]
+    date: datetime | None
+    body: str | None = None
+    excerpt: str | None = None
+    body_offset: int = 0
+
+    def load_body(self) -> str:
+        if self.body is None:
+            object.__setattr__(self, "body", read_article_body(self.source, self.body_offset))
+        return self.body
+
+    def load_excerpt(self) -> str:
+        if self.excerpt is None:
+            object.__setattr__(self, "excerpt", build_excerpt(self.load_body(), self.summary))
+        return self.excerpt
+
+
+def read_article_header(article_path: Path, *, max_bytes: int = ARTICLE_HEADER_MAX_BYTES) -> tuple[dict[str, str], int]:
+    """Return ``(metadata, body_offset)``, reading only up to the end of the front matter.
+
+    The header ends at the first blank line or the first line without a colon,
+    which then belongs to the body. At most ``max_bytes`` are read.
+    """
+    metadata: dict[str, str] = {}
+    offset = 0
+    with article_path.open("rb") as handle:
+        while offset < max_bytes:
+            raw_line = handle.readline(max_bytes - offset)
+            if not raw_line or (not raw_line.endswith(b"\n") and offset + len(raw_line) >= max_bytes):
+                break
+            line = raw_line.decode("utf-8", errors="ignore").rstrip("\r\n")
+            if not line.strip():
+                offset += len(raw_line)
+                break
+            if ":" not in line:
+                break
+            key, value = line.split(":", 1)
+            metadata[key.strip().lower()] = value.strip()
+            offset += len(raw_line)
+    return metadata, offset
+
+
+def read_article_body(article_path: Path, body_offset: int) -> str:
+    try:
+        with article_path.open("rb") as handle:
+            handle.seek(body_offset)
+            raw = handle.read().decode("utf-8", errors="ignore")
+    except OSError:
+        return ""
+    return "\n".join(raw.splitlines()).strip()
+
+
+def build_excerpt(body: str, summary: str) -> str:
+    collapsed_body = " ".join(body.split())
+    excerpt = collapsed_body[:ARTICLE_EXCERPT_LENGTH].strip()
+    if len(collapsed_body) > ARTICLE_EXCERPT_LENGTH:
+        excerpt += "..."
+    return excerpt or summary
+
+
+def parse_article_file(article_path: Path) -> ArticleRecord | None:
+    try:
+        stat = article_path.stat()
+        metadata, body_offset = read_article_header(article_path)
+    except OSError:
+        return None
+
+    parsed_date = None
+    date_value = metadata.get("date", "").strip()
+    if date_value:
+        try:
+            parsed_date = datetime.strptime(date_value[:10], "%Y-%m-%d")
+        except ValueError:
+            parsed_date = None
+    return ArticleRecord(
+        source=article_path,
+        path=article_path.relative_to(article_path.parents[2]).as_posix(),
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        title=metadata.get("title", "").strip(),
+        summary=metadata.get("summary", "").strip(),
+        category=metadata.get("category", "").strip(),
+        tags=[item.strip() for item in metadata.get("tags", "").split(",") if item.strip()],
+        date=parsed_date,
+        body_offset=body_offset,
+    )
+
+
+class ArticleCorpusIndex:
+    """Process-wide cache of parsed articles under one articles directory.
+
+    Each file is parsed once and re-parsed only when its mtime or size changes.
+    Freshness is checked with a stat-only walk at most once per ``refresh_interval``
+    seconds; writers in this process call ``notify_changed`` so their own edits are
+    visible immediately. ``version`` increases whenever the set of records changes,
+    so consumers can key derived views on it.
+    """
+
+    def __init__(
+        self,
+        articles_dir: Path,
+        *,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        parser: Callable[[Path], ArticleRecord | None] = parse_article_file,
+    ) -> None:
+        self.articles_dir = articles_dir
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self.parser = parser
+        self.version = 0
+        self._lock = threading.RLock()
+        self._records: dict[Path, ArticleRecord | None] = {}
+        self._stats: dict[Path, tuple[int, int]] = {}
+        self._sorted: list[ArticleRecord] = []
+        self._checked_at: float | None = None
+
+    def records(self) -> list[ArticleRecord]:
+        """All parseable articles, sorted by path."""
+        return self.snapshot()[1]
+
+    def snapshot(self) -> tuple[int, list[ArticleRecord]]:
+        """``(version, records)`` read together, for views derived from the corpus."""
+        with self._lock:
+            if self._checked_at is None or self.clock() - self._checked_at >= self.refresh_interval:
+                self.refresh()
+            return self.version, self._sorted
+
+    def refresh(self) -> bool:
+        """Stat every article and re-parse new or modified files; returns True if anything changed."""
+        with self._lock:
+            seen: dict[Path, tuple[int, int]] = {}
+            for article_path in self.articles_dir.rglob("*.md"):
+                try:
+                    stat = article_path.stat()
+                except OSError:
+                    continue
+                seen[article_path] = (stat.st_mtime_ns, stat.st_size)
+
+            changed = False
+            for article_path in list(self._stats):
+                if article_path not in seen:
+                    del self._stats[article_path]
+                    self._records.pop(article_path, None)
+                    changed = True
+            for article_path, signature in seen.items():
+                if self._stats.get(article_path) != signature:
+                    self._stats[article_path] = signature
+                    self._records[article_path] = self.parser(article_path)
+                    changed = True
+
+            self._checked_at = self.clock()
+            if changed:
+                self._rebuild()
+            return changed
+
+    def notify_changed(self, article_path: Path) -> None:
+        """Re-read (or drop) one article right away, e.g. after publishing it."""
+        with self._lock:
+            try:
+                stat = article_path.stat()
+            except OSError:
+                self._stats.pop(article_path, None)
+                self._records.pop(article_path, None)
+            else:
+                self._stats[article_path] = (stat.st_mtime_ns, stat.st_size)
+                self._records[article_path] = self.parser(article_path)
+            self._rebuild()
+
+    def records_for(self, article_paths: Iterable[Path]) -> dict[Path, ArticleRecord | None]:
+        """Records for just ``article_paths``, re-parsing only files whose stat changed.
+
+        Unlike ``snapshot`` this never walks the articles directory, so views with
+        their own persisted stat signatures can ask for the few files that changed.
+        Missing or unparseable files map to ``None``.
+        """
+        with self._lock:
+            changed = False
+            result: dict[Path, ArticleRecord | None] = {}
+            for article_path in article_paths:
+                try:
+                    stat = article_path.stat()
+                except OSError:
+                    if self._stats.pop(article_path, None) is not None:
+                        self._records.pop(article_path, None)
+                        changed = True
+                    result[article_path] = None
+                    continue
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if self._stats.get(article_path) != signature:
+                    self._stats[article_path] = signature
+                    self._records[article_path] = self.parser(article_path)
+                    changed = True
+                result[article_path] = self._records[article_path]
+            if changed:
+                self._rebuild()
+            return result
+
+    def _rebuild(self) -> None:
+        self._sorted = sorted(
+            (record for record in self._records.values() if record is not None),
+            key=lambda record: record.source.as_posix(),
+        )
+        self.version += 1
+
+
+_shared_indexes: dict[Path, ArticleCorpusIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_corpus_index(articles_dir: Path) -> ArticleCorpusIndex:
+    """Return the process-wide index for ``articles_dir``, creating it on first use."""
+    key = Path(articles_dir).resolve()
+    with _shared_lock:
+        index = _shared_indexes.get(key)
+        if index is None:
+            index = ArticleCorpusIndex(Path(articles_dir))
+            _shared_indexes[key] = index
+        return index
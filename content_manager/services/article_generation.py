@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
-import requests
+from content_manager.services.generation_cache import GenerationCache
+from content_manager.services.http_transport import PooledTransport
+from content_manager.services.request_body import FileDataURL, StreamingJSONBody
+
+DEFAULT_API_BASE = "https://api.openai.com/v1"
+SYSTEM_PROMPT = "Return valid JSON only."
 
 
 @dataclass(frozen=True)
@@ -24,6 +30,7 @@ class GenerationRequest:
     draft_tags: list[str] | None = None
     draft_content: str = ""
     related_articles: list[dict] | None = None
+    force_regenerate: bool = False
 
 
 class ArticleGenerator:
@@ -32,109 +39,143 @@ class ArticleGenerator:
         *,
         api_key: str,
         model: str,
-        request_fn: Callable = requests.post,
+        request_fn: Callable | None = None,
+        api_base: str = DEFAULT_API_BASE,
+        cache: GenerationCache | None = None,
     ) -> None:
         self.api_key = api_key
         self.model = model
-        self.request_fn = request_fn
+        self.request_fn = request_fn or PooledTransport()
+        self.api_base = (api_base or DEFAULT_API_BASE).rstrip("/")
+        self.cache = cache
 
     def generate(self, request: GenerationRequest) -> dict:
         if not self.api_key:
             raise RuntimeError("OPENAI_API_KEY is not set")
+        if self.cache is None:
+            return self._request_generation(request)
 
-        response = self.request_fn(
-            "https://api.openai.com/v1/responses",
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-            json=self._build_payload(request),
-            timeout=90,
+        result, cache_hit = self.cache.get_or_compute(
+            self.cache_key(request),
+            lambda: self._request_generation(request),
+            force=request.force_regenerate,
         )
+        return {**result, "cached": cache_hit}
+
+    def cache_key(self, request: GenerationRequest) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"model:{self.model}\nsystem:{SYSTEM_PROMPT}\n".encode("utf-8"))
+        for part in build_input_parts(request):
+            if part["type"] == "input_image":
+                digest.update(f"image:{file_sha256(part['path'])}\n".encode("utf-8"))
+            else:
+                text = part["text"].encode("utf-8")
+                digest.update(f"text:{len(text)}\n".encode("utf-8"))
+                digest.update(text)
+        return digest.hexdigest()
+
+    def _request_generation(self, request: GenerationRequest) -> dict:
+        response = self._post_request(request, stream=False)
         response.raise_for_status()
         return self._normalize_model_response(response.json())
 
-    def _build_payload(self, request: GenerationRequest) -> dict:
-        canonical_job = request.canonical_job
-        prompt = (
-            "Create a draft pack for a personal blog article. "
-            "Use the visible content in the uploaded media and the extracted metadata as the primary factual grounding.\n"
-            f"Canonical location: {canonical_job['location_name']}\n"
-            f"Canonical capture time: {canonical_job['captured_at']}\n"
-            f"Derived time of day: {canonical_job['time_of_day']}\n"
-            f"Likely named locations: {request.likely_named_locations or ['none']}\n"
-            f"Warnings: {request.warnings or ['none']}\n"
-            f"Allowed categories: {request.allowed_categories}\n"
-            f"Allowed tags: {request.allowed_tags}\n"
-            "Return strict JSON with keys: title_ideas, summary, category, tags, content_markdown.\n"
-            "title_ideas must be exactly 3 strings.\n"
-            "category must be one of the allowed categories.\n"
-            "tags must use only allowed tags.\n"
-            "tags must be 5 to 8 concise strings.\n"
-            "content_markdown must be 2 to 5 short paragraphs.\n"
-            "Write like a personal site post, not a generic explainer.\n"
-            "Avoid broad introductions about the subject as a whole.\n"
-            "Preserve useful details from the current draft when they do not conflict with visible media or extracted metadata.\n"
-            "Use related published posts for style, pacing, and tone only, not as factual evidence for the new article.\n"
-            "Do not invent exact venue names, dates, or hidden facts beyond likely named locations."
-        )
-        content = [{"type": "input_text", "text": prompt}]
-        if (
-            request.draft_title
-            or request.draft_summary
-            or request.draft_category
-            or request.draft_tags
-            or request.draft_content
-        ):
-            content.append({
-                "type": "input_text",
-                "text": (
-                    "Current draft context to refine and continue:\n"
-                    f"Title: {request.draft_title or 'n/a'}\n"
-                    f"Summary: {request.draft_summary or 'n/a'}\n"
-                    f"Category: {request.draft_category or 'n/a'}\n"
-                    f"Tags: {request.draft_tags or ['none']}\n"
-                    f"Draft content:\n{request.draft_content or 'n/a'}"
-                ),
-            })
-        for article in request.related_articles or []:
-            content.append({
-                "type": "input_text",
-                "text": (
-                    "Related published post for style only:\n"
-                    f"Title: {article.get('title') or 'n/a'}\n"
-                    f"Category: {article.get('category') or 'n/a'}\n"
-                    f"Tags: {article.get('tags') or []}\n"
-                    f"Summary: {article.get('summary') or 'n/a'}\n"
-                    f"Excerpt: {article.get('excerpt') or 'n/a'}"
-                ),
-            })
-        for item in request.media_context:
-            media_summary = (
-                f"Media file {item['name']} ({item['media_type']}), "
-                f"location={item.get('location_name') or 'n/a'}, "
-                f"captured_at={item.get('captured_at') or 'n/a'}, "
-                f"time_of_day={item.get('time_of_day') or 'n/a'}."
-            )
-            if item["media_type"] == "video":
-                frame_count = len(item.get("model_input_paths") or [])
-                media_summary += f" The following images are sampled frames from this video ({frame_count} frames)."
-            content.append({
-                "type": "input_text",
-                "text": media_summary,
-            })
-            for path in item.get("model_input_paths") or []:
-                content.append({
-                    "type": "input_image",
-                    "image_url": data_url_for_path(path),
-                })
+    def _post_request(self, request: GenerationRequest, *, stream: bool):
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        options: dict = {"timeout": 90}
+        if stream:
+            headers["Accept"] = "text/event-stream"
+            options["stream"] = True
+        # Transports that accept an iterable body get images base64-encoded while the
+        # request is written; plain request functions receive the materialized dict.
+        if getattr(self.request_fn, "supports_streaming_body", False):
+            payload = self._build_payload(request, image_url=lazy_data_url_for_path)
+            if stream:
+                payload["stream"] = True
+            return self.request_fn(f"{self.api_base}/responses", headers=headers, data=StreamingJSONBody(payload), **options)
+        payload = self._build_payload(request)
+        if stream:
+            payload["stream"] = True
+        return self.request_fn(f"{self.api_base}/responses", headers=headers, json=payload, **options)
+
+    def generate_stream(self, request: GenerationRequest) -> Iterator[dict]:
+        """Yield ``delta`` events as output text arrives, then one ``result`` event.
+
+        Cached results are replayed as a single ``result`` event. Streamed results are
+        normalized exactly like ``generate`` once the response completes. Identical
+        requests share the cache's in-flight computation with ``generate`` and with
+        each other: only the first one POSTs, the rest wait and receive its result as
+        a single cached ``result`` event.
+        """
+        if not self.api_key:
+            raise RuntimeError("OPENAI_API_KEY is not set")
+        cache_key = self.cache_key(request) if self.cache is not None else None
+        inflight = None
+        if cache_key and not request.force_regenerate:
+            shared, inflight = self.cache.join_or_lead(cache_key)
+            if inflight is None:
+                yield {"type": "result", "result": {**shared, "cached": True}}
+                return
+
+        try:
+            result = yield from self._stream_generation(request)
+            if cache_key:
+                self.cache.put(cache_key, result)
+        except BaseException as err:
+            if inflight is not None:
+                if not isinstance(err, Exception):  # the consumer closed the stream early
+                    err = RuntimeError("generation stream was closed before it completed")
+                self.cache.finish(cache_key, inflight, error=err)
+            raise
+        if inflight is not None:
+            self.cache.finish(cache_key, inflight, result=result)
+        yield {"type": "result", "result": {**result, "cached": False}}
+
+    def _stream_generation(self, request: GenerationRequest) -> Iterator[dict]:
+        """Yield ``delta`` events and return the normalized result."""
+        response = self._post_request(request, stream=True)
+        deltas: list[str] = []
+        completed: dict | None = None
+        try:
+            response.raise_for_status()
+            for event in iter_sse_events(response.iter_lines(decode_unicode=True)):
+                event_type = event.get("type")
+                if event_type == "response.output_text.delta" and event.get("delta"):
+                    deltas.append(event["delta"])
+                    yield {"type": "delta", "text": event["delta"]}
+                elif event_type == "response.completed":
+                    completed = event.get("response") or {}
+                elif event_type in {"error", "response.failed"}:
+                    error = event.get("error") or (event.get("response") or {}).get("error") or {}
+                    raise RuntimeError(f"OpenAI stream failed: {error.get('message') or 'unknown error'}")
+        finally:
+            response.close()
 
+        if not completed or not extract_output_text(completed):
+            completed = {"output_text": "".join(deltas)}
+        return self._normalize_model_response(completed)
+
+    def _build_payload(
+        self,
+        request: GenerationRequest,
+        *,
+        image_url: Callable[[Path], object] | None = None,
+    ) -> dict:
+        image_url = image_url or data_url_for_path
+        content = []
+        for part in build_input_parts(request):
+            if part["type"] == "input_image":
+                content.append({"type": "input_image", "image_url": image_url(part["path"])})
+            else:
+                content.append(part)
         return {
             "model": self.model,
             "input": [
                 {
                     "role": "system",
-                    "content": [{"type": "input_text", "text": "Return valid JSON only."}],
+                    "content": [{"type": "input_text", "text": SYSTEM_PROMPT}],
                 },
                 {
                     "role": "user",
@@ -171,6 +212,84 @@ class ArticleGenerator:
         }
 
 
+def build_input_parts(request: GenerationRequest) -> list[dict]:
+    """User content parts with images left as file paths until the payload is serialized."""
+    canonical_job = request.canonical_job
+    prompt = (
+        "Create a draft pack for a personal blog article. "
+        "Use the visible content in the uploaded media and the extracted metadata as the primary factual grounding.\n"
+        f"Canonical location: {canonical_job['location_name']}\n"
+        f"Canonical capture time: {canonical_job['captured_at']}\n"
+        f"Derived time of day: {canonical_job['time_of_day']}\n"
+        f"Likely named locations: {request.likely_named_locations or ['none']}\n"
+        f"Warnings: {request.warnings or ['none']}\n"
+        f"Allowed categories: {request.allowed_categories}\n"
+        f"Allowed tags: {request.allowed_tags}\n"
+        "Return strict JSON with keys: title_ideas, summary, category, tags, content_markdown.\n"
+        "title_ideas must be exactly 3 strings.\n"
+        "category must be one of the allowed categories.\n"
+        "tags must use only allowed tags.\n"
+        "tags must be 5 to 8 concise strings.\n"
+        "content_markdown must be 2 to 5 short paragraphs.\n"
+        "Write like a personal site post, not a generic explainer.\n"
+        "Avoid broad introductions about the subject as a whole.\n"
+        "Preserve useful details from the current draft when they do not conflict with visible media or extracted metadata.\n"
+        "Use related published posts for style, pacing, and tone only, not as factual evidence for the new article.\n"
+        "Do not invent exact venue names, dates, or hidden facts beyond likely named locations."
+    )
+    content = [{"type": "input_text", "text": prompt}]
+    if (
+        request.draft_title
+        or request.draft_summary
+        or request.draft_category
+        or request.draft_tags
+        or request.draft_content
+    ):
+        content.append({
+            "type": "input_text",
+            "text": (
+                "Current draft context to refine and continue:\n"
+                f"Title: {request.draft_title or 'n/a'}\n"
+                f"Summary: {request.draft_summary or 'n/a'}\n"
+                f"Category: {request.draft_category or 'n/a'}\n"
+                f"Tags: {request.draft_tags or ['none']}\n"
+                f"Draft content:\n{request.draft_content or 'n/a'}"
+            ),
+        })
+    for article in request.related_articles or []:
+        content.append({
+            "type": "input_text",
+            "text": (
+                "Related published post for style only:\n"
+                f"Title: {article.get('title') or 'n/a'}\n"
+                f"Category: {article.get('category') or 'n/a'}\n"
+                f"Tags: {article.get('tags') or []}\n"
+                f"Summary: {article.get('summary') or 'n/a'}\n"
+                f"Excerpt: {article.get('excerpt') or 'n/a'}"
+            ),
+        })
+    for item in request.media_context:
+        media_summary = (
+            f"Media file {item['name']} ({item['media_type']}), "
+            f"location={item.get('location_name') or 'n/a'}, "
+            f"captured_at={item.get('captured_at') or 'n/a'}, "
+            f"time_of_day={item.get('time_of_day') or 'n/a'}."
+        )
+        if item["media_type"] == "video":
+            frame_count = len(item.get("model_input_paths") or [])
+            media_summary += f" The following images are sampled frames from this video ({frame_count} frames)."
+        content.append({
+            "type": "input_text",
+            "text": media_summary,
+        })
+        for path in item.get("model_input_paths") or []:
+            content.append({
+                "type": "input_image",
+                "path": Path(path),
+            })
+    return content
+
+
 def guess_mime_type(path: Path) -> str:
     ext = path.suffix.lower()
     return {
@@ -191,6 +310,41 @@ def data_url_for_path(path: Path) -> str:
     return f"data:{guess_mime_type(path)};base64,{encoded}"
 
 
+def lazy_data_url_for_path(path: Path) -> FileDataURL:
+    return FileDataURL(path, guess_mime_type(path))
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_sse_events(lines) -> Iterator[dict]:
+    """Decode the JSON ``data:`` payloads of a server-sent event stream."""
+    data_lines: list[str] = []
+    for line in lines:
+        if line is None:
+            continue
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line:
+            if data_lines:
+                payload = "\n".join(data_lines)
+                data_lines = []
+                if payload != "[DONE]":
+                    yield json.loads(payload)
+            continue
+        if line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+    if data_lines:
+        payload = "\n".join(data_lines)
+        if payload != "[DONE]":
+            yield json.loads(payload)
+
+
 def extract_output_text(payload: dict) -> str:
     if isinstance(payload.get("output_text"), str):
         return payload["output_text"]
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import html
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from content_manager.services.article_corpus import ArticleCorpusIndex, ArticleRecord
+
+SEARCH_INDEX_FILENAME = "article-search.sqlite3"
+SEARCH_SCHEMA_VERSION = 1
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+# bm25() column weights, in FTS column order: title, summary, tags, category, body.
+COLUMN_WEIGHTS = (10.0, 4.0, 6.0, 2.0, 1.0)
+SNIPPET_TOKENS = 16
+# Control characters never appear in article text, so they can mark hits until the
+# snippet is HTML-escaped and they are swapped for <mark> tags.
+_HIT_START = "\x02"
+_HIT_END = "\x03"
+_QUERY_TOKEN_PATTERN = re.compile(r"\w+\*?")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    category TEXT NOT NULL,
+    category_key TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    date TEXT NOT NULL,
+    signature TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_category ON documents (category_key);
+CREATE TABLE IF NOT EXISTS document_tags (
+    doc_key TEXT NOT NULL,
+    tag_key TEXT NOT NULL,
+    PRIMARY KEY (tag_key, doc_key)
+);
+CREATE INDEX IF NOT EXISTS document_tags_doc ON document_tags (doc_key);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, summary, tags, category, body,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+PRAGMA user_version = {SEARCH_SCHEMA_VERSION};
+"""
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    kind: str
+    ref: str
+    title: str
+    summary: str
+    category: str
+    tags: list[str]
+    date: str
+    body: str
+    signature: str
+
+    @property
+    def doc_key(self) -> str:
+        return f"{self.kind}:{self.ref}"
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    kind: str
+    ref: str
+    title: str
+    summary: str
+    category: str
+    tags: list[str]
+    date: str
+    snippet: str
+    score: float
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "ref": self.ref,
+            "title": self.title,
+            "summary": self.summary,
+            "category": self.category,
+            "tags": self.tags,
+            "date": self.date,
+            "snippet": self.snippet,
+            "score": self.score,
+        }
+
+
+def build_match_query(text: str) -> str:
+    """Turn free text into an FTS5 MATCH expression.
+
+    Every word is quoted so FTS operators in user input are inert. Words ending
+    in ``*`` and the final word (the one still being typed) become prefix queries.
+    """
+    tokens = _QUERY_TOKEN_PATTERN.findall(text or "")
+    terms = []
+    for position, token in enumerate(tokens):
+        word = token.rstrip("*")
+        # One-letter prefixes are not in the prefix index and would scan every term.
+        prefix = (token.endswith("*") or position == len(tokens) - 1) and len(word) >= 2
+        terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " ".join(terms)
+
+
+def highlight_snippet(raw: str) -> str:
+    escaped = html.escape(raw or "")
+    return escaped.replace(_HIT_START, "<mark>").replace(_HIT_END, "</mark>")
+
+
+def article_document(record: ArticleRecord) -> SearchDocument:
+    return SearchDocument(
+        kind="article",
+        ref=record.path,
+        title=record.title,
+        summary=record.summary,
+        category=record.category,
+        tags=list(record.tags),
+        date=record.date.date().isoformat() if record.date else "",
+        body=record.load_body(),
+        signature=f"{record.mtime_ns}:{record.size}",
+    )
+
+
+def draft_document(draft_id: str, payload: dict) -> SearchDocument:
+    tags = payload.get("tags") or ""
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    updated_at = str(payload.get("updated_at") or "")
+    return SearchDocument(
+        kind="draft",
+        ref=draft_id,
+        title=str(payload.get("title") or "").strip(),
+        summary=str(payload.get("summary") or "").strip(),
+        category=str(payload.get("category") or "").strip(),
+        tags=[str(tag).strip() for tag in tags if str(tag).strip()],
+        date=updated_at[:10],
+        body=str(payload.get("content") or ""),
+        signature=updated_at,
+    )
+
+
+class ArticleSearchIndex:
+    """SQLite FTS5 index over published articles and in-progress drafts.
+
+    The database persists under the cache directory; each document keeps a
+    signature (mtime/size for articles, ``updated_at`` for drafts) so a sync only
+    rewrites rows that changed, and a cold start reuses everything still current.
+    Articles are re-synced when the corpus index version moves.
+    """
+
+    def __init__(self, corpus: ArticleCorpusIndex, db_path: Path | str = ":memory:") -> None:
+        self.corpus = corpus
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._corpus_version: int | None = None
+        self._connection: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        # Opened on first use so importing the app does not touch the cache directory.
+        if self._connection is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            connection.execute("PRAGMA journal_mode = WAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SEARCH_SCHEMA_VERSION:
+                connection.executescript(
+                    "DROP TABLE IF EXISTS documents; DROP TABLE IF EXISTS document_tags; DROP TABLE IF EXISTS documents_fts;"
+                )
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def sync(self, drafts: dict[str, dict] | None = None) -> int:
+        """Bring the index up to date; returns the number of documents written or removed.
+
+        ``drafts`` is a snapshot of the draft store (draft id -> payload); pass
+        ``None`` to leave indexed drafts untouched.
+        """
+        with self._lock:
+            changed = 0
+            version, records = self.corpus.snapshot()
+            if version != self._corpus_version:
+                changed += self._sync_kind("article", {
+                    record.path: (f"{record.mtime_ns}:{record.size}", lambda record=record: article_document(record))
+                    for record in records
+                })
+                self._corpus_version = version
+            if drafts is not None:
+                changed += self._sync_kind("draft", {
+                    draft_id: (str(payload.get("updated_at") or ""), lambda item=(draft_id, payload): draft_document(*item))
+                    for draft_id, payload in drafts.items()
+                })
+            return changed
+
+    def _sync_kind(self, kind: str, sources: dict[str, tuple[str, Callable[[], SearchDocument]]]) -> int:
+        stored = dict(self._db().execute("SELECT ref, signature FROM documents WHERE kind = ?", (kind,)))
+        changed = 0
+        with self._connection:
+            for ref in stored.keys() - sources.keys():
+                self._delete(f"{kind}:{ref}")
+                changed += 1
+            for ref, (signature, build_document) in sources.items():
+                if stored.get(ref) == signature:
+                    continue
+                document = build_document()
+                self._delete(document.doc_key)
+                self._insert(document)
+                changed += 1
+        return changed
+
+    def _delete(self, doc_key: str) -> None:
+        row = self._connection.execute("SELECT id FROM documents WHERE doc_key = ?", (doc_key,)).fetchone()
+        if row is None:
+            return
+        self._connection.execute("DELETE FROM documents_fts WHERE rowid = ?", row)
+        self._connection.execute("DELETE FROM document_tags WHERE doc_key = ?", (doc_key,))
+        self._connection.execute("DELETE FROM documents WHERE id = ?", row)
+
+    def _insert(self, document: SearchDocument) -> None:
+        tags = ", ".join(document.tags)
+        cursor = self._connection.execute(
+            "INSERT INTO documents (doc_key, kind, ref, title, summary, category, category_key, tags, date, signature) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                document.doc_key, document.kind, document.ref, document.title, document.summary,
+                document.category, document.category.lower(), tags, document.date, document.signature,
+            ),
+        )
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO document_tags VALUES (?, ?)",
+            [(document.doc_key, tag.lower()) for tag in document.tags],
+        )
+        self._connection.execute(
+            "INSERT INTO documents_fts (rowid, title, summary, tags, category, body) VALUES (?, ?, ?, ?, ?, ?)",
+            (cursor.lastrowid, document.title, document.summary, tags, document.category, document.body),
+        )
+
+    def search(
+        self,
+        query: str = "",
+        *,
+        tags: list[str] | None = None,
+        category: str = "",
+        kind: str = "",
+        limit: int = DEFAULT_SEARCH_LIMIT,
+    ) -> list[SearchHit]:
+        """Rank matches by weighted BM25; with an empty query, list filtered documents newest first."""
+        limit = max(1, min(int(limit), MAX_SEARCH_LIMIT))
+        filters: list[str] = []
+        params: list = []
+        if kind:
+            filters.append("d.kind = ?")
+            params.append(kind)
+        if category:
+            filters.append("d.category_key = ?")
+            params.append(category.strip().lower())
+        tag_keys = sorted({tag.strip().lower() for tag in tags or [] if tag.strip()})
+        if tag_keys:
+            placeholders = ", ".join("?" for _ in tag_keys)
+            filters.append(
+                f"d.doc_key IN (SELECT doc_key FROM document_tags WHERE tag_key IN ({placeholders}) "
+                "GROUP BY doc_key HAVING COUNT(*) = ?)"
+            )
+            params.extend([*tag_keys, len(tag_keys)])
+
+        where = "".join(f" AND {clause}" for clause in filters)
+        match = build_match_query(query)
+        if match:
+            weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS)
+            # Rank and cut to ``limit`` first; snippet() is costly, so it only runs on the rows returned.
+            sql = (
+                "WITH ranked AS ("
+                f"SELECT f.rowid AS id, bm25(documents_fts, {weights}) AS rank "
+                "FROM documents_fts f JOIN documents d ON d.id = f.rowid "
+                f"WHERE documents_fts MATCH ?{where} ORDER BY rank LIMIT ?) "
+                "SELECT d.kind, d.ref, d.title, d.summary, d.category, d.tags, d.date, "
+                f"snippet(documents_fts, 4, '{_HIT_START}', '{_HIT_END}', '…', {SNIPPET_TOKENS}), ranked.rank "
+                "FROM ranked JOIN documents d ON d.id = ranked.id "
+                "JOIN documents_fts ON documents_fts.rowid = ranked.id "
+                "WHERE documents_fts MATCH ? ORDER BY ranked.rank, d.date DESC"
+            )
+            params = [match, *params, limit, match]
+        else:
+            sql = (
+                "SELECT d.kind, d.ref, d.title, d.summary, d.category, d.tags, d.date, "
+                "substr(f.body, 1, 200), 0.0 "
+                f"FROM documents d JOIN documents_fts f ON f.rowid = d.id WHERE 1{where} "
+                "ORDER BY d.date DESC, d.ref LIMIT ?"
+            )
+            params = [*params, limit]
+
+        with self._lock:
+            rows = self._db().execute(sql, params).fetchall()
+        return [
+            SearchHit(
+                kind=row[0],
+                ref=row[1],
+                title=row[2],
+                summary=row[3],
+                category=row[4],
+                tags=[tag.strip() for tag in row[5].split(",") if tag.strip()],
+                date=row[6],
+                snippet=highlight_snippet(row[7]),
+                score=round(-float(row[8]), 4),
+            )
+            for row in rows
+        ]
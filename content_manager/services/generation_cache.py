@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class _InFlight:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: dict | None = None
+    error: BaseException | None = None
+
+
+class GenerationCache:
+    """On-disk cache of normalized generation results keyed by request digest.
+
+    Entries expire after ``ttl_seconds`` and the oldest entries are evicted once
+    the directory grows beyond ``max_bytes``. Concurrent lookups for the same key
+    share a single in-flight computation.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._inflight: dict[str, _InFlight] = {}
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        created_at = entry.get("created_at")
+        if not isinstance(created_at, (int, float)) or self.clock() - created_at > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+        result = entry.get("result")
+        return result if isinstance(result, dict) else None
+
+    def put(self, key: str, result: dict) -> None:
+        # Cache writes are best-effort: a failed write never fails the generation that produced it.
+        path = self._entry_path(key)
+        payload = json.dumps({"created_at": self.clock(), "result": result})
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(payload)
+            os.replace(temp_name, path)
+        except OSError:
+            Path(temp_name).unlink(missing_ok=True)
+            return
+        self._evict()
+
+    def get_or_compute(self, key: str, compute: Callable[[], dict], *, force: bool = False) -> tuple[dict, bool]:
+        """Return ``(result, cache_hit)``; ``force`` skips both the stored entry and any in-flight call."""
+        if force:
+            result = compute()
+            self.put(key, result)
+            return copy.deepcopy(result), False
+
+        shared, inflight = self.join_or_lead(key)
+        if inflight is None:
+            return shared, True
+        try:
+            result = compute()
+            self.put(key, result)
+        except BaseException as err:
+            self.finish(key, inflight, error=err)
+            raise
+        self.finish(key, inflight, result=result)
+        return copy.deepcopy(result), False
+
+    def join_or_lead(self, key: str) -> tuple[dict | None, _InFlight | None]:
+        """Share ``key``'s stored entry or in-flight computation, or become its leader.
+
+        Returns ``(result, None)`` when a stored entry or another caller's finished
+        computation answers the request; that caller's error is re-raised instead.
+        Returns ``(None, slot)`` when this caller must compute the result, store it
+        with ``put`` and then always call ``finish(key, slot, ...)``. Callers that
+        cannot pass a ``compute`` callback, such as streams, use this directly.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, None
+
+        with self._lock:
+            inflight = self._inflight.get(key)
+            leader = inflight is None
+            if leader:
+                inflight = _InFlight()
+                self._inflight[key] = inflight
+
+        if not leader:
+            inflight.done.wait()
+            if inflight.error is not None:
+                raise inflight.error
+            return copy.deepcopy(inflight.result), None
+
+        # Another leader may have finished between our first lookup and taking the slot.
+        cached = self.get(key)
+        if cached is not None:
+            self.finish(key, inflight, result=cached)
+            return copy.deepcopy(cached), None
+        return None, inflight
+
+    def finish(self, key: str, inflight: _InFlight, *, result: dict | None = None, error: BaseException | None = None) -> None:
+        """Hand the leader's ``result`` (or ``error``) to waiting callers and free the slot."""
+        inflight.result = result
+        inflight.error = error
+        with self._lock:
+            self._inflight.pop(key, None)
+        inflight.done.set()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            path.unlink(missing_ok=True)
+            total -= size
+            if total <= self.max_bytes:
+                break
@@ -1,18 +1,21 @@
 from __future__ import annotations
 
 import json
-import re
 import subprocess
 import tempfile
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
 from content_manager.config import AppConfig
+from content_manager.services.article_corpus import ArticleRecord, shared_corpus_index
 from content_manager.services.article_generation import ArticleGenerator, GenerationRequest
 from content_manager.services.location_context import find_likely_named_locations
 from content_manager.services.media_metadata import extract_media_metadata, ffprobe_json
+from content_manager.services.near_duplicates import NearDuplicateMatch, near_duplicate_index, near_duplicate_warnings
+from content_manager.services.payload_budget import PayloadBudget, fit_request_to_budget
+from content_manager.services.related_articles import related_article_index
 from content_manager.services.site_taxonomy import SiteTaxonomy, load_site_taxonomy, normalize_category, normalize_tags
 from content_manager.state import AppState
 
@@ -21,15 +24,6 @@ MODEL_SUPPORTED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 VIDEO_EXTENSIONS = {".mp4", ".mov", ".mkv", ".avi", ".webm", ".m4v", ".gif"}
 VIDEO_FRAME_SAMPLE_COUNT = 4
 RELATED_ARTICLE_LIMIT = 3
-ARTICLE_EXCERPT_LENGTH = 360
-_KEYWORD_PATTERN = re.compile(r"[a-z0-9]{3,}")
-_STOP_WORDS = {
-    "this", "that", "with", "from", "have", "they", "them", "were", "what", "when", "just",
-    "like", "into", "about", "there", "their", "really", "would", "could", "should", "because",
-    "still", "today", "also", "then", "than", "after", "before", "around", "over", "under",
-    "very", "more", "some", "much", "many", "only", "your", "mine", "ours", "been", "being",
-    "make", "made", "gets", "getting", "post", "article", "draft", "content", "video", "image",
-}
 
 
 @dataclass(frozen=True)
@@ -45,6 +39,7 @@ class GeneratedArticleResult:
     time_of_day: str
     source_media: list[str]
     warnings: list[str]
+    near_duplicates: list[NearDuplicateMatch]
 
     def to_dict(self) -> dict:
         return {
@@ -60,6 +55,7 @@ class GeneratedArticleResult:
             "time_of_day": self.time_of_day,
             "source_media": self.source_media,
             "warnings": self.warnings,
+            "near_duplicates": [match.to_dict() for match in self.near_duplicates],
         }
 
 
@@ -279,106 +275,21 @@ def prepare_media_context_for_generation(
     return prepared_context, temp_dir
 
 
-def _parse_article_text(article_path: Path) -> RelatedArticleContext | None:
-    try:
-        raw = article_path.read_text(encoding="utf-8", errors="ignore")
-    except OSError:
-        return None
-
-    metadata: dict[str, str] = {}
-    body_lines: list[str] = []
-    in_header = True
-    for line in raw.splitlines():
-        if in_header and line.strip():
-            if ":" in line:
-                key, value = line.split(":", 1)
-                metadata[key.strip().lower()] = value.strip()
-                continue
-            in_header = False
-        if in_header and not line.strip():
-            in_header = False
-            continue
-        body_lines.append(line)
-
-    title = metadata.get("title", "").strip()
-    if not title:
-        return None
-    summary = metadata.get("summary", "").strip()
-    category = metadata.get("category", "").strip()
-    tags = [item.strip() for item in metadata.get("tags", "").split(",") if item.strip()]
-    body = "\n".join(body_lines).strip()
-    collapsed_body = " ".join(body.split())
-    excerpt = collapsed_body[:ARTICLE_EXCERPT_LENGTH].strip()
-    if len(collapsed_body) > ARTICLE_EXCERPT_LENGTH:
-        excerpt += "..."
-    parsed_date = None
-    date_value = metadata.get("date", "").strip()
-    if date_value:
-        try:
-            parsed_date = datetime.strptime(date_value[:10], "%Y-%m-%d")
-        except ValueError:
-            parsed_date = None
+def _related_context(record: ArticleRecord) -> RelatedArticleContext:
     return RelatedArticleContext(
-        path=article_path.relative_to(article_path.parents[2]).as_posix(),
-        title=title,
-        summary=summary,
-        category=category,
-        tags=tags,
-        body=body,
-        date=parsed_date,
-        excerpt=excerpt or summary,
+        path=record.path,
+        title=record.title,
+        summary=record.summary,
+        category=record.category,
+        tags=record.tags,
+        body=record.load_body(),
+        date=record.date,
+        excerpt=record.load_excerpt(),
     )
 
 
 def load_related_article_candidates(articles_dir: Path) -> list[RelatedArticleContext]:
-    articles: list[RelatedArticleContext] = []
-    for article_path in sorted(articles_dir.rglob("*.md")):
-        article = _parse_article_text(article_path)
-        if article is not None:
-            articles.append(article)
-    return articles
-
-
-def _keyword_set(*values: str) -> set[str]:
-    keywords: set[str] = set()
-    for value in values:
-        for match in _KEYWORD_PATTERN.findall((value or "").lower()):
-            if match not in _STOP_WORDS:
-                keywords.add(match)
-    return keywords
-
-
-def _score_related_article(
-    article: RelatedArticleContext,
-    *,
-    draft_category: str,
-    draft_tags: list[str],
-    likely_named_locations: list[str],
-    draft_title: str,
-    draft_summary: str,
-    draft_content: str,
-) -> tuple[int, int, float, str]:
-    score = 0
-    same_category = int(bool(draft_category and article.category.lower() == draft_category.lower()))
-    if same_category:
-        score += 100
-
-    draft_tag_keys = {tag.strip().lower() for tag in draft_tags if tag.strip()}
-    article_tag_keys = {tag.lower() for tag in article.tags}
-    score += 12 * len(draft_tag_keys & article_tag_keys)
-
-    article_text = " ".join([article.title, article.summary, article.body]).lower()
-    for location in likely_named_locations:
-        location = (location or "").strip().lower()
-        if location and location in article_text:
-            score += 8
-
-    draft_keywords = _keyword_set(draft_title, draft_summary, draft_content, " ".join(draft_tags))
-    article_keywords = _keyword_set(article.title, article.summary, article.body, " ".join(article.tags))
-    score += min(len(draft_keywords & article_keywords), 8)
-
-    recency = article.date.timestamp() if article.date is not None else float("-inf")
-    return (-score, -same_category, -recency, article.path)
+    return [_related_context(record) for record in shared_corpus_index(articles_dir).records() if record.title]
 
 
 def select_related_articles(
@@ -392,21 +303,16 @@ def select_related_articles(
     draft_content: str = "",
     limit: int = RELATED_ARTICLE_LIMIT,
 ) -> list[RelatedArticleContext]:
-    draft_tags = draft_tags or []
-    likely_named_locations = likely_named_locations or []
-    ranked = sorted(
-        load_related_article_candidates(articles_dir),
-        key=lambda article: _score_related_article(
-            article,
-            draft_category=draft_category,
-            draft_tags=draft_tags,
-            likely_named_locations=likely_named_locations,
-            draft_title=draft_title,
-            draft_summary=draft_summary,
-            draft_content=draft_content,
-        ),
+    ranked = related_article_index(articles_dir).search(
+        draft_category=draft_category,
+        draft_tags=draft_tags,
+        likely_named_locations=likely_named_locations,
+        draft_title=draft_title,
+        draft_summary=draft_summary,
+        draft_content=draft_content,
+        limit=limit,
     )
-    return ranked[:limit]
+    return [_related_context(record) for record in ranked]
 
 
 def canonicalize_generation_context(media_context: list[dict]) -> tuple[dict, list[str]]:
@@ -435,10 +341,21 @@ def canonicalize_generation_context(media_context: list[dict]) -> tuple[dict, li
     return canonical, deduped
 
 
-def generate_article_from_sources(
+@dataclass(frozen=True)
+class PreparedGeneration:
+    request: GenerationRequest
+    media_context: list[dict]
+    canonical_job: dict
+    warnings: list[str]
+    taxonomy: SiteTaxonomy
+    fallback_category: str
+    likely_named_locations: list[str]
+    articles_dir: Path
+
+
+def prepare_generation(
     *,
     config: AppConfig,
-    generator: ArticleGenerator,
     media_job_ids: list[str] | None = None,
     media_paths: list[str] | None = None,
     draft_title: str = "",
@@ -447,7 +364,14 @@ def generate_article_from_sources(
     draft_tags: list[str] | None = None,
     draft_content: str = "",
     state: AppState | None = None,
-) -> GeneratedArticleResult:
+    force_regenerate: bool = False,
+    taxonomy: SiteTaxonomy | None = None,
+) -> PreparedGeneration:
+    """Resolve media, taxonomy and related posts; frames are sampled separately.
+
+    Pass ``taxonomy`` to reuse one snapshot across many generations instead of
+    re-reading every article's front matter.
+    """
     media_job_ids = media_job_ids or []
     media_paths = media_paths or []
     draft_tags = draft_tags or []
@@ -461,7 +385,8 @@ def generate_article_from_sources(
         raise ValueError("Provide at least one media job or existing media path")
 
     canonical_job, warnings = canonicalize_generation_context(media_context)
-    taxonomy = load_site_taxonomy(config.articles_dir)
+    if taxonomy is None:
+        taxonomy = load_site_taxonomy(config.articles_dir, cache_dir=config.cache_dir)
     fallback_category = "Self"
     if canonical_job.get("location_name") and "kirkland" in canonical_job["location_name"].lower():
         fallback_category = "Pole Dance"
@@ -485,30 +410,58 @@ def generate_article_from_sources(
         draft_summary=draft_summary,
         draft_content=draft_content,
     )
-    allowed_tags = taxonomy.tags
-    prepared_context, temp_dir = prepare_media_context_for_generation(media_context)
-    try:
-        generated = generator.generate(
-            GenerationRequest(
-                media_context=prepared_context,
-                canonical_job=canonical_job,
-                warnings=warnings,
-                allowed_categories=taxonomy.categories,
-                allowed_tags=allowed_tags,
-                likely_named_locations=likely_named_locations,
-                draft_title=draft_title,
-                draft_summary=draft_summary,
-                draft_category=draft_category,
-                draft_tags=draft_tags,
-                draft_content=draft_content,
-                related_articles=[article.to_prompt_dict() for article in related_articles],
-            )
-        )
-    finally:
-        if temp_dir is not None:
-            temp_dir.cleanup()
-    category = normalize_category(generated.get("category"), taxonomy) or fallback_category
+    request = GenerationRequest(
+        media_context=media_context,
+        canonical_job=canonical_job,
+        warnings=warnings,
+        allowed_categories=taxonomy.categories,
+        allowed_tags=taxonomy.tags,
+        likely_named_locations=likely_named_locations,
+        draft_title=draft_title,
+        draft_summary=draft_summary,
+        draft_category=draft_category,
+        draft_tags=draft_tags,
+        draft_content=draft_content,
+        related_articles=[article.to_prompt_dict() for article in related_articles],
+        force_regenerate=force_regenerate,
+    )
+    return PreparedGeneration(
+        request=request,
+        media_context=media_context,
+        canonical_job=canonical_job,
+        warnings=warnings,
+        taxonomy=taxonomy,
+        fallback_category=fallback_category,
+        likely_named_locations=likely_named_locations,
+        articles_dir=config.articles_dir,
+    )
+
+
+def payload_budget_for(config: AppConfig) -> PayloadBudget:
+    return PayloadBudget(
+        max_bytes=config.generation_max_request_mb * 1024 * 1024,
+        max_tokens=config.generation_max_input_tokens,
+    )
+
+
+def finalize_generation(
+    prepared: PreparedGeneration,
+    generated: dict,
+    *,
+    trim_warnings: list[str] | None = None,
+) -> GeneratedArticleResult:
+    taxonomy = prepared.taxonomy
+    category = normalize_category(generated.get("category"), taxonomy) or prepared.fallback_category
     tags = normalize_tags(generated.get("tags"), taxonomy.tags_by_category.get(category) or taxonomy.tags)
+    warnings = [*prepared.warnings, *(trim_warnings or [])]
+    if generated.get("cached"):
+        warnings = [*warnings, "Reused a cached generation for identical inputs; force regenerate for a fresh draft."]
+    near_duplicates = near_duplicate_index(prepared.articles_dir).find(
+        content=generated["content_markdown"],
+        summary=generated["summary"],
+    )
+    warnings = [*warnings, *near_duplicate_warnings(near_duplicates)]
+    canonical_job = prepared.canonical_job
     return GeneratedArticleResult(
         title_ideas=generated["title_ideas"],
         summary=generated["summary"],
@@ -517,8 +470,91 @@ def generate_article_from_sources(
         content_markdown=generated["content_markdown"],
         location=canonical_job["location_name"],
         captured_at=canonical_job["captured_at"],
-        likely_named_locations=likely_named_locations,
+        likely_named_locations=prepared.likely_named_locations,
         time_of_day=canonical_job["time_of_day"],
-        source_media=[item["job_id"] for item in media_context],
+        source_media=[item["job_id"] for item in prepared.media_context],
         warnings=warnings,
+        near_duplicates=near_duplicates,
     )
+
+
+def generate_article_from_sources(
+    *,
+    config: AppConfig,
+    generator: ArticleGenerator,
+    media_job_ids: list[str] | None = None,
+    media_paths: list[str] | None = None,
+    draft_title: str = "",
+    draft_summary: str = "",
+    draft_category: str = "",
+    draft_tags: list[str] | None = None,
+    draft_content: str = "",
+    state: AppState | None = None,
+    force_regenerate: bool = False,
+    taxonomy: SiteTaxonomy | None = None,
+) -> GeneratedArticleResult:
+    prepared = prepare_generation(
+        config=config,
+        media_job_ids=media_job_ids,
+        media_paths=media_paths,
+        draft_title=draft_title,
+        draft_summary=draft_summary,
+        draft_category=draft_category,
+        draft_tags=draft_tags,
+        draft_content=draft_content,
+        state=state,
+        force_regenerate=force_regenerate,
+        taxonomy=taxonomy,
+    )
+    prepared_context, temp_dir = prepare_media_context_for_generation(prepared.media_context)
+    budget_dir = None
+    try:
+        request, trim_warnings, budget_dir = fit_request_to_budget(
+            replace(prepared.request, media_context=prepared_context),
+            payload_budget_for(config),
+        )
+        generated = generator.generate(request)
+    finally:
+        for directory in (temp_dir, budget_dir):
+            if directory is not None:
+                directory.cleanup()
+    return finalize_generation(prepared, generated, trim_warnings=trim_warnings)
+
+
+def stream_article_from_sources(
+    *,
+    config: AppConfig,
+    generator: ArticleGenerator,
+    **options,
+) -> Iterator[dict]:
+    """Streaming counterpart of ``generate_article_from_sources``.
+
+    Accepts the same keyword options and yields ``status`` and ``delta`` events
+    followed by a single ``result`` event carrying ``GeneratedArticleResult.to_dict()``.
+    """
+    yield {"type": "status", "message": "Reading media metadata..."}
+    prepared = prepare_generation(config=config, **options)
+    yield {"type": "status", "message": "Preparing media for the model..."}
+    prepared_context, temp_dir = prepare_media_context_for_generation(prepared.media_context)
+    budget_dir = None
+    try:
+        request, trim_warnings, budget_dir = fit_request_to_budget(
+            replace(prepared.request, media_context=prepared_context),
+            payload_budget_for(config),
+        )
+        if trim_warnings:
+            yield {"type": "status", "message": "Trimmed media to fit the request budget..."}
+        yield {"type": "status", "message": "Waiting for the model..."}
+        generated = None
+        for event in generator.generate_stream(request):
+            if event["type"] == "result":
+                generated = event["result"]
+            else:
+                yield event
+    finally:
+        for directory in (temp_dir, budget_dir):
+            if directory is not None:
+                directory.cleanup()
+    if generated is None:
+        raise RuntimeError("generation stream ended without a result")
+    yield {"type": "result", "result": finalize_generation(prepared, generated, trim_warnings=trim_warnings).to_dict()}
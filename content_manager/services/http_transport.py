@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+# 409 is left out: for a generation POST it means the server saw the request.
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE_SECONDS = 0.5
+DEFAULT_BACKOFF_MAX_SECONDS = 20.0
+DEFAULT_POOL_SIZE = 8
+TIMING_HISTORY_LIMIT = 200
+
+
+@dataclass(frozen=True)
+class RequestTiming:
+    url: str
+    status_code: int | None
+    attempts: int
+    elapsed_seconds: float
+    backoff_seconds: float
+    request_bytes: int | None
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "status_code": self.status_code,
+            "attempts": self.attempts,
+            "elapsed_seconds": self.elapsed_seconds,
+            "backoff_seconds": self.backoff_seconds,
+            "request_bytes": self.request_bytes,
+            "error": self.error,
+        }
+
+
+def parse_retry_after(value: str | None, *, now: datetime | None = None) -> float | None:
+    if not value:
+        return None
+    raw = value.strip()
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(raw)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max((retry_at - now).total_seconds(), 0.0)
+
+
+def _request_size(response: requests.Response | None, kwargs: dict) -> int | None:
+    """Size of the body that was sent, without re-encoding it.
+
+    Taken from the ``Content-Length`` of the request the session actually sent;
+    without a response, from ``len()`` of a ``data`` body that knows its own size
+    (bytes or ``StreamingJSONBody``). Anything else, e.g. an unsent ``json=``
+    payload, is recorded as ``None``.
+    """
+    request = getattr(response, "request", None)
+    length = getattr(request, "headers", {}).get("Content-Length") if request is not None else None
+    if length is not None:
+        try:
+            return int(length)
+        except ValueError:
+            return None
+    data = kwargs.get("data")
+    if isinstance(data, (str, dict, list, tuple)) or not hasattr(data, "__len__"):
+        # Form fields are encoded by requests; their len() is not the body size.
+        return None
+    return len(data)
+
+
+def is_connect_failure(err: requests.ConnectionError) -> bool:
+    """True if ``err`` happened before any of the request was sent.
+
+    That is a connect timeout, or a refused or unresolvable connection.
+    """
+    if isinstance(err, requests.ConnectTimeout):
+        return True
+    reason = err.args[0] if err.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, NewConnectionError)
+
+
+class PooledTransport:
+    """Keep-alive POST transport with bounded, jittered retries.
+
+    Instances are callable with the same shape as ``requests.post`` so they can
+    be passed anywhere a ``request_fn`` is accepted. Iterable ``data`` bodies must
+    be re-iterable so a retry can resend them.
+
+    Generation POSTs are not idempotent, so a request is only retried when it
+    cannot have been processed: on a connect-phase failure (see
+    ``is_connect_failure``) or a status in ``RETRYABLE_STATUS_CODES``. Any other
+    connection error, and a ``ReadTimeout``, is raised without a retry: the body
+    was sent and the server may still be generating, so resending could bill the
+    same generation twice.
+    """
+
+    supports_streaming_body = True
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base_seconds: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds: float = DEFAULT_BACKOFF_MAX_SECONDS,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        session: requests.Session | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[float, float], float] = random.uniform,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.max_retries = max(max_retries, 0)
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.session = session or self._build_session(pool_size)
+        self.sleep = sleep
+        self.jitter = jitter
+        self.clock = clock
+        self._timings: deque[RequestTiming] = deque(maxlen=TIMING_HISTORY_LIMIT)
+        self._timings_lock = threading.Lock()
+
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def __call__(self, url: str, **kwargs) -> requests.Response:
+        return self.post(url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        started = self.clock()
+        backoff_total = 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self.session.post(url, **kwargs)
+            except requests.ConnectionError as err:
+                if not is_connect_failure(err) or attempt > self.max_retries:
+                    self._record(url, None, attempt, started, backoff_total, kwargs, error=str(err))
+                    raise
+                delay = self._backoff_delay(attempt)
+            except requests.ReadTimeout as err:
+                self._record(url, None, attempt, started, backoff_total, kwargs, error=str(err))
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt > self.max_retries:
+                    self._record(url, response.status_code, attempt, started, backoff_total, kwargs, response=response)
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = self._backoff_delay(attempt) if retry_after is None else min(retry_after, self.backoff_max_seconds)
+                response.close()
+            backoff_total += delay
+            self.sleep(delay)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        ceiling = min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** (attempt - 1)))
+        return self.jitter(0.0, ceiling)
+
+    def _record(
+        self,
+        url: str,
+        status_code: int | None,
+        attempts: int,
+        started: float,
+        backoff_total: float,
+        kwargs: dict,
+        *,
+        response: requests.Response | None = None,
+        error: str | None = None,
+    ) -> None:
+        timing = RequestTiming(
+            url=url,
+            status_code=status_code,
+            attempts=attempts,
+            elapsed_seconds=self.clock() - started,
+            backoff_seconds=backoff_total,
+            request_bytes=_request_size(response, kwargs),
+            error=error,
+        )
+        with self._timings_lock:
+            self._timings.append(timing)
+
+    def timings(self) -> list[RequestTiming]:
+        with self._timings_lock:
+            return list(self._timings)
+
+    def last_timing(self) -> RequestTiming | None:
+        with self._timings_lock:
+            return self._timings[-1] if self._timings else None
+
+    def close(self) -> None:
+        self.session.close()
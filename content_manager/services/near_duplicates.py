@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from content_manager.services.article_corpus import ArticleRecord, shared_corpus_index
+
+NUM_PERMUTATIONS = 64
+# 16 bands of 4 rows put the LSH candidate threshold near Jaccard 0.5:
+# pairs at 0.5 collide in some band ~64% of the time, pairs at 0.8 ~100%.
+LSH_BANDS = 16
+BODY_SHINGLE_SIZE = 5
+CAPTION_SHINGLE_SIZE = 3
+NEAR_DUPLICATE_THRESHOLD = 0.5
+MAX_MATCHES = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+# Media markers and URLs are shared boilerplate, not prose.
+_MARKUP_PATTERN = re.compile(r"\[\[[^\]]*\]\]|!?\[[^\]]*\]\([^)]*\)|https?://\S+")
+
+
+def text_shingles(text: str, size: int) -> set[int]:
+    """64-bit hashes of the ``size``-word shingles of ``text``; short texts form one shingle."""
+    words = _WORD_PATTERN.findall(_MARKUP_PATTERN.sub(" ", text or "").lower())
+    if not words:
+        return set()
+    spans = [words[index:index + size] for index in range(max(len(words) - size + 1, 1))]
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(span).encode("utf-8"), digest_size=8).digest(), "big")
+        for span in spans
+    }
+
+
+class MinHasher:
+    """Universal hashes ``(a * x + b) mod p``, one per signature slot."""
+
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_permutations)
+        ]
+
+    def signature(self, shingles: set[int]) -> tuple[int, ...] | None:
+        if not shingles:
+            return None
+        values = list(shingles)
+        return tuple(min((a * value + b) % _MERSENNE_PRIME for value in values) for a, b in self.permutations)
+
+
+def estimated_similarity(first: tuple[int, ...], second: tuple[int, ...]) -> float:
+    return sum(1 for left, right in zip(first, second) if left == right) / len(first)
+
+
+class MinHashLSH:
+    """Banded LSH buckets: a lookup touches one bucket per band instead of every signature."""
+
+    def __init__(self, bands: int = LSH_BANDS) -> None:
+        self.bands = bands
+        self.signatures: dict[str, tuple[int, ...]] = {}
+        self._buckets: list[dict[tuple[int, ...], set[str]]] = [{} for _ in range(bands)]
+
+    def _band_keys(self, signature: tuple[int, ...]) -> list[tuple[int, ...]]:
+        rows = len(signature) // self.bands
+        return [signature[band * rows:(band + 1) * rows] for band in range(self.bands)]
+
+    def add(self, key: str, signature: tuple[int, ...]) -> None:
+        self.remove(key)
+        self.signatures[key] = signature
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            members = buckets.get(band_key)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del buckets[band_key]
+
+    def query(self, signature: tuple[int, ...], threshold: float) -> list[tuple[str, float]]:
+        candidates: set[str] = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(band_key, ()))
+        scored = [(key, estimated_similarity(signature, self.signatures[key])) for key in candidates]
+        return sorted(
+            ((key, similarity) for key, similarity in scored if similarity >= threshold),
+            key=lambda item: (-item[1], item[0]),
+        )
+
+
+@dataclass(frozen=True)
+class NearDuplicateMatch:
+    path: str
+    field: str
+    similarity: float
+
+    def to_dict(self) -> dict:
+        return {"path": self.path, "field": self.field, "similarity": round(self.similarity, 2)}
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH signatures of article bodies and summaries (captions).
+
+    ``sync`` diffs corpus snapshots, so only new or edited articles are hashed.
+    """
+
+    def __init__(self, hasher: MinHasher | None = None) -> None:
+        self.hasher = hasher or MinHasher()
+        self.bodies = MinHashLSH()
+        self.captions = MinHashLSH()
+        self._records: dict[str, ArticleRecord] = {}
+
+    def sync(self, records: list[ArticleRecord]) -> None:
+        current = {record.path: record for record in records if record.title}
+        for path in [path for path, record in self._records.items() if current.get(path) is not record]:
+            del self._records[path]
+            self.bodies.remove(path)
+            self.captions.remove(path)
+        for path, record in current.items():
+            if path in self._records:
+                continue
+            self._records[path] = record
+            body_signature = self.hasher.signature(text_shingles(record.load_body(), BODY_SHINGLE_SIZE))
+            if body_signature is not None:
+                self.bodies.add(path, body_signature)
+            caption_signature = self.hasher.signature(text_shingles(record.summary, CAPTION_SHINGLE_SIZE))
+            if caption_signature is not None:
+                self.captions.add(path, caption_signature)
+
+    def find(
+        self,
+        *,
+        content: str = "",
+        summary: str = "",
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+        limit: int = MAX_MATCHES,
+    ) -> list[NearDuplicateMatch]:
+        matches: list[NearDuplicateMatch] = []
+        for field, lsh, text, size in (
+            ("content", self.bodies, content, BODY_SHINGLE_SIZE),
+            ("summary", self.captions, summary, CAPTION_SHINGLE_SIZE),
+        ):
+            signature = self.hasher.signature(text_shingles(text, size))
+            if signature is None:
+                continue
+            matches.extend(
+                NearDuplicateMatch(path=path, field=field, similarity=similarity)
+                for path, similarity in lsh.query(signature, threshold)[:limit]
+            )
+        return matches
+
+
+_indexes: dict[Path, tuple[int, NearDuplicateIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def near_duplicate_index(articles_dir: Path) -> NearDuplicateIndex:
+    """Return the shared index for ``articles_dir``, synced to the current corpus version."""
+    version, records = shared_corpus_index(articles_dir).snapshot()
+    key = Path(articles_dir).resolve()
+    with _indexes_lock:
+        synced_version, index = _indexes.get(key, (None, None))
+        if index is None:
+            index = NearDuplicateIndex()
+        if synced_version != version:
+            index.sync(records)
+            _indexes[key] = (version, index)
+        return index
+
+
+def near_duplicate_warnings(matches: list[NearDuplicateMatch]) -> list[str]:
+    labels = {"content": "Draft text", "summary": "Summary"}
+    return [
+        f"{labels[match.field]} closely matches existing article {match.path} (~{round(match.similarity * 100)}% overlap)."
+        for match in matches
+    ]
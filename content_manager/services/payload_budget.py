@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import math
+import tempfile
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from PIL import Image
+
+from content_manager.services.article_generation import GenerationRequest, build_input_parts, lazy_data_url_for_path
+
+# Model name, system message and JSON framing around the user content parts.
+ENVELOPE_BYTES = 512
+CHARS_PER_TOKEN = 4
+# Token cost of an image whose dimensions cannot be read (a 2x2-tile high-detail image).
+DEFAULT_IMAGE_TOKENS = 765
+DOWNSCALE_STEPS = (1536, 1024, 768, 512)
+EXCERPT_TRIM_LENGTH = 120
+DOWNSCALED_JPEG_QUALITY = 85
+
+
+@dataclass(frozen=True)
+class PartEstimate:
+    kind: str
+    label: str
+    bytes: int
+    tokens: int
+
+
+@dataclass(frozen=True)
+class PayloadEstimate:
+    parts: list[PartEstimate]
+    total_bytes: int
+    total_tokens: int
+
+    def to_dict(self) -> dict:
+        return {
+            "total_bytes": self.total_bytes,
+            "total_tokens": self.total_tokens,
+            "image_count": sum(1 for part in self.parts if part.kind == "image"),
+        }
+
+
+@dataclass(frozen=True)
+class PayloadBudget:
+    """Upper bounds for one generation request; a limit of 0 disables that check."""
+
+    max_bytes: int
+    max_tokens: int
+
+    def exceeded(self, estimate: PayloadEstimate) -> bool:
+        return (
+            (self.max_bytes > 0 and estimate.total_bytes > self.max_bytes)
+            or (self.max_tokens > 0 and estimate.total_tokens > self.max_tokens)
+        )
+
+
+def image_dimensions(path: Path) -> tuple[int, int] | None:
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+    return (width, height) if width > 0 and height > 0 else None
+
+
+def image_tokens(width: int, height: int) -> int:
+    """High-detail vision cost: fit within 2048px, shortest side to 768px, 170 tokens per 512px tile."""
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+def estimate_part(part: dict) -> PartEstimate:
+    if part["type"] == "input_image":
+        path = Path(part["path"])
+        try:
+            encoded_bytes = lazy_data_url_for_path(path).encoded_length()
+        except OSError:
+            encoded_bytes = 0
+        dimensions = image_dimensions(path)
+        tokens = image_tokens(*dimensions) if dimensions else DEFAULT_IMAGE_TOKENS
+        return PartEstimate(kind="image", label=path.name, bytes=encoded_bytes + 48, tokens=tokens)
+    text = part["text"]
+    return PartEstimate(
+        kind="text",
+        label=text.split("\n", 1)[0][:60],
+        bytes=len(json.dumps(part)),
+        tokens=math.ceil(len(text) / CHARS_PER_TOKEN),
+    )
+
+
+def estimate_request(request: GenerationRequest) -> PayloadEstimate:
+    parts = [estimate_part(part) for part in build_input_parts(request)]
+    return PayloadEstimate(
+        parts=parts,
+        total_bytes=ENVELOPE_BYTES + sum(part.bytes for part in parts),
+        total_tokens=math.ceil(ENVELOPE_BYTES / CHARS_PER_TOKEN) + sum(part.tokens for part in parts),
+    )
+
+
+def _evenly_spaced(paths: list[Path], count: int) -> list[Path]:
+    if count >= len(paths):
+        return list(paths)
+    if count <= 1:
+        return [paths[len(paths) // 2]]
+    return [paths[round(index * (len(paths) - 1) / (count - 1))] for index in range(count)]
+
+
+def _downscale(path: Path, max_side: int, output_path: Path) -> Path | None:
+    try:
+        with Image.open(path) as image:
+            if max(image.size) <= max_side:
+                return None
+            resized = image.convert("RGB")
+            resized.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            resized.save(output_path, "JPEG", quality=DOWNSCALED_JPEG_QUALITY)
+            return output_path
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+
+def fit_request_to_budget(
+    request: GenerationRequest,
+    budget: PayloadBudget,
+) -> tuple[GenerationRequest, list[str], tempfile.TemporaryDirectory[str] | None]:
+    """Trim ``request`` until its estimated size fits ``budget``.
+
+    Trims in priority order: sampled video frames (down to one per video), image
+    resolution, then related-post excerpts and finally whole related posts. Returns
+    the trimmed request, user-facing warnings describing each trim, and the
+    temporary directory holding downscaled copies (caller cleans it up).
+    """
+    estimate = estimate_request(request)
+    if not budget.exceeded(estimate):
+        return request, [], None
+
+    warnings: list[str] = []
+    media_context = [dict(item) for item in request.media_context]
+    original_frames = {
+        index: len(item.get("model_input_paths") or [])
+        for index, item in enumerate(media_context)
+        if item["media_type"] == "video"
+    }
+
+    related_articles = [dict(article) for article in request.related_articles or []]
+
+    def current() -> GenerationRequest:
+        return replace(request, media_context=media_context, related_articles=related_articles)
+
+    # 1. Fewer sampled frames, taking one at a time from the video with the most.
+    while budget.exceeded(estimate):
+        candidates = [
+            index for index in original_frames
+            if len(media_context[index].get("model_input_paths") or []) > 1
+        ]
+        if not candidates:
+            break
+        index = max(candidates, key=lambda item: len(media_context[item]["model_input_paths"]))
+        # Always pick from the original sampling so the kept frames stay evenly spaced.
+        media_context[index]["model_input_paths"] = _evenly_spaced(
+            list(request.media_context[index]["model_input_paths"]),
+            len(media_context[index]["model_input_paths"]) - 1,
+        )
+        estimate = estimate_request(current())
+    reduced = [
+        f"{media_context[index]['name']}: {count} → {len(media_context[index]['model_input_paths'])}"
+        for index, count in original_frames.items()
+        if len(media_context[index].get("model_input_paths") or []) < count
+    ]
+    if reduced:
+        warnings.append(f"Reduced sampled video frames to fit the request budget ({', '.join(reduced)}).")
+
+    # 2. Lower image resolution, one step at a time across every image. Each step
+    # resizes from the full-size source so quality loss does not compound.
+    temp_dir: tempfile.TemporaryDirectory[str] | None = None
+    source_paths = [list(item.get("model_input_paths") or []) for item in media_context]
+    downscaled_to = None
+    for max_side in DOWNSCALE_STEPS:
+        if not budget.exceeded(estimate) or not any(source_paths):
+            break
+        if temp_dir is None:
+            temp_dir = tempfile.TemporaryDirectory(prefix="generation-budget-")
+        changed = False
+        for item_index, item in enumerate(media_context):
+            paths = []
+            for path_index, path in enumerate(source_paths[item_index]):
+                output_path = Path(temp_dir.name) / f"{item_index:02d}-{path_index:02d}-{max_side}px.jpg"
+                smaller = _downscale(Path(path), max_side, output_path)
+                changed = changed or smaller is not None
+                paths.append(smaller or path)
+            item["model_input_paths"] = paths
+        if changed:
+            downscaled_to = max_side
+            estimate = estimate_request(current())
+    if downscaled_to is not None:
+        warnings.append(f"Downscaled images to {downscaled_to}px on the long side to fit the request budget.")
+
+    # 3. Shorter related-post excerpts, then fewer related posts.
+    if budget.exceeded(estimate) and related_articles:
+        shortened = 0
+        for article in related_articles:
+            excerpt = article.get("excerpt") or ""
+            if len(excerpt) > EXCERPT_TRIM_LENGTH:
+                article["excerpt"] = excerpt[:EXCERPT_TRIM_LENGTH].rstrip() + "..."
+                shortened += 1
+        if shortened:
+            estimate = estimate_request(current())
+            warnings.append("Shortened related-post excerpts to fit the request budget.")
+        dropped = 0
+        while budget.exceeded(estimate) and related_articles:
+            related_articles.pop()
+            dropped += 1
+            estimate = estimate_request(current())
+        if dropped:
+            warnings.append(f"Dropped {dropped} related post(s) to fit the request budget.")
+
+    if budget.exceeded(estimate):
+        warnings.append(
+            "Generation request still exceeds the payload budget after trimming "
+            f"(~{estimate.total_bytes / (1024 * 1024):.1f} MB, ~{estimate.total_tokens} tokens)."
+        )
+    return current(), warnings, temp_dir
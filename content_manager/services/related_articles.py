@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+
+from content_manager.services.article_corpus import ArticleRecord, shared_corpus_index
+
+CATEGORY_BOOST = 100
+TAG_BOOST = 12
+LOCATION_BOOST = 8
+# BM25 relevance is squashed into [0, LEXICAL_WEIGHT). Boost totals are multiples
+# of the boosts' gcd (4), so wording similarity only reorders articles that tie on
+# category, tag and location boosts.
+LEXICAL_WEIGHT = float(math.gcd(CATEGORY_BOOST, TAG_BOOST, LOCATION_BOOST))
+LEXICAL_HALF_SATURATION = 5.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Query terms found in more than this share of articles are treated as corpus stop
+# words: they barely move BM25 but their postings dominate query cost.
+MAX_DOCUMENT_FREQUENCY_RATIO = 0.5
+
+KEYWORD_PATTERN = re.compile(r"[a-z0-9]{3,}")
+STOP_WORDS = {
+    "this", "that", "with", "from", "have", "they", "them", "were", "what", "when", "just",
+    "like", "into", "about", "there", "their", "really", "would", "could", "should", "because",
+    "still", "today", "also", "then", "than", "after", "before", "around", "over", "under",
+    "very", "more", "some", "much", "many", "only", "your", "mine", "ours", "been", "being",
+    "make", "made", "gets", "getting", "post", "article", "draft", "content", "video", "image",
+}
+
+
+def keyword_terms(*values: str) -> list[str]:
+    terms: list[str] = []
+    for value in values:
+        for match in KEYWORD_PATTERN.findall((value or "").lower()):
+            if match not in STOP_WORDS:
+                terms.append(match)
+    return terms
+
+
+class RelatedArticleIndex:
+    """Inverted index over title, summary, body and tags of titled articles.
+
+    Term statistics are computed once per corpus version; a query touches only the
+    postings of its own terms, tags, category and locations, then ranks the top-k
+    candidates with a heap.
+    """
+
+    def __init__(self, records: list[ArticleRecord]) -> None:
+        self.records = [record for record in records if record.title]
+        self.by_category: dict[str, list[int]] = {}
+        self.by_tag: dict[str, list[int]] = {}
+        term_counts: list[Counter[str]] = []
+        for doc_id, record in enumerate(self.records):
+            term_counts.append(Counter(keyword_terms(record.title, record.summary, record.load_body(), " ".join(record.tags))))
+            if record.category:
+                self.by_category.setdefault(record.category.lower(), []).append(doc_id)
+            for tag_key in {tag.lower() for tag in record.tags}:
+                self.by_tag.setdefault(tag_key, []).append(doc_id)
+        doc_lengths = [sum(counts.values()) for counts in term_counts]
+        average_length = (sum(doc_lengths) / len(doc_lengths)) if doc_lengths else 1.0
+
+        # Postings carry the BM25 term-frequency component, so a query only multiplies by idf.
+        self.postings: dict[str, list[tuple[int, float]]] = {}
+        for doc_id, counts in enumerate(term_counts):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[doc_id] / (average_length or 1.0))
+            for term, frequency in counts.items():
+                weight = frequency * (BM25_K1 + 1) / (frequency + norm)
+                self.postings.setdefault(term, []).append((doc_id, weight))
+        self.recency = [
+            record.date.timestamp() if record.date is not None else float("-inf")
+            for record in self.records
+        ]
+        self.recency_order = sorted(
+            range(len(self.records)),
+            key=lambda doc_id: (-self.recency[doc_id], self.records[doc_id].path),
+        )
+
+    def _idf(self, term: str) -> float:
+        document_frequency = len(self.postings.get(term, ()))
+        total = len(self.records)
+        return math.log(1 + (total - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def bm25_scores(self, terms: set[str]) -> dict[int, float]:
+        scores: dict[int, float] = {}
+        max_postings = max(len(self.records) * MAX_DOCUMENT_FREQUENCY_RATIO, 1)
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings or len(postings) > max_postings:
+                continue
+            idf = self._idf(term)
+            get = scores.get
+            for doc_id, weight in postings:
+                scores[doc_id] = get(doc_id, 0.0) + idf * weight
+        return scores
+
+    def _location_matches(self, location: str) -> list[int]:
+        # Postings narrow the candidates; the phrase itself is still confirmed in the text.
+        terms = set(keyword_terms(location))
+        if terms:
+            candidate_sets = [{doc_id for doc_id, _ in self.postings.get(term, ())} for term in terms]
+            candidates = sorted(set.intersection(*candidate_sets))
+        else:
+            candidates = range(len(self.records))
+        # Whole words only: "paris" must not match inside "comparison".
+        pattern = re.compile(
+            r"(?<![a-z0-9])" + r"\s+".join(re.escape(word) for word in location.split()) + r"(?![a-z0-9])"
+        )
+        matches = []
+        for doc_id in candidates:
+            record = self.records[doc_id]
+            if pattern.search(f"{record.title} {record.summary} {record.load_body()}".lower()):
+                matches.append(doc_id)
+        return matches
+
+    def search(
+        self,
+        *,
+        draft_category: str = "",
+        draft_tags: list[str] | None = None,
+        likely_named_locations: list[str] | None = None,
+        draft_title: str = "",
+        draft_summary: str = "",
+        draft_content: str = "",
+        limit: int,
+    ) -> list[ArticleRecord]:
+        draft_tags = draft_tags or []
+        scores: dict[int, float] = {}
+
+        category_docs: set[int] = set()
+        if draft_category:
+            category_docs = set(self.by_category.get(draft_category.lower(), ()))
+            for doc_id in category_docs:
+                scores[doc_id] = scores.get(doc_id, 0.0) + CATEGORY_BOOST
+
+        for tag_key in {tag.strip().lower() for tag in draft_tags if tag.strip()}:
+            for doc_id in self.by_tag.get(tag_key, ()):
+                scores[doc_id] = scores.get(doc_id, 0.0) + TAG_BOOST
+
+        for location in likely_named_locations or []:
+            location = (location or "").strip().lower()
+            if not location:
+                continue
+            for doc_id in self._location_matches(location):
+                scores[doc_id] = scores.get(doc_id, 0.0) + LOCATION_BOOST
+
+        query_terms = set(keyword_terms(draft_title, draft_summary, draft_content, " ".join(draft_tags)))
+        for doc_id, relevance in self.bm25_scores(query_terms).items():
+            lexical = LEXICAL_WEIGHT * relevance / (relevance + LEXICAL_HALF_SATURATION)
+            scores[doc_id] = scores.get(doc_id, 0.0) + lexical
+
+        def rank(doc_id: int) -> tuple[float, int, float, str]:
+            return (
+                -scores.get(doc_id, 0.0),
+                -int(doc_id in category_docs),
+                -self.recency[doc_id],
+                self.records[doc_id].path,
+            )
+
+        ranked: list[int] = []
+        if scores and limit > 0:
+            # Cut to articles scoring at least the k-th best before the tuple-keyed tie-break.
+            threshold = heapq.nlargest(limit, scores.values())[-1]
+            ranked = heapq.nsmallest(limit, [doc_id for doc_id, value in scores.items() if value >= threshold], key=rank)
+        # Too few matches: pad with the most recent unscored articles, as the full sort did.
+        for doc_id in self.recency_order:
+            if len(ranked) >= limit:
+                break
+            if doc_id not in scores:
+                ranked.append(doc_id)
+        return [self.records[doc_id] for doc_id in ranked]
+
+
+_indexes: dict[Path, tuple[int, RelatedArticleIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def related_article_index(articles_dir: Path) -> RelatedArticleIndex:
+    """Return the index for ``articles_dir``, rebuilt only when the corpus changes."""
+    version, records = shared_corpus_index(articles_dir).snapshot()
+    key = Path(articles_dir).resolve()
+    with _indexes_lock:
+        cached = _indexes.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        index = RelatedArticleIndex(records)
+        _indexes[key] = (version, index)
+        return index
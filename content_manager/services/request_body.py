@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import base64
+import json
+import mmap
+import uuid
+from pathlib import Path
+from typing import Iterator
+
+# Raw bytes per base64 step; a multiple of 3 so chunks never need padding mid-stream.
+RAW_CHUNK_BYTES = 3 * 64 * 1024
+
+
+class FileDataURL:
+    """A ``data:`` URL whose base64 body is produced from the file only while sending."""
+
+    def __init__(self, path: Path, mime_type: str) -> None:
+        self.path = Path(path)
+        self.mime_type = mime_type
+        self.prefix = f"data:{mime_type};base64,".encode("ascii")
+
+    def encoded_length(self) -> int:
+        size = self.path.stat().st_size
+        return len(self.prefix) + 4 * ((size + 2) // 3)
+
+    def iter_encoded(self, raw_chunk_bytes: int = RAW_CHUNK_BYTES) -> Iterator[bytes]:
+        yield self.prefix
+        with self.path.open("rb") as handle:
+            size = self.path.stat().st_size
+            if size == 0:
+                return
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, raw_chunk_bytes):
+                        yield base64.b64encode(view[offset:offset + raw_chunk_bytes])
+                finally:
+                    view.release()
+
+
+class StreamingJSONBody:
+    """JSON request body that inlines ``FileDataURL`` values lazily.
+
+    The small structural part of the payload is serialized once up front; each file
+    is base64-encoded chunk by chunk from a memory map as ``requests`` iterates the
+    body. ``__len__`` reports the exact encoded size so the request is sent with a
+    ``Content-Length`` header rather than chunked transfer encoding, and iterating
+    again replays the body, so transport retries still work.
+    """
+
+    def __init__(self, payload: dict, *, raw_chunk_bytes: int = RAW_CHUNK_BYTES) -> None:
+        self.raw_chunk_bytes = raw_chunk_bytes
+        files: dict[str, FileDataURL] = {}
+        marker = uuid.uuid4().hex
+
+        def substitute(value):
+            if isinstance(value, FileDataURL):
+                token = f"@@{marker}:{len(files)}@@"
+                files[token] = value
+                return token
+            if isinstance(value, dict):
+                return {key: substitute(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [substitute(item) for item in value]
+            return value
+
+        encoded = json.dumps(substitute(payload)).encode("utf-8")
+        self._segments: list[bytes | FileDataURL] = []
+        cursor = 0
+        for token, file_url in files.items():
+            quoted = json.dumps(token).encode("utf-8")
+            index = encoded.index(quoted, cursor)
+            self._segments.append(encoded[cursor:index + 1])
+            self._segments.append(file_url)
+            cursor = index + len(quoted) - 1
+        self._segments.append(encoded[cursor:])
+        self._length = sum(
+            len(segment) if isinstance(segment, bytes) else segment.encoded_length()
+            for segment in self._segments
+        )
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        for segment in self._segments:
+            if isinstance(segment, bytes):
+                if segment:
+                    yield segment
+            else:
+                yield from segment.iter_encoded(self.raw_chunk_bytes)
+
+    def to_bytes(self) -> bytes:
+        return b"".join(self)
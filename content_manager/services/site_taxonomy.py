@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+import json
+import os
+import threading
+import time
 from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Iterable
+
+from content_manager.services.article_corpus import ArticleCorpusIndex, ArticleRecord, shared_corpus_index
+
+TAXONOMY_SNAPSHOT_FILENAME = "site-taxonomy.json"
+TAXONOMY_SNAPSHOT_FORMAT = 1
+DEFAULT_REFRESH_INTERVAL_SECONDS = 2.0
 
 
 @dataclass(frozen=True)
@@ -12,54 +23,255 @@ class SiteTaxonomy:
     tags_by_category: dict[str, list[str]]
 
 
-def load_site_taxonomy(articles_dir: Path) -> SiteTaxonomy:
-    category_counts: Counter[str] = Counter()
-    tag_counts: Counter[str] = Counter()
-    category_display: dict[str, str] = {}
-    tag_display: dict[str, str] = {}
-    category_tag_counts: dict[str, Counter[str]] = {}
+@dataclass(frozen=True)
+class TaxonomyContribution:
+    """Category and tags one article adds to the site taxonomy."""
+
+    mtime_ns: int
+    size: int
+    category: str
+    tags: tuple[str, ...]
+
+    def to_dict(self) -> dict:
+        return {"mtime_ns": self.mtime_ns, "size": self.size, "category": self.category, "tags": list(self.tags)}
+
+
+class _TaxonomyCounts:
+    """Category and tag counters that support removing an article as well as adding one.
+
+    Spellings are counted per normalized key so the display form survives deletes:
+    a capitalized spelling wins over an all-lowercase one, then the most used one.
+    Ties in frequency order are broken by the normalized key.
+    """
+
+    def __init__(self) -> None:
+        self.categories: Counter[str] = Counter()
+        self.tags: Counter[str] = Counter()
+        self.category_spellings: dict[str, Counter[str]] = {}
+        self.tag_spellings: dict[str, Counter[str]] = {}
+        self.category_tags: dict[str, Counter[str]] = {}
+
+    def apply(self, category: str, tags: Iterable[str], sign: int) -> None:
+        category_key = category.lower() if category else None
+        if category_key:
+            _bump(self.categories, category_key, sign)
+            _bump_nested(self.category_spellings, category_key, category, sign)
+            if sign > 0:
+                self.category_tags.setdefault(category_key, Counter())
+        for tag in tags:
+            tag_key = tag.lower()
+            _bump(self.tags, tag_key, sign)
+            _bump_nested(self.tag_spellings, tag_key, tag, sign)
+            if category_key:
+                _bump_nested(self.category_tags, category_key, tag_key, sign)
+        if category_key and category_key not in self.categories:
+            self.category_tags.pop(category_key, None)
+
+    def taxonomy(self) -> SiteTaxonomy:
+        category_display = {key: _display(spellings) for key, spellings in self.category_spellings.items()}
+        tag_display = {key: _display(spellings) for key, spellings in self.tag_spellings.items()}
+        tags_by_category = {}
+        for category_key in _ranked(self.categories):
+            counts = self.category_tags.get(category_key, Counter())
+            tags_by_category[category_display[category_key]] = [tag_display[key] for key in _ranked(counts)]
+        return SiteTaxonomy(
+            categories=[category_display[key] for key in _ranked(self.categories)],
+            tags=[tag_display[key] for key in _ranked(self.tags)],
+            tags_by_category=tags_by_category,
+        )
+
+
+def _bump(counter: Counter[str], key: str, sign: int) -> None:
+    counter[key] += sign
+    if counter[key] <= 0:
+        del counter[key]
+
+
+def _bump_nested(mapping: dict[str, Counter[str]], key: str, value: str, sign: int) -> None:
+    counter = mapping.setdefault(key, Counter())
+    _bump(counter, value, sign)
+    if not counter and sign < 0:
+        del mapping[key]
+
+
+def _ranked(counts: Counter[str]) -> list[str]:
+    return sorted(counts, key=lambda key: (-counts[key], key))
+
+
+def _display(spellings: Counter[str]) -> str:
+    return min(spellings, key=lambda value: (value.islower(), -spellings[value], value))
+
+
+def build_site_taxonomy(records: Iterable[ArticleRecord]) -> SiteTaxonomy:
+    counts = _TaxonomyCounts()
+    for record in records:
+        counts.apply(record.category, record.tags, 1)
+    return counts.taxonomy()
+
+
+class SiteTaxonomyIndex:
+    """Site taxonomy kept up to date from per-article contributions.
 
-    for article_path in articles_dir.rglob("*.md"):
+    Each article's category and tags are stored with its (mtime_ns, size) in a JSON
+    snapshot. A stat-only walk diffs the content tree against the snapshot, and only
+    articles whose signature changed are fetched from the shared corpus index,
+    which parses just those files; a cold start with a current snapshot parses
+    nothing. Adds, edits and deletes are applied to the counters as deltas. The
+    walk runs at most once per ``refresh_interval`` seconds, and ``notify_changed``
+    applies a writer's own edit right away.
+    """
+
+    def __init__(
+        self,
+        corpus: ArticleCorpusIndex,
+        *,
+        snapshot_path: Path | None = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.corpus = corpus
+        self.articles_dir = corpus.articles_dir
+        self.snapshot_path = snapshot_path
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._contributions: dict[str, TaxonomyContribution] = {}
+        self._counts = _TaxonomyCounts()
+        self._taxonomy: SiteTaxonomy | None = None
+        self._loaded = False
+        self._checked_at: float | None = None
+
+    def taxonomy(self) -> SiteTaxonomy:
+        with self._lock:
+            if not self._loaded:
+                self._load_snapshot()
+            if self._checked_at is None or self.clock() - self._checked_at >= self.refresh_interval:
+                self.refresh()
+            if self._taxonomy is None:
+                self._taxonomy = self._counts.taxonomy()
+            return self._taxonomy
+
+    def refresh(self) -> bool:
+        """Stat every article and apply deltas for new, modified or deleted files."""
+        with self._lock:
+            if not self._loaded:
+                self._load_snapshot()
+            seen: dict[str, tuple[Path, int, int]] = {}
+            for article_path in self.articles_dir.rglob("*.md"):
+                try:
+                    stat = article_path.stat()
+                except OSError:
+                    continue
+                seen[self._key(article_path)] = (article_path, stat.st_mtime_ns, stat.st_size)
+
+            stale = [key for key in self._contributions if key not in seen]
+            for key in stale:
+                self._replace(key, None)
+            modified = []
+            for key, (article_path, mtime_ns, size) in seen.items():
+                current = self._contributions.get(key)
+                if current is None or (current.mtime_ns, current.size) != (mtime_ns, size):
+                    modified.append(article_path)
+            self._apply_records(self.corpus.records_for(modified))
+
+            self._checked_at = self.clock()
+            changed = bool(stale or modified)
+            if changed:
+                self._save_snapshot()
+            return changed
+
+    def notify_changed(self, article_path: Path) -> None:
+        """Apply one article's delta immediately, e.g. after publishing it."""
+        with self._lock:
+            if not self._loaded:
+                self._load_snapshot()
+            self._apply_records(self.corpus.records_for([article_path]))
+            self._save_snapshot()
+
+    def _apply_records(self, records: dict[Path, ArticleRecord | None]) -> None:
+        for article_path, record in records.items():
+            contribution = None
+            if record is not None:
+                contribution = TaxonomyContribution(
+                    mtime_ns=record.mtime_ns,
+                    size=record.size,
+                    category=record.category,
+                    tags=tuple(record.tags),
+                )
+            self._replace(self._key(article_path), contribution)
+
+    def _key(self, article_path: Path) -> str:
+        return article_path.relative_to(self.articles_dir).as_posix()
+
+    def _replace(self, key: str, contribution: TaxonomyContribution | None) -> None:
+        previous = self._contributions.pop(key, None)
+        if previous is not None:
+            self._counts.apply(previous.category, previous.tags, -1)
+        if contribution is not None:
+            self._contributions[key] = contribution
+            self._counts.apply(contribution.category, contribution.tags, 1)
+        self._taxonomy = None
+
+    def _load_snapshot(self) -> None:
+        self._loaded = True
+        if self.snapshot_path is None:
+            return
         try:
-            raw = article_path.read_text(encoding="utf-8", errors="ignore")
-        except OSError:
-            continue
-        current_category = None
-        for line in raw.splitlines():
-            if not line.strip():
-                break
-            if ":" not in line:
+            payload = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(payload, dict) or payload.get("format") != TAXONOMY_SNAPSHOT_FORMAT:
+            return
+        if payload.get("articles_dir") != str(self.articles_dir.resolve()):
+            return
+        for key, item in (payload.get("articles") or {}).items():
+            try:
+                contribution = TaxonomyContribution(
+                    mtime_ns=int(item["mtime_ns"]),
+                    size=int(item["size"]),
+                    category=str(item.get("category") or ""),
+                    tags=tuple(str(tag) for tag in item.get("tags") or []),
+                )
+            except (KeyError, TypeError, ValueError):
                 continue
-            key, value = line.split(":", 1)
-            key = key.strip().lower()
-            value = value.strip()
-            if key == "category" and value:
-                normalized = value.lower()
-                category_counts[normalized] += 1
-                previous = category_display.get(normalized)
-                if previous is None or (previous.islower() and not value.islower()):
-                    category_display[normalized] = value
-                category_tag_counts.setdefault(normalized, Counter())
-                current_category = normalized
-            elif key == "tags" and value:
-                for tag in [item.strip() for item in value.split(",") if item.strip()]:
-                    normalized_tag = tag.lower()
-                    tag_counts[normalized_tag] += 1
-                    previous = tag_display.get(normalized_tag)
-                    if previous is None or (previous.islower() and not tag.islower()):
-                        tag_display[normalized_tag] = tag
-                    if current_category:
-                        category_tag_counts.setdefault(current_category, Counter())[normalized_tag] += 1
-
-    categories = [category_display[key] for key, _ in category_counts.most_common()]
-    tags = [tag_display[key] for key, _ in tag_counts.most_common()]
-    tags_by_category = {}
-    for category_key, counts in category_tag_counts.items():
-        display_name = category_display.get(category_key)
-        if not display_name:
-            continue
-        tags_by_category[display_name] = [tag_display[key] for key, _ in counts.most_common() if key in tag_display]
-    return SiteTaxonomy(categories=categories, tags=tags, tags_by_category=tags_by_category)
+            self._replace(key, contribution)
+
+    def _save_snapshot(self) -> None:
+        if self.snapshot_path is None:
+            return
+        payload = {
+            "format": TAXONOMY_SNAPSHOT_FORMAT,
+            "articles_dir": str(self.articles_dir.resolve()),
+            "articles": {key: item.to_dict() for key, item in sorted(self._contributions.items())},
+        }
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.snapshot_path.with_name(f"{self.snapshot_path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(temp_path, self.snapshot_path)
+        except OSError:
+            # The snapshot is only a startup shortcut; the in-memory counters stay correct.
+            return
+
+
+_shared_indexes: dict[tuple[Path, Path | None], SiteTaxonomyIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_taxonomy_index(articles_dir: Path, *, cache_dir: Path | None = None) -> SiteTaxonomyIndex:
+    """Return the process-wide taxonomy index; with ``cache_dir`` its snapshot is persisted there."""
+    snapshot_path = Path(cache_dir) / TAXONOMY_SNAPSHOT_FILENAME if cache_dir is not None else None
+    key = (Path(articles_dir).resolve(), snapshot_path.resolve() if snapshot_path else None)
+    with _shared_lock:
+        index = _shared_indexes.get(key)
+        if index is None:
+            index = SiteTaxonomyIndex(shared_corpus_index(articles_dir), snapshot_path=snapshot_path)
+            _shared_indexes[key] = index
+        return index
+
+
+def load_site_taxonomy(articles_dir: Path, *, cache_dir: Path | None = None) -> SiteTaxonomy:
+    return shared_taxonomy_index(articles_dir, cache_dir=cache_dir).taxonomy()
 
 
 def normalize_category(candidate: str | None, taxonomy: SiteTaxonomy) -> str | None:
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from content_manager.services.article_corpus import ArticleCorpusIndex, ArticleRecord
+
+SUGGESTION_LIMIT = 6
+
+
+class TagSuggestionIndex:
+    """Materialized ``recent`` / ``common`` tag lists for the authoring page.
+
+    Per-tag article memberships and a recency-ordered article list are updated by
+    diffing corpus snapshots, so only added, edited or deleted articles are touched.
+    The JSON payload and its ETag are rebuilt only when the corpus version changes.
+    """
+
+    def __init__(self, corpus: ArticleCorpusIndex, *, limit: int = SUGGESTION_LIMIT) -> None:
+        self.corpus = corpus
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._records: dict[Path, ArticleRecord] = {}
+        # (-date ordinal, path) keeps the newest articles first with a stable tie-break.
+        self._by_recency: list[tuple[int, str, Path]] = []
+        self._tag_articles: dict[str, dict[Path, tuple[int, str, str]]] = {}
+        self._payload: dict | None = None
+        self._etag = ""
+
+    def suggestions(self) -> tuple[dict, str]:
+        """Return ``(payload, etag)`` for the current corpus."""
+        version, records = self.corpus.snapshot()
+        with self._lock:
+            if version != self._version:
+                self._apply(records)
+                self._version = version
+                self._payload = None
+            if self._payload is None:
+                self._payload = self._build_payload()
+                digest = hashlib.sha256(json.dumps(self._payload, sort_keys=True).encode("utf-8")).hexdigest()
+                self._etag = f"tags-{digest[:16]}"
+            return self._payload, self._etag
+
+    def _apply(self, records: list[ArticleRecord]) -> None:
+        current = {record.source: record for record in records}
+        for source in [source for source, record in self._records.items() if current.get(source) is not record]:
+            self._remove(self._records.pop(source))
+        for source, record in current.items():
+            if source not in self._records:
+                self._records[source] = record
+                self._add(record)
+
+    @staticmethod
+    def _recency_key(record: ArticleRecord) -> tuple[int, str, Path]:
+        ordinal = record.date.toordinal() if record.date else 0
+        return (-ordinal, record.path, record.source)
+
+    def _add(self, record: ArticleRecord) -> None:
+        key = self._recency_key(record)
+        bisect.insort(self._by_recency, key)
+        for tag in record.tags:
+            self._tag_articles.setdefault(tag.lower(), {}).setdefault(record.source, (key[0], key[1], tag))
+
+    def _remove(self, record: ArticleRecord) -> None:
+        key = self._recency_key(record)
+        position = bisect.bisect_left(self._by_recency, key)
+        if position < len(self._by_recency) and self._by_recency[position] == key:
+            del self._by_recency[position]
+        for tag_key in {tag.lower() for tag in record.tags}:
+            articles = self._tag_articles.get(tag_key)
+            if articles is None:
+                continue
+            articles.pop(record.source, None)
+            if not articles:
+                del self._tag_articles[tag_key]
+
+    def _build_payload(self) -> dict:
+        recent: list[str] = []
+        recent_keys: set[str] = set()
+        for _, _, source in self._by_recency:
+            for tag in self._records[source].tags:
+                key = tag.lower()
+                if key in recent_keys:
+                    continue
+                recent_keys.add(key)
+                recent.append(tag)
+                if len(recent) >= self.limit:
+                    break
+            if len(recent) >= self.limit:
+                break
+
+        ranked = []
+        for key, articles in self._tag_articles.items():
+            # Spelling comes from the newest article using the tag.
+            newest = min(articles.values())
+            ranked.append((-len(articles), newest[0], key, newest[2]))
+        ranked.sort()
+        common = [display for _, _, key, display in ranked if key not in recent_keys][:self.limit]
+        return {"recent": recent, "common": common}
@@ -0,0 +1 @@
+from .build_profiler import register  # noqa: F401
@@ -0,0 +1,314 @@
+"""Pelican plugin that records where a build spends its time.
+
+With ``BUILD_PROFILE = True`` every build writes ``CACHE_PATH/build_profile.json``
+with wall times for:
+
+* each generator's ``generate_context`` and ``generate_output``;
+* each plugin signal handler (calls and total time, also summed per plugin);
+* each article and page: reading (including ``content_object_init`` handlers
+  such as marker expansion) and writing its HTML;
+* every other written file (index pages, archives, tags, feeds).
+
+The slowest entries are logged at INFO level. A one-line summary of each build
+is appended to ``CACHE_PATH/build_profile_history.jsonl``, so regressions can be
+followed across builds. With ``BUILD_PROFILE_CPROFILE = True`` the build also
+runs under cProfile and the stats are dumped to ``build_profile.prof``, for
+``python -m pstats`` or snakeviz.
+
+Configuration (optional in pelicanconf.py)::
+
+    BUILD_PROFILE = False            # record timings
+    BUILD_PROFILE_CPROFILE = False   # also dump cProfile stats
+    BUILD_PROFILE_TOP = 10           # entries per section in the log
+    BUILD_PROFILE_HISTORY = 200      # builds kept in the history file
+
+Either can be switched on for one build::
+
+    pelican -e BUILD_PROFILE=true BUILD_PROFILE_CPROFILE=true
+
+Handlers are timed by wrapping the receivers of every Pelican signal when the
+build starts, after all plugins have registered; the wrappers are removed when
+it ends. List ``build_profiler`` last in PLUGINS.
+"""
+from __future__ import annotations
+
+import cProfile
+from collections import defaultdict
+from datetime import datetime, timezone
+import json
+import logging
+import os
+from pathlib import Path
+import time
+from typing import Dict, List, Optional
+import weakref
+
+from blinker import Signal
+from pelican import Pelican, signals
+from pelican.writers import Writer
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FILENAME = 'build_profile.json'
+HISTORY_FILENAME = 'build_profile_history.jsonl'
+CPROFILE_FILENAME = 'build_profile.prof'
+PROFILE_FORMAT = 1
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def _handler_name(receiver) -> str:
+    module = getattr(receiver, '__module__', None) or '?'
+    return f"{module}.{getattr(receiver, '__qualname__', repr(receiver))}"
+
+
+def _plugin_name(receiver) -> str:
+    module = getattr(receiver, '__module__', None) or '?'
+    if module.startswith('pelican.plugins.'):  # namespace plugins
+        module = module[len('pelican.plugins.'):]
+    return module.split('.', 1)[0]
+
+
+class BuildProfile:
+    """Timings collected during one ``Pelican.run``."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.generators: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.handlers: Dict[tuple, List[float]] = defaultdict(lambda: [0, 0.0])  # (signal, handler) -> [calls, s]
+        self.plugins: Dict[str, float] = defaultdict(float)
+        self.reads: Dict[str, float] = {}
+        self.writes: Dict[str, float] = {}
+        self.content_writes: Dict[str, float] = {}  # source path -> write time of its HTML
+
+    def timed_receiver(self, signal_name: str, receiver):
+        key = (signal_name, _handler_name(receiver))
+        plugin = _plugin_name(receiver)
+
+        def _timed(sender, **kwargs):
+            started = time.perf_counter()
+            try:
+                return receiver(sender, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                entry = self.handlers[key]
+                entry[0] += 1
+                entry[1] += elapsed
+                self.plugins[plugin] += elapsed
+
+        _timed.__wrapped__ = receiver
+        return _timed
+
+    def timed_generator(self, generator) -> None:
+        name = type(generator).__name__
+        for method in ('generate_context', 'generate_output'):
+            original = getattr(generator, method, None)
+            if original is not None:
+                setattr(generator, method, self._timed_method(name, method, original))
+        readers = getattr(generator, 'readers', None)
+        if readers is not None and 'read_file' not in vars(readers):
+            readers.read_file = self._timed_read(readers.read_file)
+
+    def _timed_method(self, generator: str, method: str, original):
+        def _timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.generators[generator][method] = time.perf_counter() - started
+        return _timed
+
+    def _timed_read(self, original):
+        def _timed(base_path, path, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(base_path, path, *args, **kwargs)
+            finally:
+                source = os.path.join(base_path, path) if base_path else path
+                self.reads[os.path.abspath(source)] = time.perf_counter() - started
+        return _timed
+
+    def record_write(self, name: str, elapsed: float, kwargs: dict) -> None:
+        self.writes[name] = self.writes.get(name, 0.0) + elapsed
+        content = kwargs.get('article') or kwargs.get('page')
+        source = getattr(content, 'source_path', None)
+        if source:
+            key = os.path.abspath(source)
+            self.content_writes[key] = self.content_writes.get(key, 0.0) + elapsed
+
+    def report(self, content_root: str) -> dict:
+        total = time.perf_counter() - self.started
+
+        def _relative(path: str) -> str:
+            try:
+                return os.path.relpath(path, content_root)
+            except ValueError:  # another drive on Windows
+                return path
+
+        content = [
+            {
+                'source': _relative(path),
+                'read_ms': _ms(self.reads.get(path, 0.0)),
+                'write_ms': _ms(self.content_writes.get(path, 0.0)),
+                'total_ms': _ms(self.reads.get(path, 0.0) + self.content_writes.get(path, 0.0)),
+            }
+            for path in set(self.reads) | set(self.content_writes)
+        ]
+        return {
+            'format': PROFILE_FORMAT,
+            'finished': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'total_ms': _ms(total),
+            'generators': {
+                name: {method: _ms(seconds) for method, seconds in methods.items()}
+                for name, methods in self.generators.items()
+            },
+            'plugins': dict(sorted(
+                ((name, _ms(seconds)) for name, seconds in self.plugins.items()),
+                key=lambda item: -item[1],
+            )),
+            'handlers': sorted(
+                (
+                    {'signal': signal_name, 'handler': handler, 'calls': calls, 'total_ms': _ms(seconds)}
+                    for (signal_name, handler), (calls, seconds) in self.handlers.items()
+                ),
+                key=lambda entry: -entry['total_ms'],
+            ),
+            'content': sorted(content, key=lambda entry: -entry['total_ms']),
+            'writes': sorted(
+                ({'output': name, 'ms': _ms(seconds)} for name, seconds in self.writes.items()),
+                key=lambda entry: -entry['ms'],
+            ),
+        }
+
+
+_active: Optional[BuildProfile] = None
+
+
+def _pelican_signals() -> Dict[str, Signal]:
+    return {name: value for name, value in vars(signals).items() if isinstance(value, Signal)}
+
+
+def _wrap_receivers(profile: BuildProfile) -> List[tuple]:
+    """Swap every receiver for a timed wrapper; return what is needed to undo it."""
+    replaced = []
+    for signal_name, signal in _pelican_signals().items():
+        for receiver_id, receiver in list(signal.receivers.items()):
+            target = receiver() if isinstance(receiver, weakref.ref) else receiver
+            if target is None or getattr(target, '__module__', None) == __name__:
+                continue
+            # Replacing the entry in place keeps the receiver's id and sender bindings.
+            signal.receivers[receiver_id] = profile.timed_receiver(signal_name, target)
+            replaced.append((signal, receiver_id, receiver))
+    return replaced
+
+
+def _unwrap_receivers(replaced: List[tuple]) -> None:
+    for signal, receiver_id, receiver in replaced:
+        if receiver_id in signal.receivers:
+            signal.receivers[receiver_id] = receiver
+
+
+def _write_report(pelican, profile: BuildProfile, profiler: Optional[cProfile.Profile]) -> None:
+    settings = pelican.settings
+    cache_dir = Path(settings.get('CACHE_PATH') or 'cache')
+    report = profile.report(settings.get('PATH', 'content'))
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        path = cache_dir / PROFILE_FILENAME
+        temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        temp_path.write_text(json.dumps(report, indent=1), encoding='utf-8')
+        os.replace(temp_path, path)
+        _append_history(cache_dir / HISTORY_FILENAME, report, int(settings.get('BUILD_PROFILE_HISTORY', 200)))
+        if profiler is not None:
+            profiler.dump_stats(cache_dir / CPROFILE_FILENAME)
+    except OSError as err:
+        logger.warning('build_profiler: could not write the report to %s: %s', cache_dir, err)
+        return
+
+    top = int(settings.get('BUILD_PROFILE_TOP', 10))
+    logger.info('build_profiler: %.0f ms total, report in %s', report['total_ms'], cache_dir / PROFILE_FILENAME)
+    for name, methods in report['generators'].items():
+        logger.info(
+            'build_profiler: %s context %.1f ms, output %.1f ms',
+            name, methods.get('generate_context', 0.0), methods.get('generate_output', 0.0),
+        )
+    for name, ms in list(report['plugins'].items())[:top]:
+        logger.info('build_profiler: plugin %s %.1f ms', name, ms)
+    for entry in report['handlers'][:top]:
+        logger.info(
+            'build_profiler: %s on %s, %d calls, %.1f ms',
+            entry['handler'], entry['signal'], entry['calls'], entry['total_ms'],
+        )
+    for entry in report['content'][:top]:
+        logger.info(
+            'build_profiler: %s read %.1f ms, write %.1f ms',
+            entry['source'], entry['read_ms'], entry['write_ms'],
+        )
+
+
+def _append_history(path: Path, report: dict, keep: int) -> None:
+    line = json.dumps({
+        'finished': report['finished'],
+        'total_ms': report['total_ms'],
+        'generators': report['generators'],
+        'plugins': report['plugins'],
+    })
+    try:
+        lines = path.read_text(encoding='utf-8').splitlines()
+    except OSError:
+        lines = []
+    lines = (lines + [line])[-max(keep, 1):]
+    temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    temp_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    os.replace(temp_path, path)
+
+
+def _profiled_run(original_run):
+    def run(self):
+        global _active
+        if not self.settings.get('BUILD_PROFILE') or _active is not None:
+            return original_run(self)
+        profile = _active = BuildProfile()
+        profiler = cProfile.Profile() if self.settings.get('BUILD_PROFILE_CPROFILE') else None
+        replaced = _wrap_receivers(profile)
+        signals.generator_init.connect(profile.timed_generator, weak=False)
+        original_write_file, original_write_feed = Writer.write_file, Writer.write_feed
+
+        def write_file(writer, name, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original_write_file(writer, name, *args, **kwargs)
+            finally:
+                profile.record_write(name, time.perf_counter() - started, kwargs)
+
+        def write_feed(writer, elements, context, path=None, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original_write_feed(writer, elements, context, path, *args, **kwargs)
+            finally:
+                profile.record_write(path or 'feed', time.perf_counter() - started, kwargs)
+
+        Writer.write_file, Writer.write_feed = write_file, write_feed
+        try:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                return original_run(self)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        finally:
+            Writer.write_file, Writer.write_feed = original_write_file, original_write_feed
+            signals.generator_init.disconnect(profile.timed_generator)
+            _unwrap_receivers(replaced)
+            _active = None
+            _write_report(self, profile, profiler)
+    run.__wrapped__ = original_run
+    return run
+
+
+def register():  # Pelican entry point
+    if not hasattr(Pelican.run, '__wrapped__'):
+        Pelican.run = _profiled_run(Pelican.run)
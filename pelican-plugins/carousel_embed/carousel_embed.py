@@ -17,26 +17,52 @@ Two optional settings customise CSS classes::
     CAROUSEL_ITEM_CLASS = 'carousel-item'
     CAROUSEL_SCROLLER_CLASS = 'carousel-scroller'
 
+Cards carry a ``sizes`` attribute matching the card width in the theme CSS, so
+a ``srcset`` added by the ``responsive_images`` plugin picks a narrow variant::
+
+    CAROUSEL_IMAGE_SIZES = '(max-width: 400px) 240px, (max-width: 766px) 60vw, 460px'
+
 The plugin simply expands the marker into semantic HTML that can be styled by
-`themes/cute-theme/static/css/style.css`.
+`themes/cute-theme/static/css/style.css`. Markers are found by the
+``content_markers`` plugin (also required in PLUGINS), which calls the
+``carousel`` handler registered here.
+
+With the ``media_placeholders`` plugin enabled, each card's ``<img>`` gets a
+tiny inline placeholder as its background until the image loads.
+
+Image dimensions come from file headers (see ``image_dimensions.py``), with
+Pillow as a fallback for formats the header reader does not know. They are
+cached in ``CACHE_PATH/carousel_dimensions.json`` keyed by
+absolute path and validated against the file's size and mtime, so a rebuild
+only opens images that are new or changed. Set
+``CAROUSEL_DIMENSION_CACHE = False`` to keep the cache in memory only.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
 from html import escape
+import json
+import logging
+import os
 from pathlib import Path
-import re
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import quote, unquote
 
 from pelican import signals
-from pelican.contents import Article, Page
 
-CAROUSEL_PATTERN = re.compile(
-    r"(?:(?P<prefix><p[^>]*>)\s*)?\[\[carousel:(?P<spec>.*?)]]\s*(?(prefix)</p>)",
-    re.IGNORECASE | re.DOTALL,
-)
+from .image_dimensions import image_dimensions
+
+try:
+    from PIL import Image
+except ModuleNotFoundError:  # the header reader covers the site's formats
+    Image = None
+
+logger = logging.getLogger(__name__)
 
+DIMENSION_CACHE_FILENAME = 'carousel_dimensions.json'
+DIMENSION_CACHE_FORMAT = 2  # 2: header reader (AVIF sizes, EXIF orientation)
+# Mirrors `.carousel-item { flex: 0 0 clamp(240px, 60vw, 460px) }` in the theme.
+DEFAULT_IMAGE_SIZES = '(max-width: 400px) 240px, (max-width: 766px) 60vw, 460px'
 
 @dataclass
 class CarouselItem:
@@ -44,6 +70,7 @@ class CarouselItem:
     caption: str
     width: Optional[int] = None
     height: Optional[int] = None
+    placeholder_style: str = ''
 
     @property
     def aspect_ratio(self) -> Optional[float]:
@@ -93,15 +120,12 @@ def _resolve_image_path(raw_path: str, settings, instance) -> Optional[Path]:
     return None
 
 
-def _probe_dimensions(raw_path: str, settings, instance) -> Tuple[Optional[int], Optional[int]]:
-    local_path = _resolve_image_path(raw_path, settings, instance)
-    if not local_path:
+def _read_dimensions(local_path: Path) -> Tuple[Optional[int], Optional[int]]:
+    size = image_dimensions(local_path)
+    if size is not None:
+        return size
+    if Image is None:
         return None, None
-    try:
-        from PIL import Image
-    except ModuleNotFoundError:
-        return None, None
-
     try:
         with Image.open(local_path) as image:
             width, height = image.size
@@ -110,6 +134,77 @@ def _probe_dimensions(raw_path: str, settings, instance) -> Tuple[Optional[int],
         return None, None
 
 
+class DimensionCache:
+    """Image sizes keyed by absolute path; an entry is reused while size and mtime match."""
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = path
+        self.entries: Dict[str, list] = {}
+        self.seen: set = set()
+        self.probed = 0
+        self.dirty = False
+        if path is None:
+            return
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('format') == DIMENSION_CACHE_FORMAT:
+            self.entries = data.get('images', {})
+
+    def dimensions(self, local_path: Path) -> Tuple[Optional[int], Optional[int]]:
+        try:
+            stat = local_path.stat()
+        except OSError:
+            return None, None
+        key = os.path.abspath(local_path)
+        self.seen.add(key)
+        cached = self.entries.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2], cached[3]
+        width, height = _read_dimensions(local_path)
+        self.entries[key] = [stat.st_size, stat.st_mtime_ns, width, height]
+        self.probed += 1
+        self.dirty = True
+        return width, height
+
+    def save(self) -> None:
+        """Write the cache, dropping images no carousel referenced in this build."""
+        stale = [key for key in self.entries if key not in self.seen]
+        for key in stale:
+            del self.entries[key]
+        if self.path is not None and (self.dirty or stale):
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+                temp_path.write_text(
+                    json.dumps({'format': DIMENSION_CACHE_FORMAT, 'images': self.entries}),
+                    encoding='utf-8',
+                )
+                os.replace(temp_path, self.path)
+            except OSError as err:
+                logger.warning('carousel_embed: could not write dimension cache %s: %s', self.path, err)
+        logger.info('carousel_embed: %d images, %d probed', len(self.seen), self.probed)
+        self.seen = set()
+        self.probed = 0
+        self.dirty = False
+
+
+_dimension_caches: Dict[Optional[Path], DimensionCache] = {}
+
+
+def _dimension_cache(settings) -> DimensionCache:
+    path = None
+    if settings.get('CAROUSEL_DIMENSION_CACHE', True):
+        path = Path(settings.get('CACHE_PATH') or 'cache') / DIMENSION_CACHE_FILENAME
+    if path not in _dimension_caches:
+        _dimension_caches[path] = DimensionCache(path)
+    return _dimension_caches[path]
+
+
+_placeholder_style = None  # set in register() when media_placeholders is enabled
+
+
 def _parse_spec(spec: str, settings, instance) -> Tuple[str, List[CarouselItem]]:
     label = 'Image carousel'
     items: List[CarouselItem] = []
@@ -128,8 +223,13 @@ def _parse_spec(spec: str, settings, instance) -> Tuple[str, List[CarouselItem]]
         if not path:
             continue
         caption = caption_part.strip()
-        width, height = _probe_dimensions(path_part, settings, instance)
-        items.append(CarouselItem(path, caption, width, height))
+        local_path = _resolve_image_path(path_part, settings, instance)
+        if local_path is None:
+            items.append(CarouselItem(path, caption))
+            continue
+        width, height = _dimension_cache(settings).dimensions(local_path)
+        placeholder = _placeholder_style(local_path, settings) if _placeholder_style else ''
+        items.append(CarouselItem(path, caption, width, height, placeholder))
     return label, items
 
 
@@ -137,6 +237,8 @@ def _build_html(label: str, items: List[CarouselItem], settings) -> str:
     container_class = settings.get('CAROUSEL_CONTAINER_CLASS', 'carousel-gallery')
     scroller_class = settings.get('CAROUSEL_SCROLLER_CLASS', 'carousel-scroller')
     item_class = settings.get('CAROUSEL_ITEM_CLASS', 'carousel-item')
+    image_sizes = settings.get('CAROUSEL_IMAGE_SIZES', DEFAULT_IMAGE_SIZES)
+    sizes_attr = f' sizes="{escape(image_sizes)}"' if image_sizes else ''
 
     explicit_widths = [item.width for item in items if item.width]
     max_card_width = settings.get('CAROUSEL_MAX_CARD_WIDTH', 520)
@@ -163,7 +265,7 @@ def _build_html(label: str, items: List[CarouselItem], settings) -> str:
         height_attr = f' height="{item.height}"' if item.height else ''
         lines.append(f'    <figure class="{item_class}"{style_attr}>')
         lines.append(
-            f'      <img src="{item.src}" alt="{alt_html}" loading="lazy"{width_attr}{height_attr}>'
+            f'      <img src="{item.src}" alt="{alt_html}" loading="lazy"{width_attr}{height_attr}{sizes_attr}{item.placeholder_style}>'
         )
         if item.caption:
             lines.append(f'      <figcaption>{caption_html}</figcaption>')
@@ -173,47 +275,36 @@ def _build_html(label: str, items: List[CarouselItem], settings) -> str:
     return '\n'.join(lines)
 
 
-def _replace_carousels_in_text(text: str, settings, instance) -> str:
-    def _repl(match: re.Match) -> str:
-        spec = match.group('spec')
-        label, items = _parse_spec(spec, settings, instance)
-        if not items:
-            return ''
-        return _build_html(label, items, settings)
-
-    replaced = CAROUSEL_PATTERN.sub(_repl, text)
-    container_class = settings.get('CAROUSEL_CONTAINER_CLASS', 'carousel-gallery')
-    wrapper_pattern = re.compile(
-        rf'<p>\s*(<div class="{re.escape(container_class)}".*?</div>)\s*</p>',
-        re.IGNORECASE | re.DOTALL,
-    )
-    return wrapper_pattern.sub(r'\1', replaced)
-
-
-def replace_carousels(instance):
-    if not isinstance(instance, (Article, Page)):
-        return
-    source = getattr(instance, '_content', None) or getattr(instance, 'content', None)
-    if not source:
-        return
-
-    instance._content = _replace_carousels_in_text(source, instance.settings, instance)  # noqa: SLF001
+def render_carousel_marker(spec: str, instance, position) -> str:
+    label, items = _parse_spec(spec, instance.settings, instance)
+    if not items:
+        return ''
+    return _build_html(label, items, instance.settings)
 
 
-def replace_carousels_late(generators):
-    for generator in generators:
-        for attr in ('articles', 'pages'):
-            for instance in getattr(generator, attr, []):
-                if not isinstance(instance, (Article, Page)):
-                    continue
-                content = getattr(instance, '_content', None)
-                if content:
-                    instance._content = _replace_carousels_in_text(content, instance.settings, instance)  # noqa: SLF001
-                summary = getattr(instance, '_summary', None)
-                if summary:
-                    instance._summary = _replace_carousels_in_text(summary, instance.settings, instance)  # noqa: SLF001
+def save_dimension_cache(pelican):
+    for cache in _dimension_caches.values():
+        cache.save()
 
 
 def register():
-    signals.content_object_init.connect(replace_carousels)
-    signals.all_generators_finalized.connect(replace_carousels_late)
+    global _placeholder_style
+    from content_markers import register_marker_handler
+
+    try:
+        from media_placeholders import placeholder_style
+    except ImportError:
+        placeholder_style = None
+    _placeholder_style = placeholder_style
+
+    register_marker_handler('carousel', render_carousel_marker, settings=(
+        'CAROUSEL_CONTAINER_CLASS',
+        'CAROUSEL_SCROLLER_CLASS',
+        'CAROUSEL_ITEM_CLASS',
+        'CAROUSEL_MAX_CARD_WIDTH',
+        'CAROUSEL_DEFAULT_CARD_WIDTH',
+        'CAROUSEL_IMAGE_SIZES',
+        'MEDIA_PLACEHOLDER_SIZE',
+        'MEDIA_PLACEHOLDER_QUALITY',
+    ))
+    signals.finalized.connect(save_dimension_cache)
@@ -0,0 +1,227 @@
+"""Read image width and height from file headers without decoding pixels.
+
+Supported formats:
+
+* JPEG: the first SOF frame header. An EXIF orientation of 5-8 swaps the axes.
+* PNG: the IHDR chunk.
+* WebP: VP8, VP8L or VP8X headers.
+* AVIF/HEIF: the ``ispe`` property of the primary item. An ``irot`` of 90 or
+  270 degrees swaps the axes.
+
+Only a few kilobytes are read per file. JPEG segments before the frame header
+are skipped with seeks, and for AVIF only the top-level ``meta`` box is read.
+``image_dimensions`` returns ``None`` for unknown or malformed files, so
+callers can fall back to Pillow.
+"""
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+HEIF_BRANDS = {b'avif', b'avis', b'heic', b'heix', b'heim', b'heis', b'hevc', b'hevx', b'mif1', b'msf1'}
+# JPEG SOFn markers; C4 (DHT), C8 (JPG) and CC (DAC) share the range but are not frames.
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+EXIF_ORIENTATION_TAG = 0x0112
+MAX_META_BYTES = 1024 * 1024
+
+Size = Tuple[int, int]
+
+
+def image_dimensions(path: Path) -> Optional[Size]:
+    """Return the displayed ``(width, height)`` of ``path``, or ``None`` if it cannot be sniffed."""
+    try:
+        with open(path, 'rb') as handle:
+            head = handle.read(32)
+            if head.startswith(b'\xff\xd8'):
+                return _jpeg_size(handle)
+            if head.startswith(PNG_SIGNATURE):
+                return _png_size(head)
+            if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+                return _webp_size(head)
+            if head[4:8] == b'ftyp' and _heif_brands(head, handle) & HEIF_BRANDS:
+                return _heif_size(handle)
+    except (OSError, struct.error, ValueError):
+        return None
+    return None
+
+
+def _png_size(head: bytes) -> Optional[Size]:
+    if head[12:16] != b'IHDR':
+        return None
+    width, height = struct.unpack_from('>II', head, 16)
+    return width, height
+
+
+def _webp_size(head: bytes) -> Optional[Size]:
+    chunk = head[12:16]
+    if chunk == b'VP8 ' and head[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack_from('<HH', head, 26)
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and head[20:21] == b'\x2f' and len(head) >= 25:
+        bits = int.from_bytes(head[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X' and len(head) >= 30:
+        return int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1
+    return None
+
+
+def _jpeg_size(handle: BinaryIO) -> Optional[Size]:
+    handle.seek(2)
+    orientation = 1
+    while True:
+        byte = handle.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            continue
+        marker = handle.read(1)
+        while marker == b'\xff':  # fill bytes
+            marker = handle.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code in JPEG_STANDALONE_MARKERS:
+            continue
+        if code in (0xD9, 0xDA):  # end of image or start of scan without a frame header
+            return None
+        length = struct.unpack('>H', handle.read(2))[0]
+        if length < 2:
+            return None
+        if code in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>xHH', handle.read(5))
+            return (height, width) if orientation >= 5 else (width, height)
+        if code == 0xE1 and orientation == 1:
+            segment = handle.read(length - 2)
+            if segment.startswith(b'Exif\x00\x00'):
+                orientation = _exif_orientation(segment[6:])
+            continue
+        handle.seek(length - 2, 1)
+
+
+def _exif_orientation(tiff: bytes) -> int:
+    if tiff[:2] == b'II':
+        order = '<'
+    elif tiff[:2] == b'MM':
+        order = '>'
+    else:
+        return 1
+    offset = struct.unpack_from(order + 'I', tiff, 4)[0]
+    count = struct.unpack_from(order + 'H', tiff, offset)[0]
+    for index in range(count):
+        entry = offset + 2 + index * 12
+        tag, kind = struct.unpack_from(order + 'HH', tiff, entry)
+        if tag == EXIF_ORIENTATION_TAG and kind == 3:  # SHORT
+            value = struct.unpack_from(order + 'H', tiff, entry + 8)[0]
+            return value if 1 <= value <= 8 else 1
+    return 1
+
+
+def _heif_brands(head: bytes, handle: BinaryIO) -> set:
+    size = struct.unpack_from('>I', head, 0)[0]
+    if size < 16:
+        return set()
+    handle.seek(0)
+    ftyp = handle.read(min(size, 256))
+    brands = {ftyp[8:12]}
+    brands.update(ftyp[offset:offset + 4] for offset in range(16, len(ftyp) - 3, 4))
+    return brands
+
+
+def _heif_size(handle: BinaryIO) -> Optional[Size]:
+    handle.seek(0)
+    while True:
+        header = handle.read(8)
+        if len(header) < 8:
+            return None
+        size, kind = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', handle.read(8))[0]
+            header_size = 16
+        if kind == b'meta':
+            payload_size = size - header_size if size else MAX_META_BYTES
+            return _meta_size(handle.read(min(payload_size, MAX_META_BYTES)))
+        if size < header_size:
+            return None
+        handle.seek(size - header_size, 1)
+
+
+def _boxes(data: bytes, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """Yield ``(type, payload start, payload end)`` for each box in ``data[start:end]``."""
+    offset = start
+    while offset + 8 <= end:
+        size, kind = struct.unpack_from('>I4s', data, offset)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack_from('>Q', data, offset + 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size or offset + size > end:
+            return
+        yield kind, offset + header_size, offset + size
+        offset += size
+
+
+def _meta_size(meta: bytes) -> Optional[Size]:
+    primary_item = None
+    properties: list = []
+    associations: dict = {}
+    for kind, start, end in _boxes(meta, 4, len(meta)):  # meta is a FullBox
+        if kind == b'pitm':
+            primary_item = struct.unpack_from('>I' if meta[start] else '>H', meta, start + 4)[0]
+        elif kind == b'iprp':
+            for child, child_start, child_end in _boxes(meta, start, end):
+                if child == b'ipco':
+                    properties = list(_boxes(meta, child_start, child_end))
+                elif child == b'ipma':
+                    associations.update(_item_associations(meta, child_start))
+
+    indices = associations.get(primary_item)
+    if indices is None:
+        indices = range(1, len(properties) + 1)
+    size = None
+    rotation = 0
+    for index in indices:
+        if not 1 <= index <= len(properties):
+            continue
+        kind, start, _ = properties[index - 1]
+        if kind == b'ispe' and size is None:
+            size = struct.unpack_from('>II', meta, start + 4)
+        elif kind == b'irot':
+            rotation = meta[start] & 0x3
+    if size is None:
+        return None
+    width, height = size
+    return (height, width) if rotation in (1, 3) else (width, height)
+
+
+def _item_associations(meta: bytes, start: int) -> dict:
+    version = meta[start]
+    wide_indices = meta[start + 3] & 1
+    offset = start + 4
+    entry_count = struct.unpack_from('>I', meta, offset)[0]
+    offset += 4
+    associations = {}
+    for _ in range(entry_count):
+        if version < 1:
+            item_id = struct.unpack_from('>H', meta, offset)[0]
+            offset += 2
+        else:
+            item_id = struct.unpack_from('>I', meta, offset)[0]
+            offset += 4
+        count = meta[offset]
+        offset += 1
+        indices = []
+        for _ in range(count):
+            if wide_indices:
+                indices.append(struct.unpack_from('>H', meta, offset)[0] & 0x7FFF)
+                offset += 2
+            else:
+                indices.append(meta[offset] & 0x7F)
+                offset += 1
+        associations[item_id] = indices
+    return associations
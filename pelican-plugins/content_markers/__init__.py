@@ -0,0 +1 @@
+from .content_markers import MarkerPosition, expand_markers, register, register_marker_handler
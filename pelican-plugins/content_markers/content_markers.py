@@ -0,0 +1,141 @@
+"""Pelican plugin that expands ``[[kind:spec]]`` markers in a single pass.
+
+Marker plugins register a handler per kind instead of running their own regex::
+
+    from content_markers import register_marker_handler
+
+    def render_video(spec, instance, position):
+        return '<figure>...</figure>'   # or None to leave the marker as written
+
+    register_marker_handler('video', render_video, settings=('VIDEO_EMBED_CLASS',))
+
+Each Article and Page is tokenized once, on ``content_object_init``. Both
+``_content`` and the ``summary`` metadata are expanded; summaries derived from
+the content inherit the expanded HTML. A marker that fills its own paragraph
+replaces the surrounding ``<p>`` as well. ``position`` tells a handler where
+its marker sits in the text: ``index`` counts earlier markers of the same kind
+and ``offset`` is the character offset, for policies such as lazy loading.
+
+Expanded output is memoized per (text hash, source directory, settings of the
+registered handlers). An object whose text is already expanded costs only a
+dictionary lookup. The memo is cleared after each build, so file-dependent
+output (carousel image sizes) is never carried across builds.
+
+List ``content_markers`` in ``PLUGINS``; handler plugins import it from their
+``register()``.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from pelican import signals
+from pelican.contents import Article, Page
+
+logger = logging.getLogger(__name__)
+
+MARKER_PATTERN = re.compile(
+    # The spec may not span "]]", or a paragraph-wrapped match could swallow the next marker.
+    r"(?:(?P<prefix><p[^>]*>)\s*)?\[\[(?P<kind>[a-z][a-z0-9_-]*):(?P<spec>(?:(?!]]).)*)]]\s*(?(prefix)</p>)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+
+class MarkerPosition(NamedTuple):
+    index: int
+    offset: int
+
+
+Handler = Callable[[str, object, MarkerPosition], Optional[str]]
+
+_handlers: Dict[str, Handler] = {}
+_handler_settings: Dict[str, Tuple[str, ...]] = {}
+_memo: Dict[Tuple[str, str, str], str] = {}
+_stats = {'objects': 0, 'markers': 0, 'memo_hits': 0}
+
+
+def register_marker_handler(kind: str, handler: Handler, *, settings: Tuple[str, ...] = ()) -> None:
+    """Route ``[[kind:...]]`` markers to ``handler``; ``settings`` names the settings its output depends on."""
+    _handlers[kind.lower()] = handler
+    _handler_settings[kind.lower()] = tuple(settings)
+    _memo.clear()
+
+
+def _settings_key(settings) -> str:
+    # Presence is part of the key: an explicit None can mean something other than the default.
+    values = sorted(
+        (name, name in settings, repr(settings.get(name)))
+        for kind in sorted(_handler_settings)
+        for name in _handler_settings[kind]
+    )
+    return repr(values)
+
+
+def expand_markers(text: str, instance) -> str:
+    """Return ``text`` with every registered marker replaced by its handler's HTML."""
+    if not text or '[[' not in text:
+        return text
+    settings = getattr(instance, 'settings', None) or {}
+    source_path = str(getattr(instance, 'source_path', '') or '')
+    key = (
+        hashlib.sha1(text.encode('utf-8')).hexdigest(),
+        os.path.dirname(source_path),
+        _settings_key(settings),
+    )
+    cached = _memo.get(key)
+    if cached is not None:
+        _stats['memo_hits'] += 1
+        return cached
+
+    seen: Dict[str, int] = {}
+
+    def _repl(match: re.Match) -> str:
+        kind = match.group('kind').lower()
+        handler = _handlers.get(kind)
+        if handler is None:
+            return match.group(0)
+        position = MarkerPosition(seen.get(kind, 0), match.start())
+        html = handler(match.group('spec'), instance, position)
+        if html is None:
+            return match.group(0)
+        seen[kind] = position.index + 1
+        _stats['markers'] += 1
+        return html
+
+    expanded = MARKER_PATTERN.sub(_repl, text)
+    _memo[key] = expanded
+    # Expanding the output again is a no-op, so seeing it later is a hit too.
+    _memo[(hashlib.sha1(expanded.encode('utf-8')).hexdigest(), key[1], key[2])] = expanded
+    return expanded
+
+
+def expand_instance(instance) -> None:
+    if not isinstance(instance, (Article, Page)):
+        return
+    _stats['objects'] += 1
+    content = getattr(instance, '_content', None)
+    if content:
+        instance._content = expand_markers(content, instance)  # noqa: SLF001
+    summary = instance.metadata.get('summary')
+    if summary:
+        # Pelican copies _summary back into the metadata before writing.
+        instance.metadata['summary'] = instance._summary = expand_markers(summary, instance)  # noqa: SLF001
+
+
+def finish_build(pelican) -> None:
+    logger.info(
+        'content_markers: %(objects)d objects, %(markers)d markers expanded, %(memo_hits)d memo hits',
+        _stats,
+    )
+    _memo.clear()
+    for name in _stats:
+        _stats[name] = 0
+
+
+def register():  # Pelican entry point
+    signals.content_object_init.connect(expand_instance)
+    signals.finalized.connect(finish_build)
@@ -0,0 +1 @@
+from .media_placeholders import placeholder_for, placeholder_style, register  # noqa: F401
@@ -0,0 +1,214 @@
+"""Pelican plugin that computes tiny inline placeholders for images and video posters.
+
+Each placeholder is the image shrunk to at most ``MEDIA_PLACEHOLDER_SIZE``
+pixels on its longest side, saved as a low-quality WebP and returned as a
+``data:`` URI of a few hundred bytes. The carousel_embed and video_embed
+plugins call ``placeholder_for`` and put the result in an inline
+``background-image``. The browser paints the blurry upscale immediately,
+without another request, until the real image or poster has loaded.
+
+Images with transparency get no placeholder, because it would stay visible
+behind the transparent pixels. AVIF sources are decoded with ffmpeg when
+Pillow cannot read them.
+
+Placeholders are cached in ``CACHE_PATH/media_placeholders.json`` by
+SHA-256 of the source bytes, so renamed or copied files reuse them. Source
+hashes are remembered by size and mtime, so a rebuild only reads files that
+are new or changed.
+
+Configuration (optional in pelicanconf.py):
+    MEDIA_PLACEHOLDER_SIZE = 16       # longest side of the placeholder, in pixels
+    MEDIA_PLACEHOLDER_QUALITY = 40    # WebP quality
+    MEDIA_PLACEHOLDER_CACHE = True    # keep placeholders under CACHE_PATH
+
+List ``media_placeholders`` in PLUGINS before the plugins that use it.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, Optional
+
+from pelican import signals
+
+try:
+    from PIL import Image, ImageOps
+except ModuleNotFoundError:  # without Pillow no placeholders are produced
+    Image = ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_CACHE_FILENAME = 'media_placeholders.json'
+PLACEHOLDER_CACHE_FORMAT = 1
+
+DEFAULT_SIZE = 16
+DEFAULT_QUALITY = 40
+
+
+def _open_image(path: Path):
+    try:
+        return Image.open(path)
+    except OSError:
+        if path.suffix.lower() != '.avif' or not shutil.which('ffmpeg'):
+            return None
+    # Pillow without an AVIF plugin: let ffmpeg decode a small PNG instead.
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-v', 'error', '-i', str(path), '-vf', 'scale=64:-2', '-frames:v', '1',
+             '-f', 'image2pipe', '-c:v', 'png', '-'],
+            check=True, capture_output=True,
+        )
+        return Image.open(io.BytesIO(result.stdout))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _has_alpha(image) -> bool:
+    return image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def compute_placeholder(path: Path, size: int = DEFAULT_SIZE, quality: int = DEFAULT_QUALITY) -> Optional[str]:
+    """Return a ``data:image/webp`` URI for ``path``, or ``None`` if it cannot or should not have one."""
+    if Image is None:
+        return None
+    image = _open_image(path)
+    if image is None:
+        return None
+    try:
+        with image:
+            if _has_alpha(image):
+                return None
+            image.draft('RGB', (size * 4, size * 4))  # JPEG: decode at a reduced scale
+            thumbnail = ImageOps.exif_transpose(image).convert('RGB')
+            thumbnail.thumbnail((size, size), Image.BILINEAR)
+            buffer = io.BytesIO()
+            thumbnail.save(buffer, 'WEBP', quality=quality, method=6)
+    except OSError:
+        return None
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+class PlaceholderCache:
+    """Placeholders keyed by source hash; hashes keyed by absolute path and validated by size and mtime."""
+
+    def __init__(self, path: Optional[Path], size: int, quality: int) -> None:
+        self.path = path
+        self.size = size
+        self.quality = quality
+        self.sources: Dict[str, list] = {}
+        self.placeholders: Dict[str, Optional[str]] = {}
+        self.seen: set = set()
+        self.computed = 0
+        self.dirty = False
+        if path is None:
+            return
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('format') == PLACEHOLDER_CACHE_FORMAT:
+            self.sources = data.get('sources', {})
+            # Placeholders rendered with other options are recomputed; hashes stay valid.
+            if data.get('options') == [size, quality]:
+                self.placeholders = data.get('placeholders', {})
+
+    def _digest(self, path: Path) -> Optional[str]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        key = os.path.abspath(path)
+        cached = self.sources.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        try:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            return None
+        self.sources[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        self.dirty = True
+        return digest
+
+    def placeholder(self, path: Path) -> Optional[str]:
+        digest = self._digest(path)
+        if digest is None:
+            return None
+        self.seen.add(os.path.abspath(path))
+        if digest not in self.placeholders:
+            self.placeholders[digest] = compute_placeholder(path, self.size, self.quality)
+            self.computed += 1
+            self.dirty = True
+        return self.placeholders[digest]
+
+    def save(self) -> None:
+        """Write the cache, dropping files no page referenced in this build."""
+        stale = [key for key in self.sources if key not in self.seen]
+        for key in stale:
+            del self.sources[key]
+        live = {entry[2] for entry in self.sources.values()}
+        orphaned = [digest for digest in self.placeholders if digest not in live]
+        for digest in orphaned:
+            del self.placeholders[digest]
+        if self.path is not None and (self.dirty or stale or orphaned):
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+                temp_path.write_text(json.dumps({
+                    'format': PLACEHOLDER_CACHE_FORMAT,
+                    'options': [self.size, self.quality],
+                    'sources': self.sources,
+                    'placeholders': self.placeholders,
+                }), encoding='utf-8')
+                os.replace(temp_path, self.path)
+            except OSError as err:
+                logger.warning('media_placeholders: could not write cache %s: %s', self.path, err)
+        inline = [self.placeholders.get(self.sources[key][2]) for key in self.seen if key in self.sources]
+        logger.info(
+            'media_placeholders: %d files, %d with placeholders, %d computed, %d bytes inline',
+            len(self.seen), sum(1 for uri in inline if uri), self.computed, sum(len(uri or '') for uri in inline),
+        )
+        self.seen = set()
+        self.computed = 0
+        self.dirty = False
+
+
+_caches: Dict[tuple, PlaceholderCache] = {}
+
+
+def _cache(settings) -> PlaceholderCache:
+    path = None
+    if settings.get('MEDIA_PLACEHOLDER_CACHE', True):
+        path = Path(settings.get('CACHE_PATH') or 'cache') / PLACEHOLDER_CACHE_FILENAME
+    size = int(settings.get('MEDIA_PLACEHOLDER_SIZE') or DEFAULT_SIZE)
+    quality = int(settings.get('MEDIA_PLACEHOLDER_QUALITY') or DEFAULT_QUALITY)
+    key = (path, size, quality)
+    if key not in _caches:
+        _caches[key] = PlaceholderCache(path, size, quality)
+    return _caches[key]
+
+
+def placeholder_for(path: Path, settings) -> Optional[str]:
+    """Return the placeholder ``data:`` URI for the local file ``path``, or ``None``."""
+    return _cache(settings).placeholder(Path(path))
+
+
+def placeholder_style(path: Path, settings) -> str:
+    """Return `` style="background-image: ..."`` for ``path``, or an empty string."""
+    uri = placeholder_for(path, settings)
+    return f' style="background-image: url({uri});"' if uri else ''
+
+
+def save_placeholder_cache(pelican):
+    for cache in _caches.values():
+        cache.save()
+
+
+def register():  # Pelican entry point
+    signals.finalized.connect(save_placeholder_cache)
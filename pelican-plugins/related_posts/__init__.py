@@ -0,0 +1 @@
+from .related_posts import register
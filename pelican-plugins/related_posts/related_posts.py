@@ -0,0 +1,267 @@
+"""Pelican plugin that precomputes the top related articles for every post.
+
+Scoring follows the content manager's related-article ranking: a boost for a
+shared category, a boost per shared tag, and wording similarity on top. Wording
+similarity is the cosine of sparse sublinear term-frequency vectors over title,
+summary and body text; candidates come from an inverted index, so only article
+pairs that share a term, tag or category are ever scored.
+
+Results are exposed to templates as ``article.related_posts`` (a list of
+articles, best first).
+
+Vectors deliberately carry no IDF weighting: a post's vector depends only on
+its own text, so editing, adding or deleting a post changes only the scores in
+its own row and column. Words that say nothing about relatedness are dropped by
+the fixed ``STOP_WORDS`` list instead.
+
+Incremental builds: per-article term counts are cached on disk keyed by a
+SHA-256 of the source file, together with the previous build's related lists.
+Only changed posts are scored against the whole site. Because scores are
+symmetric, those rows also give every other post its fresh scores against the
+changed posts, which are merged into its cached list. A cached list is re-scored
+in full only when one of its entries was deleted or lost score. Settings
+changes and larger edits (more than ``RELATED_POSTS_FULL_REBUILD_RATIO`` of
+posts) trigger a full re-score.
+
+Configuration (optional in pelicanconf.py):
+    RELATED_POSTS_MAX = 3
+    RELATED_POSTS_CATEGORY_WEIGHT = 1.0
+    RELATED_POSTS_TAG_WEIGHT = 0.25      # per shared tag
+    RELATED_POSTS_TEXT_WEIGHT = 1.0      # times term-frequency cosine (0..1)
+    RELATED_POSTS_FULL_REBUILD_RATIO = 0.2
+    RELATED_POSTS_CACHE = True           # stored under CACHE_PATH
+"""
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+
+from pelican import signals
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = 'related_posts.json'
+CACHE_FORMAT = 2
+
+KEYWORD_PATTERN = re.compile(r"[a-z0-9]{3,}")
+TAG_PATTERN = re.compile(r"<[^>]+>")
+# Media markers, figures and links carry file names rather than prose.
+MARKER_PATTERN = re.compile(r"\[\[[^\]]*\]\]")
+STOP_WORDS = {
+    "this", "that", "with", "from", "have", "they", "them", "were", "what", "when", "just",
+    "like", "into", "about", "there", "their", "really", "would", "could", "should", "because",
+    "still", "today", "also", "then", "than", "after", "before", "around", "over", "under",
+    "very", "more", "some", "much", "many", "only", "your", "mine", "ours", "been", "being",
+    "make", "made", "gets", "getting", "post", "article", "draft", "content", "video", "image",
+    "the", "and", "for", "but", "not", "you", "are", "was", "all", "out", "its", "had", "has",
+}
+
+DEFAULTS = {
+    'RELATED_POSTS_MAX': 3,
+    'RELATED_POSTS_CATEGORY_WEIGHT': 1.0,
+    'RELATED_POSTS_TAG_WEIGHT': 0.25,
+    'RELATED_POSTS_TEXT_WEIGHT': 1.0,
+    'RELATED_POSTS_FULL_REBUILD_RATIO': 0.2,
+    'RELATED_POSTS_CACHE': True,
+}
+
+
+def _setting(settings, name):
+    return settings.get(name, DEFAULTS[name])
+
+
+def source_hash(article) -> str:
+    try:
+        data = Path(article.source_path).read_bytes()
+    except (OSError, TypeError):
+        data = (getattr(article, '_content', '') or '').encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def term_counts(article) -> dict[str, int]:
+    text = ' '.join([
+        getattr(article, 'title', '') or '',
+        getattr(article, '_summary', '') or '',
+        getattr(article, '_content', '') or '',
+    ])
+    text = MARKER_PATTERN.sub(' ', TAG_PATTERN.sub(' ', text)).lower()
+    return dict(Counter(term for term in KEYWORD_PATTERN.findall(text) if term not in STOP_WORDS))
+
+
+class RelatedPostsModel:
+    """Sparse unit-length term-frequency vectors plus term, tag and category postings."""
+
+    def __init__(self, features: dict[str, dict], settings) -> None:
+        self.features = features
+        self.max_results = int(_setting(settings, 'RELATED_POSTS_MAX'))
+        self.category_weight = float(_setting(settings, 'RELATED_POSTS_CATEGORY_WEIGHT'))
+        self.tag_weight = float(_setting(settings, 'RELATED_POSTS_TAG_WEIGHT'))
+        self.text_weight = float(_setting(settings, 'RELATED_POSTS_TEXT_WEIGHT'))
+
+        self.vectors: dict[str, dict[str, float]] = {}
+        self.term_postings: dict[str, list[tuple[str, float]]] = {}
+        self.tag_postings: dict[str, list[str]] = {}
+        self.category_postings: dict[str, list[str]] = {}
+        for key, item in features.items():
+            weights = {term: 1 + math.log(count) for term, count in item['terms'].items()}
+            norm = math.sqrt(sum(value * value for value in weights.values())) or 1.0
+            vector = {term: value / norm for term, value in weights.items()}
+            self.vectors[key] = vector
+            for term, value in vector.items():
+                self.term_postings.setdefault(term, []).append((key, value))
+            for tag in item['tags']:
+                self.tag_postings.setdefault(tag, []).append(key)
+            if item['category']:
+                self.category_postings.setdefault(item['category'], []).append(key)
+
+    def scores_for(self, key: str) -> dict[str, float]:
+        """Scores of ``key`` against every article it shares a feature with."""
+        item = self.features[key]
+        scores: dict[str, float] = {}
+        get = scores.get
+        if self.text_weight:
+            for term, value in self.vectors[key].items():
+                for other, other_value in self.term_postings[term]:
+                    scores[other] = get(other, 0.0) + self.text_weight * value * other_value
+        for tag in item['tags']:
+            for other in self.tag_postings.get(tag, ()):
+                scores[other] = get(other, 0.0) + self.tag_weight
+        if item['category']:
+            for other in self.category_postings.get(item['category'], ()):
+                scores[other] = get(other, 0.0) + self.category_weight
+        scores.pop(key, None)
+        return scores
+
+    def top(self, key: str, scores: dict[str, float]) -> list[list]:
+        # Ranked on the rounded (cached) score, so merged lists order like fresh ones.
+        # Ties go to the newer post, then to the source path for stable output.
+        best = heapq.nsmallest(
+            self.max_results,
+            ((other, round(score, 6)) for other, score in scores.items()),
+            key=lambda pair: (-pair[1], -self.features[pair[0]]['timestamp'], pair[0]),
+        )
+        return [[other, score] for other, score in best if score > 0]
+
+
+def _settings_fingerprint(settings) -> str:
+    values = {name: _setting(settings, name) for name in DEFAULTS if name != 'RELATED_POSTS_CACHE'}
+    return hashlib.sha256(json.dumps(values, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _cache_path(settings) -> Path:
+    return Path(settings.get('CACHE_PATH') or 'cache') / CACHE_FILENAME
+
+
+def _load_cache(settings) -> dict:
+    if not _setting(settings, 'RELATED_POSTS_CACHE'):
+        return {}
+    try:
+        cache = json.loads(_cache_path(settings).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if cache.get('format') != CACHE_FORMAT:
+        return {}
+    return cache
+
+
+def _save_cache(settings, cache: dict) -> None:
+    if not _setting(settings, 'RELATED_POSTS_CACHE'):
+        return
+    path = _cache_path(settings)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        temp_path.write_text(json.dumps(cache), encoding='utf-8')
+        os.replace(temp_path, path)
+    except OSError as err:
+        logger.warning('related_posts: could not write cache %s: %s', path, err)
+
+
+def compute_related(articles, settings) -> tuple[dict[str, list[list]], dict]:
+    """Return ``({source key: [[other key, score], ...]}, stats)`` for ``articles``."""
+    cache = _load_cache(settings)
+    fingerprint = _settings_fingerprint(settings)
+    cached_articles = cache.get('articles', {}) if cache.get('settings') == fingerprint else {}
+
+    features: dict[str, dict] = {}
+    changed: set[str] = set()
+    for article in articles:
+        key = str(article.source_path)
+        digest = source_hash(article)
+        cached = cached_articles.get(key)
+        if cached is not None and cached['hash'] == digest:
+            terms = cached['terms']
+        else:
+            terms = term_counts(article)
+            changed.add(key)
+        features[key] = {
+            'hash': digest,
+            'terms': terms,
+            'tags': sorted({str(tag).lower() for tag in getattr(article, 'tags', []) or []}),
+            'category': str(getattr(article, 'category', '') or '').lower(),
+            'timestamp': article.date.timestamp() if getattr(article, 'date', None) else 0.0,
+        }
+    removed = set(cached_articles) - set(features)
+    touched = changed | removed
+
+    model = RelatedPostsModel(features, settings)
+    full = (
+        not cached_articles
+        or len(touched) > len(features) * float(_setting(settings, 'RELATED_POSTS_FULL_REBUILD_RATIO'))
+    )
+    related: dict[str, list[list]] = {}
+    rescored = 0
+    # Scores are symmetric, so a changed post's row is also its column in every other row.
+    rows = {} if full else {key: model.scores_for(key) for key in changed}
+    for key in features:
+        previous = cached_articles.get(key, {}).get('related')
+        if full or previous is None or key in changed:
+            related[key] = model.top(key, rows[key] if key in rows else model.scores_for(key))
+            rescored += 1
+            continue
+        fresh = {other: rows[other][key] for other in changed if key in rows[other]}
+        if any(other in removed or (other in changed and round(fresh.get(other, 0.0), 6) < score) for other, score in previous):
+            # An entry left the list or fell; a post below the cut may now belong in it.
+            related[key] = model.top(key, model.scores_for(key))
+            rescored += 1
+        elif fresh:
+            merged = {other: score for other, score in previous}
+            merged.update(fresh)
+            related[key] = model.top(key, merged)
+        else:
+            related[key] = previous
+
+    _save_cache(settings, {
+        'format': CACHE_FORMAT,
+        'settings': fingerprint,
+        'articles': {
+            key: {'hash': item['hash'], 'terms': item['terms'], 'related': related[key]}
+            for key, item in features.items()
+        },
+    })
+    return related, {'articles': len(features), 'changed': len(touched), 'rescored': rescored, 'full': full}
+
+
+def attach_related_posts(generator) -> None:
+    articles = list(getattr(generator, 'articles', []) or [])
+    if not articles:
+        return
+    related, stats = compute_related(articles, generator.settings)
+    by_key = {str(article.source_path): article for article in articles}
+    for article in articles:
+        article.related_posts = [by_key[other] for other, _ in related.get(str(article.source_path), []) if other in by_key]
+    logger.info(
+        'related_posts: %(articles)d articles, %(changed)d changed, %(rescored)d re-scored (full=%(full)s)',
+        stats,
+    )
+
+
+def register():  # Pelican entry point
+    signals.article_generator_finalized.connect(attach_related_posts)
@@ -0,0 +1 @@
+from .responsive_images import register
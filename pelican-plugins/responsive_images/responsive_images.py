@@ -0,0 +1,456 @@
+"""Pelican plugin that publishes a width ladder for local images and emits ``srcset``.
+
+For every ``<img src="/media/...">`` in article and page HTML, including
+carousel cards, the plugin adds::
+
+    srcset="/media/images/x-360w.avif 360w, /media/images/x-720w.avif 720w, /media/images/x.avif 1080w"
+    sizes="(max-width: 760px) 100vw, 700px"     # unless the tag already has sizes
+
+Only widths narrower than the original are produced. Article thumbnails (the
+``thumbnail``/``image``/``cover``/``featured_image`` metadata read by the index
+template) get a shorter ladder through the ``responsive_srcset`` filter::
+
+    <img src="{{ SITEURL }}/media/{{ thumb }}"
+         srcset="{{ thumb|responsive_srcset(SITEURL ~ '/media/') }}" sizes="320px">
+
+Variants keep the source format. AVIF is encoded with ffmpeg (libaom-av1) or a
+Pillow build with AVIF support; JPEG, PNG and WebP use Pillow.
+
+Ladders are planned while content is read. Missing variants are encoded in
+parallel on ``all_generators_finalized``, before any HTML is written, and only
+then is ``srcset`` added, listing just the variants that exist. A failed encode
+is logged and its width left out of the page. Advertised variants are copied
+next to the original in the output folder when the build finishes.
+
+Encodes are cached under ``CACHE_PATH/responsive_images`` by SHA-256 of the
+source bytes and width, so an unchanged image is never re-encoded. Source hashes
+are remembered by size and mtime. Variants and hashes of images no page used in
+the build are pruned from the cache.
+
+Configuration (optional in pelicanconf.py):
+    RESPONSIVE_IMAGES_WIDTHS = (360, 720, 1080)
+    RESPONSIVE_IMAGES_SIZES = '(max-width: 760px) 100vw, 700px'
+    RESPONSIVE_IMAGES_THUMBNAIL_WIDTHS = (360, 720)   # index thumbnails are at most 320px wide
+    RESPONSIVE_IMAGES_WORKERS = None          # defaults to the CPU count
+    RESPONSIVE_IMAGES_AVIF_CRF = 32
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from pelican import signals
+from pelican.contents import Article, Page
+
+try:
+    from PIL import Image, ImageOps
+except ModuleNotFoundError:  # Pillow encodes JPEG, PNG and WebP variants
+    Image = ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIRNAME = 'responsive_images'
+HASH_INDEX_FILENAME = 'index.json'
+HASH_INDEX_FORMAT = 1
+SOURCE_EXTENSIONS = {'.avif', '.jpg', '.jpeg', '.png', '.webp'}
+PILLOW_FORMATS = {'.avif': 'AVIF', '.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG', '.webp': 'WEBP'}
+PILLOW_SAVE_OPTIONS = {
+    'AVIF': {'quality': 60},
+    'JPEG': {'quality': 82, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 80},
+}
+
+IMG_TAG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+SRC_PATTERN = re.compile(r'\ssrc="(?P<src>/media/[^"]+)"', re.IGNORECASE)
+SRCSET_SAFE = "/:()'!*"
+# Metadata the index template reads thumbnails from, in the same order.
+THUMBNAIL_METADATA = ('thumbnail', 'image', 'cover', 'featured_image')
+
+DEFAULTS = {
+    'RESPONSIVE_IMAGES_WIDTHS': (360, 720, 1080),
+    'RESPONSIVE_IMAGES_SIZES': '(max-width: 760px) 100vw, 700px',
+    'RESPONSIVE_IMAGES_THUMBNAIL_WIDTHS': (360, 720),
+    'RESPONSIVE_IMAGES_WORKERS': None,
+    'RESPONSIVE_IMAGES_AVIF_CRF': 32,
+}
+
+_read_dimensions = None  # set in register()
+
+
+def _setting(settings, name):
+    value = settings.get(name)
+    return DEFAULTS[name] if value is None else value
+
+
+def _pillow_dimensions(path: Path) -> Optional[Tuple[int, int]]:
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+            orientation = image.getexif().get(0x0112, 1)
+    except OSError:
+        return None
+    return (height, width) if orientation >= 5 else (width, height)
+
+
+def _encoder_for(suffix: str) -> Optional[str]:
+    if Image is not None:
+        Image.init()
+        if PILLOW_FORMATS.get(suffix) in Image.SAVE:
+            return 'pillow'
+    if shutil.which('ffmpeg'):
+        return 'ffmpeg'
+    return None
+
+
+def encode_variant(encoder: str, source: Path, target: Path, width: int, settings) -> None:
+    temp_path = target.with_name(f'{target.stem}.{os.getpid()}.tmp{target.suffix}')
+    try:
+        if encoder == 'pillow':
+            with Image.open(source) as image:
+                image = ImageOps.exif_transpose(image)
+                height = max(round(image.height * width / image.width), 1)
+                resized = image.resize((width, height), Image.LANCZOS)
+                image_format = PILLOW_FORMATS[source.suffix.lower()]
+                if image_format == 'JPEG' and resized.mode not in ('RGB', 'L'):
+                    resized = resized.convert('RGB')
+                resized.save(temp_path, image_format, **PILLOW_SAVE_OPTIONS[image_format])
+        else:
+            codec = []
+            if source.suffix.lower() == '.avif':
+                crf = str(_setting(settings, 'RESPONSIVE_IMAGES_AVIF_CRF'))
+                codec = ['-c:v', 'libaom-av1', '-crf', crf, '-b:v', '0', '-still-picture', '1']
+            elif source.suffix.lower() in ('.jpg', '.jpeg'):
+                codec = ['-q:v', '3']
+            subprocess.run(
+                ['ffmpeg', '-v', 'error', '-y', '-i', str(source), '-vf', f'scale={width}:-2', *codec, str(temp_path)],
+                check=True, capture_output=True,
+            )
+        os.replace(temp_path, target)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+class VariantPlanner:
+    """Decides which widths each image gets, encodes the missing ones and publishes them."""
+
+    def __init__(self, settings) -> None:
+        self.settings = settings
+        self.media_root = Path(settings.get('PATH', 'content')) / 'media'
+        self.cache_dir = Path(settings.get('CACHE_PATH') or 'cache') / CACHE_DIRNAME
+        self.widths = sorted(int(width) for width in _setting(settings, 'RESPONSIVE_IMAGES_WIDTHS'))
+        self.thumbnail_widths = sorted(
+            int(width) for width in _setting(settings, 'RESPONSIVE_IMAGES_THUMBNAIL_WIDTHS')
+        )
+        self.hashes: Dict[str, list] = {}
+        self.seen_sources: set = set()
+        self.ladders: Dict[tuple, Optional[List[Tuple[str, int, Optional[Path]]]]] = {}
+        # output path relative to the site root -> (cached file, source, width, encoder)
+        self.variants: Dict[str, Tuple[Path, Path, int, Optional[str]]] = {}
+        self.advertised: set = set()
+        self.failed: set = set()
+        self.encoded = 0
+        self.encoders: Dict[str, Optional[str]] = {}
+        self.instances: list = []
+        try:
+            index = json.loads((self.cache_dir / HASH_INDEX_FILENAME).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            index = {}
+        if index.get('format') == HASH_INDEX_FORMAT:
+            self.hashes = index.get('sources', {})
+
+    def _source_hash(self, path: Path) -> Optional[str]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        key = os.path.abspath(path)
+        self.seen_sources.add(key)
+        cached = self.hashes.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self.hashes[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def ladder(self, media_path: str, widths: Optional[List[int]] = None) -> Optional[List[Tuple[str, int, Optional[Path]]]]:
+        """``[(path under media/, width, cached file), ...]`` ending with the original (cached file None).
+
+        Returns None if there is nothing to add. Planning a ladder queues its
+        missing variants for ``encode_pending``.
+        """
+        widths = self.widths if widths is None else widths
+        key = (media_path, tuple(widths))
+        if key in self.ladders:
+            return self.ladders[key]
+        self.ladders[key] = None
+        source = self.media_root / media_path
+        suffix = source.suffix.lower()
+        if suffix not in SOURCE_EXTENSIONS:
+            return None
+        size = (_read_dimensions or _pillow_dimensions)(source)
+        if not size:
+            return None
+        width = size[0]
+        candidates = [candidate for candidate in widths if candidate < width]
+        if not candidates:
+            return None
+        if suffix not in self.encoders:
+            self.encoders[suffix] = _encoder_for(suffix)
+        encoder = self.encoders[suffix]
+        digest = self._source_hash(source)
+        if digest is None:
+            return None
+        stem = media_path[:-len(source.suffix)]
+        entries = []
+        for candidate in candidates:
+            cached = self.cache_dir / f'{digest[:24]}-{candidate}{suffix}'
+            if not cached.exists() and encoder is None:
+                continue
+            variant = f'{stem}-{candidate}w{source.suffix}'
+            self.variants[f'media/{variant}'] = (cached, source, candidate, encoder)
+            entries.append((variant, candidate, cached))
+        if not entries:
+            return None
+        entries.append((media_path, width, None))
+        self.ladders[key] = entries
+        return entries
+
+    def plan(self, html: str) -> None:
+        """Queue the ladders of every local ``<img>`` in ``html``."""
+        for tag in IMG_TAG_PATTERN.findall(html):
+            src = SRC_PATTERN.search(tag)
+            if src is not None and ' srcset=' not in tag:
+                self.ladder(unquote(src.group('src')[len('/media/'):]))
+
+    def srcset(
+        self,
+        media_path: str,
+        prefix: str,
+        original_url: Optional[str] = None,
+        widths: Optional[List[int]] = None,
+    ) -> str:
+        """``srcset`` for ``media_path``; ``original_url`` keeps the original entry identical to ``src``.
+
+        Only variants that are already encoded are listed, so a failed or
+        pending encode never leaves a dangling URL in the page.
+        """
+        entries = self.ladder(media_path, widths)
+        if not entries:
+            return ''
+        available = [
+            (path, width) for path, width, cached in entries
+            if cached is None or (cached not in self.failed and cached.exists())
+        ]
+        if len(available) < 2:
+            return ''
+        self.advertised.update(f'media/{path}' for path, _ in available[:-1])
+        # Spaces and commas would split a srcset candidate, so every URL is quoted.
+        urls = [f'{prefix}{quote(path, safe=SRCSET_SAFE)}' for path, _ in available]
+        if original_url:
+            urls[-1] = original_url
+        return ', '.join(f'{url} {width}w' for url, (_, width) in zip(urls, available))
+
+    def encode_pending(self) -> None:
+        """Encode every planned variant that is not cached yet, in parallel."""
+        pending = {}
+        for cached, source, width, encoder in self.variants.values():
+            if encoder is not None and cached not in self.failed and not cached.exists():
+                pending[cached] = (encoder, source, width)
+        if not pending:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        workers = _setting(self.settings, 'RESPONSIVE_IMAGES_WORKERS') or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(encode_variant, encoder, source, cached, width, self.settings): cached
+                for cached, (encoder, source, width) in pending.items()
+            }
+            for future, cached in futures.items():
+                try:
+                    future.result()
+                    self.encoded += 1
+                except (OSError, subprocess.CalledProcessError) as err:
+                    self.failed.add(cached)
+                    logger.warning('responsive_images: could not encode %s: %s', cached.name, err)
+
+    def publish(self, output_path: Path) -> Dict[str, int]:
+        """Copy every advertised variant into the output and prune the cache."""
+        copied = 0
+        for relative in sorted(self.advertised):
+            cached = self.variants[relative][0]
+            target = output_path / relative
+            try:
+                if target.exists() and target.stat().st_size == cached.stat().st_size:
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(cached, target)
+                copied += 1
+            except OSError as err:
+                logger.warning('responsive_images: could not publish %s: %s', relative, err)
+        pruned = self._prune()
+        self._save_index()
+        return {
+            'images': sum(1 for ladder in self.ladders.values() if ladder),
+            'variants': len(self.advertised),
+            'encoded': self.encoded,
+            'failed': len(self.failed),
+            'copied': copied,
+            'pruned': pruned,
+        }
+
+    def _prune(self) -> int:
+        """Drop hashes and cached variants of sources no page used in this build."""
+        for key in [key for key in self.hashes if key not in self.seen_sources]:
+            del self.hashes[key]
+        keep = {cached.name for cached, _, _, _ in self.variants.values()}
+        keep.add(HASH_INDEX_FILENAME)
+        pruned = 0
+        try:
+            stale = [path for path in self.cache_dir.iterdir() if path.is_file() and path.name not in keep]
+        except OSError:
+            return 0
+        for path in stale:
+            try:
+                path.unlink()
+                pruned += 1
+            except OSError as err:
+                logger.warning('responsive_images: could not prune %s: %s', path.name, err)
+        return pruned
+
+    def _save_index(self) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.cache_dir / HASH_INDEX_FILENAME
+            temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+            temp_path.write_text(json.dumps({'format': HASH_INDEX_FORMAT, 'sources': self.hashes}), encoding='utf-8')
+            os.replace(temp_path, path)
+        except OSError as err:
+            logger.warning('responsive_images: could not write hash index: %s', err)
+
+
+_planners: Dict[int, VariantPlanner] = {}
+
+
+def _planner(settings) -> VariantPlanner:
+    key = id(settings)
+    if key not in _planners:
+        _planners[key] = VariantPlanner(settings)
+    return _planners[key]
+
+
+def add_srcset(html: str, settings) -> str:
+    if '<img' not in html:
+        return html
+    planner = _planner(settings)
+    default_sizes = _setting(settings, 'RESPONSIVE_IMAGES_SIZES')
+
+    def _repl(match: re.Match) -> str:
+        tag = match.group(0)
+        src = SRC_PATTERN.search(tag)
+        if src is None or ' srcset=' in tag:
+            return tag
+        url = src.group('src')
+        srcset = planner.srcset(unquote(url[len('/media/'):]), '/media/', url if ' ' not in url else None)
+        if not srcset:
+            return tag
+        extra = f' srcset="{srcset}"'
+        if ' sizes=' not in tag:
+            extra += f' sizes="{default_sizes}"'
+        if tag.endswith('/>'):
+            return f'{tag[:-2].rstrip()}{extra} />'
+        return f'{tag[:-1]}{extra}>'
+
+    return IMG_TAG_PATTERN.sub(_repl, html)
+
+
+def plan_instance(instance) -> None:
+    if not isinstance(instance, (Article, Page)):
+        return
+    planner = _planner(instance.settings)
+    for text in (getattr(instance, '_content', None), instance.metadata.get('summary')):
+        if text and '<img' in text:
+            planner.plan(text)
+    planner.instances.append(instance)
+
+
+def _thumbnail(article) -> Optional[str]:
+    metadata = getattr(article, 'metadata', {}) or {}
+    for name in THUMBNAIL_METADATA:
+        value = metadata.get(name)
+        if value:
+            return value if isinstance(value, str) and '://' not in value else None
+    return None
+
+
+def encode_and_rewrite(generators) -> None:
+    """Encode every planned variant, then add ``srcset`` to the content that was read.
+
+    Runs on ``all_generators_finalized``: after all content is read, before any
+    HTML is written, so pages only advertise variants that exist.
+    """
+    for generator in generators:
+        articles = getattr(generator, 'articles', None)
+        if articles is None:
+            continue
+        planner = _planner(generator.settings)
+        for article in [*articles, *getattr(generator, 'translations', [])]:
+            thumbnail = _thumbnail(article)
+            if thumbnail:
+                planner.ladder(thumbnail.lstrip('/'), planner.thumbnail_widths)
+    for planner in _planners.values():
+        planner.encode_pending()
+        for instance in planner.instances:
+            content = getattr(instance, '_content', None)
+            if content:
+                instance._content = add_srcset(content, instance.settings)  # noqa: SLF001
+            summary = instance.metadata.get('summary')
+            if summary:
+                instance.metadata['summary'] = instance._summary = add_srcset(summary, instance.settings)  # noqa: SLF001
+        planner.instances = []
+
+
+def add_template_filter(generator) -> None:
+    planner = _planner(generator.settings)
+
+    def responsive_srcset(media_path: str, prefix: str = '/media/') -> str:
+        if not media_path or '://' in media_path:
+            return ''
+        return planner.srcset(media_path.lstrip('/'), prefix, widths=planner.thumbnail_widths)
+
+    generator.env.filters['responsive_srcset'] = responsive_srcset
+
+
+def publish_variants(pelican) -> None:
+    for key, planner in list(_planners.items()):
+        stats = planner.publish(Path(pelican.output_path))
+        logger.info(
+            'responsive_images: %(images)d images, %(variants)d variants, %(encoded)d encoded, '
+            '%(failed)d failed, %(copied)d copied, %(pruned)d pruned',
+            stats,
+        )
+        del _planners[key]
+
+
+def register():  # Pelican entry point
+    global _read_dimensions
+    try:
+        from carousel_embed.image_dimensions import image_dimensions
+    except ImportError:
+        image_dimensions = None
+    _read_dimensions = image_dimensions
+    signals.content_object_init.connect(plan_instance)
+    signals.all_generators_finalized.connect(encode_and_rewrite)
+    signals.generator_init.connect(add_template_filter)
+    signals.finalized.connect(publish_variants)
@@ -0,0 +1 @@
+from .static_search import register
@@ -0,0 +1,168 @@
+"""Pelican plugin that writes a compact, sharded full-text index for client-side search.
+
+Output (under ``STATIC_SEARCH_DIR``, default ``search/``)::
+
+    manifest.json       shard keys, document count and format version (fetched first)
+    t-<key>.json        terms starting with <key> (first two letters), plus postings
+    d-<n>.json          document table slice n: [url, title, date] rows
+
+Term shards are front-coded: terms are sorted and each one is stored as one
+base-36 digit giving the length of the prefix shared with the previous term,
+followed by the rest of the term. Postings are flat ``[doc gap, weight, ...]``
+integer lists with doc ids delta-encoded, so common terms stay small.
+
+The browser (``theme/js/search.js``) loads the manifest on first use, then only
+the term shards for the typed prefixes and the document slices for the hits,
+so the download grows with the query rather than with the archive.
+
+Configuration (optional in pelicanconf.py):
+    STATIC_SEARCH_DIR = 'search'
+    STATIC_SEARCH_DOCS_PER_SHARD = 200
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import unicodedata
+from collections import Counter
+from html import unescape
+from pathlib import Path
+
+from pelican import signals
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT = 1
+SHARD_PREFIX_LENGTH = 2
+MAX_TERM_LENGTH = 35  # front-coding prefix lengths fit in one base-36 digit
+MAX_WEIGHT = 255
+FIELD_WEIGHTS = {'title': 8, 'tags': 6, 'summary': 3}
+BODY_WEIGHT_CAP = 4
+
+TERM_PATTERN = re.compile(r"[a-z0-9]+")
+TAG_PATTERN = re.compile(r"<[^>]+>")
+MARKER_PATTERN = re.compile(r"\[\[[^\]]*\]\]")
+STOP_WORDS = {
+    "the", "and", "for", "but", "not", "you", "are", "was", "all", "out", "its", "had", "has",
+    "this", "that", "with", "from", "have", "they", "them", "were", "what", "when", "just",
+    "into", "about", "there", "their", "then", "than", "very", "some", "been", "being",
+}
+BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+_collected: list[dict] = []
+
+
+def terms_of(text: str) -> list[str]:
+    """Lowercase ASCII-folded words, matching ``tokenize`` in theme/js/search.js."""
+    folded = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode('ascii').lower()
+    return [
+        term for term in TERM_PATTERN.findall(folded)
+        if len(term) >= SHARD_PREFIX_LENGTH and len(term) <= MAX_TERM_LENGTH and term not in STOP_WORDS
+    ]
+
+
+def plain_text(html: str) -> str:
+    """Text of an HTML fragment with entities decoded, so ``&amp;`` is not indexed as a word."""
+    return unescape(MARKER_PATTERN.sub(' ', TAG_PATTERN.sub(' ', html or '')))
+
+
+def document_weights(document: dict) -> Counter[str]:
+    weights: Counter[str] = Counter()
+    for field in ('title', 'tags', 'summary'):
+        for term in set(terms_of(document[field])):
+            weights[term] += FIELD_WEIGHTS[field]
+    for term, count in Counter(terms_of(document['body'])).items():
+        weights[term] += min(count, BODY_WEIGHT_CAP)
+    return Counter({term: min(weight, MAX_WEIGHT) for term, weight in weights.items()})
+
+
+def front_code(terms: list[str]) -> list[str]:
+    encoded = []
+    previous = ''
+    for term in terms:
+        shared = 0
+        limit = min(len(previous), len(term))
+        while shared < limit and previous[shared] == term[shared]:
+            shared += 1
+        encoded.append(BASE36[shared] + term[shared:])
+        previous = term
+    return encoded
+
+
+def build_index(documents: list[dict], docs_per_shard: int) -> dict[str, object]:
+    """Return ``{relative file name: JSON payload}`` for the whole index."""
+    postings: dict[str, list[tuple[int, int]]] = {}
+    for doc_id, document in enumerate(documents):
+        for term, weight in document_weights(document).items():
+            postings.setdefault(term, []).append((doc_id, weight))
+
+    shards: dict[str, list[str]] = {}
+    for term in sorted(postings):
+        shards.setdefault(term[:SHARD_PREFIX_LENGTH], []).append(term)
+
+    files: dict[str, object] = {}
+    for key, terms in shards.items():
+        encoded_postings = []
+        for term in terms:
+            flat = []
+            previous = 0
+            for doc_id, weight in postings[term]:
+                flat.extend((doc_id - previous, weight))
+                previous = doc_id
+            encoded_postings.append(flat)
+        files[f't-{key}.json'] = {'terms': front_code(terms), 'postings': encoded_postings}
+
+    doc_shards = 0
+    for start in range(0, len(documents), docs_per_shard):
+        rows = [[doc['url'], doc['title'], doc['date']] for doc in documents[start:start + docs_per_shard]]
+        files[f'd-{doc_shards}.json'] = rows
+        doc_shards += 1
+
+    files['manifest.json'] = {
+        'format': INDEX_FORMAT,
+        'documents': len(documents),
+        'docs_per_shard': docs_per_shard,
+        'prefix_length': SHARD_PREFIX_LENGTH,
+        'shards': ' '.join(sorted(shards)),
+    }
+    return files
+
+
+def collect_articles(generator) -> None:
+    _collected.clear()
+    articles = sorted(getattr(generator, 'articles', []) or [], key=lambda article: article.date, reverse=True)
+    for article in articles:
+        _collected.append({
+            'url': article.url,
+            'title': plain_text(article.title),
+            'date': article.date.strftime('%Y-%m-%d'),
+            'tags': ' '.join(str(tag) for tag in getattr(article, 'tags', []) or []),
+            'summary': plain_text(getattr(article, '_summary', '') or ''),
+            'body': plain_text(getattr(article, '_content', '') or ''),
+        })
+
+
+def write_index(pelican) -> None:
+    if not _collected:
+        return
+    settings = pelican.settings
+    out_dir = Path(pelican.output_path) / settings.get('STATIC_SEARCH_DIR', 'search')
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in out_dir.glob('*.json'):
+        stale.unlink()
+    files = build_index(_collected, int(settings.get('STATIC_SEARCH_DOCS_PER_SHARD', 200)))
+    total = 0
+    for name, payload in files.items():
+        data = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+        (out_dir / name).write_text(data, encoding='utf-8')
+        total += len(data.encode('utf-8'))
+    logger.info(
+        'static_search: %d documents, %d files, %.1f KiB total, manifest %.1f KiB',
+        len(_collected), len(files), total / 1024, len(json.dumps(files['manifest.json'])) / 1024,
+    )
+
+
+def register():  # Pelican entry point
+    signals.article_generator_finalized.connect(collect_articles)
+    signals.finalized.connect(write_index)
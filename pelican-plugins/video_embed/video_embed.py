@@ -5,18 +5,45 @@ Usage in Markdown:
         Write:  [[video:hop-hop-hop]]
         Renders:
                 <figure class="embedded-video">
-                    <video controls preload="metadata" poster="/media/video/hop-hop-hop.jpg">
+                    <video controls preload="metadata" poster="/media/video/hop-hop-hop.jpg"
+                           width="1080" height="1920" data-duration="12.48">
                         <source src="/media/video/hop-hop-hop.mp4" type="video/mp4" />
                     </video>
                 </figure>
 
 Configuration (optional in pelicanconf.py):
     VIDEO_EMBED_CLASS = 'embedded-video'  # outer figure class
+    VIDEO_EMBED_PRELOAD = 'metadata'      # preload for videos near the top of a page
+    VIDEO_EMBED_PRELOAD_FIRST = 1         # videos per page that keep VIDEO_EMBED_PRELOAD
+    VIDEO_EMBED_FOLD_CHARS = 2000         # videos starting further into the HTML
+                                          # count as below the fold (None disables)
+    VIDEO_EMBED_PROBE_CACHE = True        # keep probe results under CACHE_PATH
+
+Videos past the first VIDEO_EMBED_PRELOAD_FIRST, or below the fold, get
+preload="none", so a page with many clips only fetches metadata for the first.
+
+Width, height (rotation applied) and duration come from ffprobe when it is on
+PATH, otherwise from the MP4 ``moov`` header. If neither can read the file (for
+example a Git LFS pointer), the poster's size is used. Results are cached in
+``CACHE_PATH/video_probe.json``, keyed by file path and validated against
+size and mtime, so rebuilds do not re-probe unchanged files.
+
+With the ``media_placeholders`` plugin enabled, the <video> gets a tiny inline
+copy of the poster as its background, shown until the poster itself loads.
 
 If relative disabled (or RELATIVE_URLS False), it prefixes SITEURL.
 
+Markers are expanded by the ``content_markers`` plugin, which must also be
+listed in PLUGINS; this plugin only registers the ``video`` handler.
+
 In RSS/Atom feeds the <video> element is replaced with the poster <img> so
 feed readers display a static image instead of a stripped/broken player.
+The rewrite runs once per article per build, however many feeds list it.
+Full content in feeds (Atom, and RSS with RSS_FEED_SUMMARY_ONLY = False) can
+be capped; it is cut after the last top-level element that fits and ends
+with a "Continue reading" link:
+
+    VIDEO_EMBED_FEED_MAX_CHARS = None     # e.g. 20000; None keeps full content
 
 Limitations:
     - No fallback text beyond standard browser message.
@@ -24,14 +51,30 @@ Limitations:
 """
 from __future__ import annotations
 
+import json
+import logging
+import os
+from pathlib import Path
 import re
+import shutil
+import struct
+import subprocess
+from typing import Dict, Optional
+
 from pelican import signals
-from pelican.contents import Article, Page
 
-VIDEO_PATTERN = re.compile(
-    r"(?:(?P<prefix><p[^>]*>)\s*)?\[\[video:(?P<name>[a-zA-Z0-9._-]+)]]\s*(?(prefix)</p>)",
-    re.IGNORECASE | re.DOTALL,
-)
+try:
+    from PIL import Image
+except ModuleNotFoundError:  # poster fallback is optional
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+PROBE_CACHE_FILENAME = 'video_probe.json'
+PROBE_CACHE_FORMAT = 1
+MAX_MOOV_BYTES = 8 * 1024 * 1024
+
+VIDEO_NAME_PATTERN = re.compile(r"[a-zA-Z0-9._-]+")
 
 # Matches the <figure> block produced by build_video_html so we can swap it
 # for a plain poster <img> in feed output.
@@ -43,15 +86,37 @@ _FEED_VIDEO_PATTERN = re.compile(
     r'\s*</figure>',
     re.DOTALL | re.IGNORECASE,
 )
+_HTML_TAG_PATTERN = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9]*)\b[^>]*?(/?)>')
+_VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr',
+}
+
+# Feed-safe content per (source path, site URL, size cap); cleared after each build.
+_feed_memo: Dict[tuple, str] = {}
+_feed_stats = {'rewrites': 0, 'memo_hits': 0, 'truncated': 0}
 
 
-def build_video_html(name: str, siteurl: str, relative: bool, css_class: str) -> str:
+def build_video_html(
+    name: str,
+    siteurl: str,
+    relative: bool,
+    css_class: str,
+    preload: str = 'metadata',
+    probe: Optional[dict] = None,
+    placeholder_style: str = '',
+) -> str:
     base = f"/media/video/{name}"
     poster = f"{base}.jpg"
     mp4 = f"{base}.mp4"
+    attrs = f'preload="{preload}" poster="{poster}"'
+    if probe and probe.get('width') and probe.get('height'):
+        attrs += f' width="{probe["width"]}" height="{probe["height"]}"'
+    if probe and probe.get('duration'):
+        attrs += f' data-duration="{probe["duration"]:.2f}"'
+    attrs += placeholder_style
     return (
         f'<figure class="{css_class}">\n'
-        f'  <video controls preload="metadata" poster="{poster}">\n'
+        f'  <video controls {attrs}>\n'
         f'    <source src="{mp4}" type="video/mp4" />\n'
         f'    Your browser does not support the video tag.\n'
         f'  </video>\n'
@@ -59,12 +124,227 @@ def build_video_html(name: str, siteurl: str, relative: bool, css_class: str) ->
     )
 
 
-def _replace_markers_in_text(text: str, css_class: str) -> str:
-    def _repl(match: re.Match) -> str:
-        name = match.group('name')
-        return build_video_html(name, '', True, css_class)
+def _mp4_boxes(data: bytes, start: int, end: int):
+    offset = start
+    while offset + 8 <= end:
+        size, kind = struct.unpack_from('>I4s', data, offset)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack_from('>Q', data, offset + 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size or offset + size > end:
+            return
+        yield kind, offset + header_size, offset + size
+        offset += size
+
+
+def _read_moov(path: Path) -> Optional[bytes]:
+    with open(path, 'rb') as handle:
+        while True:
+            header = handle.read(8)
+            if len(header) < 8:
+                return None
+            size, kind = struct.unpack('>I4s', header)
+            header_size = 8
+            if size == 1:
+                size = struct.unpack('>Q', handle.read(8))[0]
+                header_size = 16
+            if kind == b'moov':
+                payload_size = size - header_size if size else MAX_MOOV_BYTES
+                return handle.read(min(payload_size, MAX_MOOV_BYTES))
+            if size < header_size:
+                return None
+            handle.seek(size - header_size, 1)
+
+
+def mp4_header_probe(path: Path) -> Optional[dict]:
+    """Width, height and duration from the ``mvhd`` and video ``tkhd`` boxes."""
+    try:
+        moov = _read_moov(path)
+    except OSError:
+        return None
+    if not moov:
+        return None
+    try:
+        duration = None
+        width = height = None
+        for kind, start, end in _mp4_boxes(moov, 0, len(moov)):
+            if kind == b'mvhd':
+                if moov[start] == 1:
+                    timescale, length = struct.unpack_from('>IQ', moov, start + 20)
+                else:
+                    timescale, length = struct.unpack_from('>II', moov, start + 12)
+                duration = length / timescale if timescale else None
+            elif kind == b'trak' and width is None:
+                boxes = {child: (child_start, child_end) for child, child_start, child_end in _mp4_boxes(moov, start, end)}
+                if b'tkhd' not in boxes or not _is_video_track(moov, *boxes.get(b'mdia', (0, 0))):
+                    continue
+                tkhd_start, tkhd_end = boxes[b'tkhd']
+                a, b = struct.unpack_from('>ii', moov, tkhd_end - 44)
+                track_width, track_height = struct.unpack_from('>II', moov, tkhd_end - 8)
+                width, height = track_width >> 16, track_height >> 16
+                if a == 0 and b != 0:  # transform matrix rotates by 90 or 270 degrees
+                    width, height = height, width
+    except struct.error:
+        return None
+    if not (width and height):
+        return None
+    return {'width': width, 'height': height, 'duration': duration}
+
+
+def _is_video_track(data: bytes, start: int, end: int) -> bool:
+    for kind, box_start, _ in _mp4_boxes(data, start, end):
+        if kind == b'hdlr':
+            return data[box_start + 8:box_start + 12] == b'vide'
+    return False
+
+
+def poster_probe(video_path: Path) -> Optional[dict]:
+    poster_path = video_path.with_suffix('.jpg')
+    if Image is None or not poster_path.exists():
+        return None
+    try:
+        with Image.open(poster_path) as image:
+            width, height = image.size
+    except OSError:
+        return None
+    return {'width': int(width), 'height': int(height), 'duration': None}
+
+
+def ffprobe_probe(path: Path) -> Optional[dict]:
+    try:
+        result = subprocess.run(
+            [
+                'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+                '-show_entries', 'stream=width,height:stream_tags=rotate:stream_side_data=rotation:format=duration',
+                '-of', 'json', str(path),
+            ],
+            capture_output=True, text=True, timeout=30,
+        )
+        payload = json.loads(result.stdout or '{}')
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+    streams = payload.get('streams') or []
+    if result.returncode != 0 or not streams:
+        return None
+    stream = streams[0]
+    width, height = stream.get('width'), stream.get('height')
+    if not (width and height):
+        return None
+    rotation = (stream.get('tags') or {}).get('rotate')
+    for side_data in stream.get('side_data_list') or []:
+        rotation = side_data.get('rotation', rotation)
+    if rotation is not None and abs(int(float(rotation))) % 180 == 90:
+        width, height = height, width
+    try:
+        duration = float((payload.get('format') or {}).get('duration'))
+    except (TypeError, ValueError):
+        duration = None
+    return {'width': int(width), 'height': int(height), 'duration': duration}
+
 
-    return VIDEO_PATTERN.sub(_repl, text)
+class VideoProbeCache:
+    """Probe results keyed by absolute path; an entry is reused while size and mtime match."""
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = path
+        self.entries: Dict[str, list] = {}
+        self.seen: set = set()
+        self.probed = 0
+        self.dirty = False
+        self.has_ffprobe = shutil.which('ffprobe') is not None
+        if path is None:
+            return
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('format') == PROBE_CACHE_FORMAT:
+            self.entries = data.get('videos', {})
+
+    def probe(self, video_path: Path) -> Optional[dict]:
+        try:
+            stat = video_path.stat()
+        except OSError:
+            return None
+        key = os.path.abspath(video_path)
+        self.seen.add(key)
+        cached = self.entries.get(key)
+        # Header-only results are refreshed once ffprobe becomes available.
+        if (
+            cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns
+            and (cached[2] == 'ffprobe' or not self.has_ffprobe)
+        ):
+            return cached[3]
+        result = ffprobe_probe(video_path) if self.has_ffprobe else None
+        source = 'ffprobe'
+        if result is None:
+            result = mp4_header_probe(video_path)
+            source = 'header'
+        if result is None:
+            result = poster_probe(video_path)
+        self.entries[key] = [stat.st_size, stat.st_mtime_ns, source, result]
+        self.probed += 1
+        self.dirty = True
+        return result
+
+    def save(self) -> None:
+        """Write the cache, dropping videos no page embedded in this build."""
+        stale = [key for key in self.entries if key not in self.seen]
+        for key in stale:
+            del self.entries[key]
+        if self.path is not None and (self.dirty or stale):
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+                temp_path.write_text(json.dumps({'format': PROBE_CACHE_FORMAT, 'videos': self.entries}), encoding='utf-8')
+                os.replace(temp_path, self.path)
+            except OSError as err:
+                logger.warning('video_embed: could not write probe cache %s: %s', self.path, err)
+        logger.info('video_embed: %d videos, %d probed', len(self.seen), self.probed)
+        self.seen = set()
+        self.probed = 0
+        self.dirty = False
+
+
+_probe_caches: Dict[Optional[Path], VideoProbeCache] = {}
+
+
+def _probe_cache(settings) -> VideoProbeCache:
+    path = None
+    if settings.get('VIDEO_EMBED_PROBE_CACHE', True):
+        path = Path(settings.get('CACHE_PATH') or 'cache') / PROBE_CACHE_FILENAME
+    if path not in _probe_caches:
+        _probe_caches[path] = VideoProbeCache(path)
+    return _probe_caches[path]
+
+
+_placeholder_style = None  # set in register() when media_placeholders is enabled
+
+
+def preload_for(settings, position) -> str:
+    eager = settings.get('VIDEO_EMBED_PRELOAD', 'metadata')
+    if position.index >= int(settings.get('VIDEO_EMBED_PRELOAD_FIRST', 1)):
+        return 'none'
+    fold = settings.get('VIDEO_EMBED_FOLD_CHARS', 2000)
+    if fold is not None and position.offset > int(fold):
+        return 'none'
+    return eager
+
+
+def render_video_marker(spec: str, instance, position) -> str | None:
+    if not VIDEO_NAME_PATTERN.fullmatch(spec):
+        return None
+    settings = instance.settings
+    css_class = settings.get('VIDEO_EMBED_CLASS', 'embedded-video')
+    video_path = Path(settings.get('PATH', 'content')) / 'media' / 'video' / f'{spec}.mp4'
+    probe = _probe_cache(settings).probe(video_path)
+    placeholder = ''
+    if _placeholder_style is not None:
+        placeholder = _placeholder_style(video_path.with_suffix('.jpg'), settings)
+    return build_video_html(spec, '', True, css_class, preload_for(settings, position), probe, placeholder)
 
 
 def _make_feed_safe(content: str) -> str:
@@ -74,30 +354,53 @@ def _make_feed_safe(content: str) -> str:
     return _FEED_VIDEO_PATTERN.sub(_repl, content)
 
 
-def replace_markers(instance):  # instance may be Article or Page
-    if not isinstance(instance, (Article, Page)):
-        return
-    source = getattr(instance, '_content', None) or getattr(instance, 'content', None)
-    if not source:
-        return
+def _truncate_blocks(content: str, max_chars: int) -> Optional[str]:
+    """Cut ``content`` after the last top-level element that ends within ``max_chars``.
 
-    css_class = instance.settings.get('VIDEO_EMBED_CLASS', 'embedded-video')
-    instance._content = _replace_markers_in_text(source, css_class)  # noqa: SLF001
+    At least the first top-level element is kept. Returns ``None`` if nothing
+    would be cut.
+    """
+    if len(content) <= max_chars:
+        return None
+    depth = 0
+    cut = None
+    for match in _HTML_TAG_PATTERN.finditer(content):
+        closing, name, self_closing = match.group(1), match.group(2).lower(), match.group(3)
+        if not (name in _VOID_ELEMENTS or self_closing):
+            depth = max(depth - 1, 0) if closing else depth + 1
+            if not closing:
+                continue
+        if depth:
+            continue
+        if match.end() > max_chars and cut is not None:
+            break
+        cut = match.end()
+        if cut >= max_chars:
+            break
+    if cut is None or cut >= len(content.rstrip()):
+        return None
+    return content[:cut]
 
 
-def replace_markers_late(generators):
-    for generator in generators:
-        for attr in ('articles', 'pages'):
-            for instance in getattr(generator, attr, []):
-                if not isinstance(instance, (Article, Page)):
-                    continue
-                css_class = instance.settings.get('VIDEO_EMBED_CLASS', 'embedded-video')
-                content = getattr(instance, '_content', None)
-                if content:
-                    instance._content = _replace_markers_in_text(content, css_class)  # noqa: SLF001
-                summary = getattr(instance, '_summary', None)
-                if summary:
-                    instance._summary = _replace_markers_in_text(summary, css_class)  # noqa: SLF001
+def feed_content(item, siteurl: str, get_content) -> str:
+    """Feed-safe content for ``item``, computed once per item, site URL and build."""
+    settings = getattr(item, 'settings', None) or {}
+    max_chars = settings.get('VIDEO_EMBED_FEED_MAX_CHARS')
+    key = (getattr(item, 'source_path', None) or id(item), siteurl, max_chars)
+    cached = _feed_memo.get(key)
+    if cached is not None:
+        _feed_stats['memo_hits'] += 1
+        return cached
+    content = _make_feed_safe(get_content(siteurl))
+    if max_chars:
+        truncated = _truncate_blocks(content, int(max_chars))
+        if truncated is not None:
+            link = f"{siteurl.rstrip('/')}/{item.url}" if siteurl else f'/{item.url}'
+            content = f'{truncated}\n<p><a href="{link}">Continue reading</a></p>'
+            _feed_stats['truncated'] += 1
+    _feed_stats['rewrites'] += 1
+    _feed_memo[key] = content
+    return content
 
 
 def _patch_writer() -> None:
@@ -110,7 +413,7 @@ def _patch_writer() -> None:
         _orig_get_content = item.get_content
 
         def _feed_get_content(siteurl: str) -> str:
-            return _make_feed_safe(_orig_get_content(siteurl))
+            return feed_content(item, siteurl, _orig_get_content)
 
         item.get_content = _feed_get_content
         try:
@@ -124,7 +427,40 @@ def _patch_writer() -> None:
     Writer._add_item_to_the_feed = _patched
 
 
+def finish_feeds(pelican):
+    if _feed_stats['rewrites']:
+        logger.info(
+            'video_embed: %(rewrites)d feed entries rewritten, %(memo_hits)d memo hits, %(truncated)d truncated',
+            _feed_stats,
+        )
+    _feed_memo.clear()
+    for name in _feed_stats:
+        _feed_stats[name] = 0
+
+
+def save_probe_cache(pelican):
+    for cache in _probe_caches.values():
+        cache.save()
+
+
 def register():  # Pelican entry point
-    signals.content_object_init.connect(replace_markers)
-    signals.all_generators_finalized.connect(replace_markers_late)
+    global _placeholder_style
+    from content_markers import register_marker_handler
+
+    try:
+        from media_placeholders import placeholder_style
+    except ImportError:
+        placeholder_style = None
+    _placeholder_style = placeholder_style
+
+    register_marker_handler('video', render_video_marker, settings=(
+        'VIDEO_EMBED_CLASS',
+        'VIDEO_EMBED_PRELOAD',
+        'VIDEO_EMBED_PRELOAD_FIRST',
+        'VIDEO_EMBED_FOLD_CHARS',
+        'MEDIA_PLACEHOLDER_SIZE',
+        'MEDIA_PLACEHOLDER_QUALITY',
+    ))
+    signals.finalized.connect(save_probe_cache)
+    signals.finalized.connect(finish_feeds)
     _patch_writer()
@@ -27,7 +27,15 @@ THEME = 'themes/cute-theme'
 
 # --- Plugins ---
 PLUGIN_PATHS = ['pelican-plugins']
-PLUGINS = ['video_embed', 'carousel_embed', 'jinja2content']
+PLUGINS = ['content_markers', 'media_placeholders', 'video_embed', 'carousel_embed', 'responsive_images', 'jinja2content', 'related_posts', 'static_search', 'build_profiler']
+
+# Only the first embedded video on a page, if it starts near the top, preloads metadata.
+VIDEO_EMBED_PRELOAD = 'metadata'
+VIDEO_EMBED_PRELOAD_FIRST = 1
+VIDEO_EMBED_FOLD_CHARS = 2000
+
+# Build timings in cache/build_profile.json: `make profile` or `pelican -e BUILD_PROFILE=true`.
+BUILD_PROFILE = False
 
 JINJA_GLOBALS = {
     'Path': Path,
@@ -58,6 +66,7 @@ FEED_ALL_RSS = 'feeds/all.rss.xml'
 CATEGORY_FEED_ATOM = 'feeds/{slug}.atom.xml'
 CATEGORY_FEED_RSS = 'feeds/{slug}.rss.xml'
 RSS_FEED_SUMMARY_ONLY = False  # include full article content in RSS feeds
+VIDEO_EMBED_FEED_MAX_CHARS = None  # cap full content in feeds (characters); None keeps everything
 
 # --- Extra Path Metadata ---
 EXTRA_PATH_METADATA = {
@@ -19,6 +19,7 @@ class ArticleAuthoringTests(unittest.TestCase):
             images_dir=repo_root / "content" / "media" / "images",
             video_dir=repo_root / "content" / "media" / "video",
             articles_dir=repo_root / "content" / "articles",
+            cache_dir=repo_root / ".cache",
             output_format="m4a",
             clip_id_pattern=__import__("re").compile(r"(\d{2}-\d{2})"),
             auto_commit=False,
@@ -26,6 +27,11 @@ class ArticleAuthoringTests(unittest.TestCase):
             git_branch="main",
             openai_api_key="test-key",
             openai_model="test-model",
+            openai_base_url="https://api.openai.com/v1",
+            generation_cache_ttl_hours=168,
+            generation_cache_max_mb=64,
+            generation_max_request_mb=20,
+            generation_max_input_tokens=30000,
             geocoder_user_agent="test-agent",
             max_upload_mb=200,
             max_dimension=1080,
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from content_manager.services.article_corpus import (
+    ArticleCorpusIndex,
+    parse_article_file,
+    read_article_header,
+    shared_corpus_index,
+)
+from content_manager.services.site_taxonomy import load_site_taxonomy
+
+
+def write_article(path: Path, title: str, category: str, tags: str, body: str = "Body text.") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f"Title: {title}\nDate: 2026-03-05\nSummary: {title} summary\nCategory: {category}\nTags: {tags}\n\n{body}\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+class ArticleCorpusIndexTests(unittest.TestCase):
+    def test_files_are_parsed_once_until_they_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            articles_dir = Path(tmp) / "content" / "articles"
+            first = write_article(articles_dir / "2026" / "03" / "first.md", "First", "Self", "One, Two")
+            second = write_article(articles_dir / "2026" / "03" / "second.md", "Second", "Pole Dance", "Spin")
+            parsed = []
+
+            def counting_parser(path):
+                parsed.append(path.name)
+                return parse_article_file(path)
+
+            now = [0.0]
+            index = ArticleCorpusIndex(articles_dir, refresh_interval=5, clock=lambda: now[0], parser=counting_parser)
+
+            records = index.records()
+            self.assertEqual([record.title for record in records], ["First", "Second"])
+            self.assertEqual(records[0].path, "2026/03/first.md")
+            self.assertEqual(records[0].tags, ["One", "Two"])
+            version = index.version
+
+            now[0] = 10.0
+            index.records()
+            self.assertEqual(sorted(parsed), ["first.md", "second.md"])
+            self.assertEqual(index.version, version)
+
+            write_article(second, "Second Edited", "Pole Dance", "Spin, Climb")
+            stat = second.stat()
+            os.utime(second, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            first.unlink()
+            now[0] = 20.0
+            records = index.records()
+
+            self.assertEqual([record.title for record in records], ["Second Edited"])
+            self.assertEqual(parsed.count("second.md"), 2)
+            self.assertGreater(index.version, version)
+
+    def test_refresh_is_throttled_but_notify_changed_is_immediate(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            articles_dir = Path(tmp) / "content" / "articles"
+            write_article(articles_dir / "2026" / "03" / "first.md", "First", "Self", "One")
+            index = ArticleCorpusIndex(articles_dir, refresh_interval=60, clock=lambda: 0.0)
+            self.assertEqual(len(index.records()), 1)
+
+            published = write_article(articles_dir / "2026" / "04" / "new.md", "New", "Self", "Two")
+            self.assertEqual(len(index.records()), 1)
+
+            index.notify_changed(published)
+            self.assertEqual([record.title for record in index.records()], ["First", "New"])
+
+    def test_taxonomy_is_served_from_shared_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            articles_dir = Path(tmp) / "content" / "articles"
+            write_article(articles_dir / "2026" / "03" / "a.md", "A", "Pole Dance", "Spin, Climb")
+            write_article(articles_dir / "2026" / "03" / "b.md", "B", "pole dance", "spin")
+            write_article(articles_dir / "2026" / "03" / "c.md", "", "Self", "Notes")
+
+            taxonomy = load_site_taxonomy(articles_dir)
+
+            self.assertIs(shared_corpus_index(articles_dir), shared_corpus_index(articles_dir))
+            self.assertEqual(taxonomy.categories, ["Pole Dance", "Self"])
+            self.assertEqual(taxonomy.tags_by_category["Pole Dance"], ["Spin", "Climb"])
+            self.assertIn("Notes", taxonomy.tags)
+
+
+class ArticleHeaderTests(unittest.TestCase):
+    def test_header_read_stops_at_front_matter_and_body_loads_lazily(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            body = "First line of the body.\r\n" + "filler words " * 100_000
+            path = write_article(Path(tmp) / "content" / "articles" / "2026" / "03" / "long.md", "Long", "Self", "One", body)
+
+            record = parse_article_file(path)
+
+            self.assertEqual((record.title, record.tags), ("Long", ["One"]))
+            self.assertIsNone(record.body)
+            self.assertEqual(path.read_bytes()[record.body_offset:].split(b"\r\n")[0], b"First line of the body.")
+            self.assertTrue(record.load_body().startswith("First line of the body.\nfiller words"))
+            self.assertTrue(record.load_excerpt().endswith("..."))
+
+    def test_header_read_is_capped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "runaway.md"
+            path.write_text("Title: Runaway\n" + "Key: value\n" * 10_000, encoding="utf-8")
+
+            metadata, body_offset = read_article_header(path, max_bytes=64)
+
+            self.assertEqual(metadata["title"], "Runaway")
+            self.assertLessEqual(body_offset, 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
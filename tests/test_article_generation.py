@@ -19,6 +19,26 @@ class FakeResponse:
         return self._payload
 
 
+class FakeStreamResponse:
+    def __init__(self, lines: list[str]):
+        self._lines = lines
+        self.closed = False
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def iter_lines(self, decode_unicode: bool = False):
+        return iter(self._lines)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FailingStreamResponse(FakeStreamResponse):
+    def raise_for_status(self) -> None:
+        raise RuntimeError("503 Server Error")
+
+
 class ArticleGenerationTests(unittest.TestCase):
     def test_generate_normalizes_json_response(self):
         with tempfile.TemporaryDirectory() as tmp:
@@ -138,6 +158,90 @@ class ArticleGenerationTests(unittest.TestCase):
             self.assertEqual(len(image_parts), 2)
             self.assertTrue(any("sampled frames from this video" in item["text"] for item in text_parts))
 
+    def test_generate_stream_yields_deltas_then_normalized_result(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            image_path = Path(tmp) / "sample.jpg"
+            image_path.write_bytes(b"fake-image")
+            output_text = json.dumps({
+                "title_ideas": ["One", "Two", "Three"],
+                "summary": "Short summary",
+                "category": "Self",
+                "tags": ["Tag A", "Tag A"],
+                "content_markdown": "Paragraph one.",
+            })
+            halfway = len(output_text) // 2
+            lines = [
+                "event: response.created",
+                'data: {"type": "response.created"}',
+                "",
+                "event: response.output_text.delta",
+                "data: " + json.dumps({"type": "response.output_text.delta", "delta": output_text[:halfway]}),
+                "",
+                "event: response.output_text.delta",
+                "data: " + json.dumps({"type": "response.output_text.delta", "delta": output_text[halfway:]}),
+                "",
+                "event: response.completed",
+                'data: {"type": "response.completed", "response": {"output": []}}',
+                "",
+            ]
+            captured = {}
+            response = FakeStreamResponse(lines)
+
+            def fake_request(url, headers, json, timeout, stream):
+                captured["payload"] = json
+                captured["stream"] = stream
+                return response
+
+            generator = ArticleGenerator(api_key="test-key", model="test-model", request_fn=fake_request)
+            events = list(generator.generate_stream(GenerationRequest(
+                media_context=[{
+                    "name": "sample",
+                    "media_type": "image",
+                    "model_input_paths": [image_path],
+                }],
+                canonical_job={
+                    "location_name": "Seattle, Washington, United States",
+                    "captured_at": "2026-03-17T19:00:00",
+                    "time_of_day": "evening",
+                },
+                warnings=[],
+                allowed_categories=["Self"],
+                allowed_tags=["Tag A"],
+                likely_named_locations=[],
+            )))
+
+            self.assertTrue(captured["payload"]["stream"])
+            self.assertTrue(captured["stream"])
+            self.assertEqual([event["type"] for event in events], ["delta", "delta", "result"])
+            self.assertEqual("".join(event["text"] for event in events[:2]), output_text)
+            self.assertEqual(events[-1]["result"]["tags"], ["Tag A"])
+            self.assertFalse(events[-1]["result"]["cached"])
+            self.assertTrue(response.closed)
+
+    def test_generate_stream_closes_response_on_error_status(self):
+        response = FailingStreamResponse([])
+        generator = ArticleGenerator(
+            api_key="test-key",
+            model="test-model",
+            request_fn=lambda url, headers, json, timeout, stream: response,
+        )
+
+        with self.assertRaisesRegex(RuntimeError, "503"):
+            list(generator.generate_stream(GenerationRequest(
+                media_context=[],
+                canonical_job={
+                    "location_name": "Seattle, Washington, United States",
+                    "captured_at": "2026-03-17T19:00:00",
+                    "time_of_day": "evening",
+                },
+                warnings=[],
+                allowed_categories=[],
+                allowed_tags=[],
+                likely_named_locations=[],
+            )))
+
+        self.assertTrue(response.closed)
+
     def test_generate_requires_api_key(self):
         generator = ArticleGenerator(api_key="", model="test-model")
         with self.assertRaises(RuntimeError):
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from content_manager import app
+from content_manager.services.article_corpus import ArticleCorpusIndex
+from content_manager.services.article_search import ArticleSearchIndex, build_match_query
+
+
+def write_article(articles_dir: Path, name: str, title: str, category: str, tags: str, body: str) -> Path:
+    path = articles_dir / "2026" / "03" / f"{name}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"Title: {title}\nDate: 2026-03-05\nCategory: {category}\nTags: {tags}\n\n{body}\n", encoding="utf-8")
+    return path
+
+
+class ArticleSearchIndexTests(unittest.TestCase):
+    def test_match_query_quotes_words_and_prefixes_the_last_one(self):
+        self.assertEqual(build_match_query('pole sp'), '"pole" "sp"*')
+        self.assertEqual(build_match_query('cat* OR "x" -y'), '"cat"* "OR" "x" "y"')
+        self.assertEqual(build_match_query("  "), "")
+
+    def test_prefix_search_filters_and_highlighted_snippets(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            articles_dir = Path(tmp) / "content" / "articles"
+            write_article(articles_dir, "spin", "Spin class", "Pole Dance", "Spin, Studio", "Practiced a <b>spinning</b> climb.")
+            write_article(articles_dir, "ferry", "Ferry ride", "Travel", "Seattle", "Spinach pie on the ferry.")
+            index = ArticleSearchIndex(ArticleCorpusIndex(articles_dir), Path(tmp) / "search.sqlite3")
+            drafts = {"d1": {"title": "Spin notes", "content": "spin draft", "tags": "Spin", "updated_at": "2026-04-01T00:00:00"}}
+
+            self.assertEqual(index.sync(drafts), 3)
+            self.assertEqual(index.sync(drafts), 0)
+
+            self.assertEqual({hit.ref for hit in index.search("spin")}, {"2026/03/spin.md", "2026/03/ferry.md", "d1"})
+            hits = index.search("spin", category="pole dance")
+            self.assertEqual([hit.ref for hit in hits], ["2026/03/spin.md"])
+            self.assertIn("<mark>spinning</mark>", hits[0].snippet)
+            self.assertIn("&lt;b&gt;", hits[0].snippet)
+            self.assertEqual([hit.ref for hit in index.search("", tags=["spin", "studio"])], ["2026/03/spin.md"])
+            self.assertEqual([hit.ref for hit in index.search("spin", kind="draft")], ["d1"])
+
+            index.close()
+            reopened = ArticleSearchIndex(ArticleCorpusIndex(articles_dir), Path(tmp) / "search.sqlite3")
+            self.assertEqual(reopened.sync({}), 1)
+            self.assertEqual(reopened.search("spin", kind="draft"), [])
+
+
+class ArticleSearchEndpointTests(unittest.TestCase):
+    def test_search_endpoint_includes_drafts_from_state(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            articles_dir = Path(tmp) / "content" / "articles"
+            write_article(articles_dir, "crows", "Crows", "Crows", "Crows", "Crows at the feeder.")
+            index = ArticleSearchIndex(ArticleCorpusIndex(articles_dir))
+            with patch.object(app, "article_search", index), patch.dict(app.state.drafts, {
+                "draft-1": {"title": "Crow draft", "content": "", "tags": "", "updated_at": "2026-04-01T00:00:00"},
+            }):
+                client = app.app.test_client()
+                response = client.get("/api/articles/search?q=cro")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    sorted((hit["kind"], hit["ref"]) for hit in response.get_json()["results"]),
+                    [("article", "2026/03/crows.md"), ("draft", "draft-1")],
+                )
+                self.assertEqual(client.get("/api/articles/search?q=cro&kind=page").status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
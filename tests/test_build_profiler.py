@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from pelican import signals
+from pelican.writers import Writer
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pelican-plugins"))
+
+from build_profiler import build_profiler  # noqa: E402
+from build_profiler.build_profiler import _profiled_run  # noqa: E402
+
+
+def receivers():
+    return {name: dict(signal.receivers) for name, signal in build_profiler._pelican_signals().items()}
+
+
+class ProfiledRunTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = Path(self.tmp.name) / "cache"
+        self.calls = []
+        signals.finalized.connect(self.on_finalized)
+        self.addCleanup(signals.finalized.disconnect, self.on_finalized)
+
+    def on_finalized(self, sender):
+        self.calls.append(sender)
+
+    def pelican(self, **settings):
+        return SimpleNamespace(settings={"CACHE_PATH": str(self.cache_dir), "PATH": self.tmp.name, **settings})
+
+    def test_receivers_are_timed_during_the_run_and_restored_after_it(self):
+        before = receivers()
+        during = {}
+
+        def run(pelican):
+            during.update(receivers())
+            self.assertIsNot(Writer.write_file, original_write_file)
+            signals.finalized.send(pelican)
+            signals.finalized.send(pelican)
+            return "done"
+
+        original_write_file = Writer.write_file
+        pelican = self.pelican(BUILD_PROFILE=True)
+
+        self.assertEqual(_profiled_run(run)(pelican), "done")
+
+        self.assertEqual(receivers(), before)
+        self.assertNotEqual(during["finalized"], before["finalized"])
+        self.assertIs(Writer.write_file, original_write_file)
+        self.assertIsNone(build_profiler._active)
+        self.assertEqual(self.calls, [pelican, pelican])
+        report = json.loads((self.cache_dir / "build_profile.json").read_text(encoding="utf-8"))
+        handler = next(entry for entry in report["handlers"] if entry["handler"].endswith(".on_finalized"))
+        self.assertEqual((handler["signal"], handler["calls"]), ("finalized", 2))
+        self.assertEqual(len((self.cache_dir / "build_profile_history.jsonl").read_text().splitlines()), 1)
+
+    def test_receivers_are_restored_when_the_build_fails(self):
+        before = receivers()
+
+        def run(pelican):
+            signals.finalized.send(pelican)
+            raise RuntimeError("build failed")
+
+        with self.assertRaises(RuntimeError):
+            _profiled_run(run)(self.pelican(BUILD_PROFILE=True))
+
+        self.assertEqual(receivers(), before)
+        self.assertIsNone(build_profiler._active)
+        self.assertTrue((self.cache_dir / "build_profile.json").exists())
+
+    def test_builds_without_build_profile_are_not_touched(self):
+        before = receivers()
+
+        def run(pelican):
+            self.assertEqual(receivers(), before)
+            return "plain"
+
+        self.assertEqual(_profiled_run(run)(self.pelican()), "plain")
+        self.assertFalse(self.cache_dir.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
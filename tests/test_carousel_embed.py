@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pelican-plugins"))
+
+from carousel_embed.carousel_embed import DimensionCache  # noqa: E402
+
+
+def write_image(path: Path, size: tuple[int, int]) -> Path:
+    Image.new("RGB", size, "white").save(path)
+    return path
+
+
+class DimensionCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.cache_path = self.root / "cache" / "carousel_dimensions.json"
+
+    def test_sizes_are_reused_across_builds_until_the_file_changes(self):
+        first = write_image(self.root / "first.png", (40, 30))
+        second = write_image(self.root / "second.jpg", (10, 20))
+        cache = DimensionCache(self.cache_path)
+        self.assertEqual(cache.dimensions(first), (40, 30))
+        self.assertEqual(cache.dimensions(second), (10, 20))
+        self.assertEqual(cache.dimensions(first), (40, 30))
+        self.assertEqual(cache.probed, 2)
+        cache.save()
+
+        rebuilt = DimensionCache(self.cache_path)
+        self.assertEqual(rebuilt.dimensions(first), (40, 30))
+        self.assertEqual(rebuilt.probed, 0)
+
+        write_image(first, (300, 200))
+        stat = first.stat()
+        os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(rebuilt.dimensions(first), (300, 200))
+        self.assertEqual(rebuilt.probed, 1)
+
+    def test_save_drops_images_no_carousel_referenced(self):
+        kept = write_image(self.root / "kept.png", (4, 3))
+        dropped = write_image(self.root / "dropped.png", (5, 5))
+        cache = DimensionCache(self.cache_path)
+        cache.dimensions(kept)
+        cache.dimensions(dropped)
+        cache.save()
+
+        cache.dimensions(kept)
+        cache.save()
+
+        stored = json.loads(self.cache_path.read_text(encoding="utf-8"))["images"]
+        self.assertEqual(list(stored), [os.path.abspath(kept)])
+        self.assertEqual(cache.dimensions(self.root / "missing.png"), (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import io
 import json
+import tempfile
+import threading
 import unittest
 from contextlib import redirect_stdout
+from pathlib import Path
 
 from content_manager import cli
 
@@ -15,16 +18,25 @@ class CliTests(unittest.TestCase):
         original_workflow = cli.generate_article_from_sources
 
         class FakeGenerator:
-            def __init__(self, api_key: str, model: str):
+            def __init__(self, api_key: str, model: str, api_base: str, cache=None):
                 self.api_key = api_key
                 self.model = model
+                self.api_base = api_base
+                self.cache = cache
 
         class FakeResult:
             def to_dict(self):
                 return {"status": "ok", "location": "Kirkland"}
 
         try:
-            cli.load_config = lambda: type("Cfg", (), {"openai_api_key": "key", "openai_model": "model"})()
+            cli.load_config = lambda: type("Cfg", (), {
+                "openai_api_key": "key",
+                "openai_model": "model",
+                "openai_base_url": "http://127.0.0.1:9",
+                "cache_dir": Path(".cache"),
+                "generation_cache_ttl_hours": 1,
+                "generation_cache_max_mb": 1,
+            })()
             cli.ArticleGenerator = FakeGenerator
             cli.generate_article_from_sources = lambda **kwargs: FakeResult()
 
@@ -40,6 +52,84 @@ class CliTests(unittest.TestCase):
             cli.ArticleGenerator = original_generator
             cli.generate_article_from_sources = original_workflow
 
+    def test_generate_batch_shares_taxonomy_and_reports_failures(self):
+        original_load_config = cli.load_config
+        original_generator = cli.ArticleGenerator
+        original_workflow = cli.generate_article_from_sources
+        original_taxonomy = cli.load_site_taxonomy
+        taxonomy_loads = []
+        calls = []
+        calls_lock = threading.Lock()
+
+        class FakeGenerator:
+            def __init__(self, api_key: str, model: str, api_base: str, cache=None, request_fn=None):
+                self.request_fn = request_fn
+
+        class FakeResult:
+            def __init__(self, media_paths):
+                self.media_paths = media_paths
+
+            def to_dict(self):
+                return {"status": "ok", "source_media": self.media_paths}
+
+        def fake_workflow(**kwargs):
+            with calls_lock:
+                calls.append(kwargs)
+            if kwargs["media_paths"] == ["image/broken.jpg"]:
+                raise ValueError("media file not found: media/image/broken.jpg")
+            return FakeResult(kwargs["media_paths"])
+
+        try:
+            cli.load_config = lambda: type("Cfg", (), {
+                "openai_api_key": "key",
+                "openai_model": "model",
+                "openai_base_url": "http://127.0.0.1:9",
+                "cache_dir": Path(".cache"),
+                "articles_dir": Path("content/articles"),
+                "generation_cache_ttl_hours": 1,
+                "generation_cache_max_mb": 1,
+            })()
+            cli.ArticleGenerator = FakeGenerator
+            cli.generate_article_from_sources = fake_workflow
+            cli.load_site_taxonomy = lambda articles_dir, **_: taxonomy_loads.append(articles_dir) or "taxonomy"
+
+            with tempfile.TemporaryDirectory() as tmp:
+                manifest = Path(tmp) / "batch.jsonl"
+                manifest.write_text(
+                    "\n".join([
+                        json.dumps({"id": "one", "media_paths": ["video/one.mp4"], "tags": "A, B"}),
+                        json.dumps({"id": "two", "media_paths": ["image/broken.jpg"]}),
+                        "not json",
+                        "",
+                        json.dumps({"id": "three", "media_paths": ["video/three.mp4"], "force_regenerate": True}),
+                    ]),
+                    encoding="utf-8",
+                )
+                buffer = io.StringIO()
+                with redirect_stdout(buffer):
+                    exit_code = cli.main(["generate-batch", str(manifest), "--workers", "2"])
+
+            records = {record["id"]: record for record in map(json.loads, buffer.getvalue().splitlines())}
+
+            self.assertEqual(exit_code, 1)
+            self.assertEqual(len(taxonomy_loads), 1)
+            self.assertEqual(records["one"]["status"], "ok")
+            self.assertEqual(records["three"]["source_media"], ["video/three.mp4"])
+            self.assertEqual(records["two"]["status"], "error")
+            self.assertIn("broken.jpg", records["two"]["error"])
+            self.assertEqual(records["line-3"]["status"], "error")
+            self.assertEqual(len(calls), 3)
+            self.assertTrue(all(call["taxonomy"] == "taxonomy" for call in calls))
+            self.assertEqual(len({id(call["generator"]) for call in calls}), 1)
+            by_paths = {tuple(call["media_paths"]): call for call in calls}
+            self.assertEqual(by_paths[("video/one.mp4",)]["draft_tags"], ["A", "B"])
+            self.assertTrue(by_paths[("video/three.mp4",)]["force_regenerate"])
+        finally:
+            cli.load_config = original_load_config
+            cli.ArticleGenerator = original_generator
+            cli.generate_article_from_sources = original_workflow
+            cli.load_site_taxonomy = original_taxonomy
+
 
 if __name__ == "__main__":
     unittest.main()
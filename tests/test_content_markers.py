@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pelican-plugins"))
+
+from content_markers import content_markers  # noqa: E402
+from content_markers.content_markers import expand_markers, finish_build, register_marker_handler  # noqa: E402
+
+
+class ContentMarkersTests(unittest.TestCase):
+    def setUp(self):
+        saved = (dict(content_markers._handlers), dict(content_markers._handler_settings), dict(content_markers._memo))
+
+        def restore():
+            for registry, values in zip(
+                (content_markers._handlers, content_markers._handler_settings, content_markers._memo), saved
+            ):
+                registry.clear()
+                registry.update(values)
+
+        self.addCleanup(restore)
+        content_markers._handlers.clear()
+        content_markers._handler_settings.clear()
+        self.calls = []
+
+        def render_badge(spec, instance, position):
+            self.calls.append((spec, position))
+            if spec == "skip":
+                return None
+            color = instance.settings.get("BADGE_COLOR", "pink")
+            return f'<span class="badge {color}">{spec}#{position.index}</span>'
+
+        register_marker_handler("badge", render_badge, settings=("BADGE_COLOR",))
+
+    def instance(self, **settings):
+        return SimpleNamespace(settings=settings, source_path="content/articles/2026/03/post.md")
+
+    def test_markers_are_expanded_in_one_pass(self):
+        text = (
+            "<p>[[badge:one]]</p>\n"
+            "<p>Inline [[badge:two]], [[Badge:skip]] and [[unknown:x]].</p>\n"
+            "<p>[[badge:three]]</p>"
+        )
+
+        expanded = expand_markers(text, self.instance())
+
+        self.assertEqual(expanded, (
+            '<span class="badge pink">one#0</span>\n'
+            '<p>Inline <span class="badge pink">two#1</span>, [[Badge:skip]] and [[unknown:x]].</p>\n'
+            '<span class="badge pink">three#2</span>'
+        ))
+        self.assertEqual([spec for spec, _ in self.calls], ["one", "two", "skip", "three"])
+        self.assertEqual(self.calls[1][1].offset, text.index("[[badge:two]]"))
+
+    def test_memo_is_keyed_by_handler_settings_and_cleared_after_a_build(self):
+        text = "<p>See [[badge:memo]].</p>"
+
+        first = expand_markers(text, self.instance(BADGE_COLOR="pink", SITENAME="a"))
+        self.assertEqual(expand_markers(text, self.instance(BADGE_COLOR="pink", SITENAME="b")), first)
+        self.assertEqual(expand_markers(first, self.instance(BADGE_COLOR="pink")), first)
+        self.assertEqual(len(self.calls), 1)
+
+        recolored = expand_markers(text, self.instance(BADGE_COLOR="blue"))
+        self.assertIn('class="badge blue"', recolored)
+        self.assertEqual(len(self.calls), 2)
+
+        finish_build(None)
+        expand_markers(text, self.instance(BADGE_COLOR="pink"))
+        self.assertEqual(len(self.calls), 3)
+
+        # An explicit None is not the same as leaving the setting unset.
+        self.assertIn('class="badge pink"', expand_markers(text, self.instance()))
+        self.assertIn('class="badge None"', expand_markers(text, self.instance(BADGE_COLOR=None)))
+        self.assertEqual(len(self.calls), 5)
+
+    def test_registering_a_handler_invalidates_the_memo(self):
+        text = "<p>[[badge:again]]</p>"
+        expand_markers(text, self.instance())
+
+        register_marker_handler("badge", lambda spec, instance, position: f"<b>{spec}</b>")
+
+        self.assertEqual(expand_markers(text, self.instance()), "<b>again</b>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from content_manager.services.article_generation import ArticleGenerator, GenerationRequest
+from content_manager.services.generation_cache import GenerationCache
+
+
+def make_request(image_path: Path, **overrides) -> GenerationRequest:
+    values = {
+        "media_context": [{
+            "name": "sample",
+            "media_type": "image",
+            "location_name": "Seattle, Washington, United States",
+            "captured_at": "2026-03-17T19:00:00",
+            "time_of_day": "evening",
+            "model_input_paths": [image_path],
+        }],
+        "canonical_job": {
+            "location_name": "Seattle, Washington, United States",
+            "captured_at": "2026-03-17T19:00:00",
+            "time_of_day": "evening",
+        },
+        "warnings": [],
+        "allowed_categories": ["Self"],
+        "allowed_tags": ["Tag A"],
+        "likely_named_locations": [],
+    }
+    values.update(overrides)
+    return GenerationRequest(**values)
+
+
+class GenerationCacheTests(unittest.TestCase):
+    def test_entries_expire_after_ttl(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            now = [1000.0]
+            cache = GenerationCache(Path(tmp), ttl_seconds=60, clock=lambda: now[0])
+            cache.put("abc123", {"summary": "cached"})
+
+            self.assertEqual(cache.get("abc123"), {"summary": "cached"})
+            now[0] += 61
+            self.assertIsNone(cache.get("abc123"))
+
+    def test_size_eviction_drops_oldest_entries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = GenerationCache(Path(tmp), max_bytes=150)
+            cache.put("aa-old", {"summary": "x" * 60})
+            old_path = Path(tmp) / "aa" / "aa-old.json"
+            past = time.time() - 100
+            os.utime(old_path, (past, past))
+            cache.put("bb-new", {"summary": "y" * 60})
+
+            self.assertIsNone(cache.get("aa-old"))
+            self.assertIsNotNone(cache.get("bb-new"))
+
+    def test_concurrent_identical_requests_share_one_call(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = GenerationCache(Path(tmp))
+            calls = []
+            release = threading.Event()
+
+            def compute():
+                calls.append(1)
+                release.wait(2)
+                return {"summary": "fresh"}
+
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(cache.get_or_compute("samekey", compute)))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.05)
+            release.set()
+            for thread in threads:
+                thread.join(2)
+
+            self.assertEqual(len(calls), 1)
+            self.assertEqual([result for result, _ in results], [{"summary": "fresh"}] * 4)
+            self.assertEqual(sorted(hit for _, hit in results), [False, True, True, True])
+
+    def test_generator_reuses_cached_result_unless_forced(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            image_path = Path(tmp) / "sample.jpg"
+            image_path.write_bytes(b"fake-image")
+            calls = []
+            json_module = json
+
+            def fake_request(url, headers, json, timeout):
+                calls.append(json)
+                return type("Response", (), {
+                    "raise_for_status": lambda self: None,
+                    "json": lambda self: {"output_text": json_module.dumps({
+                        "title_ideas": ["One", "Two", "Three"],
+                        "summary": f"Summary {len(calls)}",
+                        "category": "Self",
+                        "tags": ["Tag A"],
+                        "content_markdown": "Body",
+                    })},
+                })()
+
+            generator = ArticleGenerator(
+                api_key="test-key",
+                model="test-model",
+                request_fn=fake_request,
+                cache=GenerationCache(Path(tmp) / "cache"),
+            )
+
+            first = generator.generate(make_request(image_path))
+            second = generator.generate(make_request(image_path))
+            forced = generator.generate(make_request(image_path, force_regenerate=True))
+            image_path.write_bytes(b"different-image")
+            changed = generator.generate(make_request(image_path))
+
+            self.assertEqual(len(calls), 3)
+            self.assertFalse(first["cached"])
+            self.assertTrue(second["cached"])
+            self.assertEqual(second["summary"], "Summary 1")
+            self.assertEqual(forced["summary"], "Summary 2")
+            self.assertEqual(changed["summary"], "Summary 3")
+
+    def test_identical_streams_share_one_request(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            image_path = Path(tmp) / "sample.jpg"
+            image_path.write_bytes(b"fake-image")
+            output_text = json.dumps({
+                "title_ideas": ["One", "Two", "Three"],
+                "summary": "Streamed",
+                "category": "Self",
+                "tags": ["Tag A"],
+                "content_markdown": "Body",
+            })
+            calls = []
+            release = threading.Event()
+
+            class StreamResponse:
+                def raise_for_status(self):
+                    return None
+
+                def iter_lines(self, decode_unicode=False):
+                    release.wait(2)
+                    yield "data: " + json.dumps({"type": "response.output_text.delta", "delta": output_text})
+                    yield ""
+
+                def close(self):
+                    return None
+
+            def fake_request(url, headers, json, timeout, stream):
+                calls.append(1)
+                return StreamResponse()
+
+            generator = ArticleGenerator(
+                api_key="test-key",
+                model="test-model",
+                request_fn=fake_request,
+                cache=GenerationCache(Path(tmp) / "cache"),
+            )
+            streams = []
+            threads = [
+                threading.Thread(target=lambda: streams.append(list(generator.generate_stream(make_request(image_path)))))
+                for _ in range(3)
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.05)
+            release.set()
+            for thread in threads:
+                thread.join(2)
+
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(sorted(len(events) for events in streams), [1, 1, 2])
+            results = [events[-1]["result"] for events in streams]
+            self.assertEqual({result["summary"] for result in results}, {"Streamed"})
+            self.assertEqual(sorted(result["cached"] for result in results), [False, True, True])
+
+    def test_abandoned_stream_releases_its_in_flight_slot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = GenerationCache(Path(tmp))
+            _, inflight = cache.join_or_lead("samekey")
+            waiter_errors = []
+
+            def wait():
+                try:
+                    cache.get_or_compute("samekey", lambda: {"summary": "unused"})
+                except RuntimeError as err:
+                    waiter_errors.append(str(err))
+
+            waiter = threading.Thread(target=wait)
+            waiter.start()
+            time.sleep(0.05)
+            cache.finish("samekey", inflight, error=RuntimeError("generation stream was closed before it completed"))
+            waiter.join(2)
+
+            self.assertEqual(waiter_errors, ["generation stream was closed before it completed"])
+            self.assertEqual(cache.get_or_compute("samekey", lambda: {"summary": "fresh"}), ({"summary": "fresh"}, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
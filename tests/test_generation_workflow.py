@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import tempfile
 import unittest
+from dataclasses import replace
 from pathlib import Path
 
 from content_manager.config import AppConfig
@@ -33,6 +34,7 @@ class GenerationWorkflowTests(unittest.TestCase):
             images_dir=repo_root / "content" / "media" / "images",
             video_dir=repo_root / "content" / "media" / "video",
             articles_dir=repo_root / "content" / "articles",
+            cache_dir=repo_root / ".cache",
             output_format="m4a",
             clip_id_pattern=__import__("re").compile(r"(\d{2}-\d{2})"),
             auto_commit=False,
@@ -40,6 +42,11 @@ class GenerationWorkflowTests(unittest.TestCase):
             git_branch="main",
             openai_api_key="test-key",
             openai_model="test-model",
+            openai_base_url="https://api.openai.com/v1",
+            generation_cache_ttl_hours=168,
+            generation_cache_max_mb=64,
+            generation_max_request_mb=20,
+            generation_max_input_tokens=30000,
             geocoder_user_agent="test-agent",
             max_upload_mb=200,
             max_dimension=1080,
@@ -108,6 +115,51 @@ class GenerationWorkflowTests(unittest.TestCase):
             self.assertIn("Pole Dance", generator.last_request.allowed_categories)
             self.assertIn("Trinity Pole Studio", result.likely_named_locations)
 
+    def test_generate_warns_when_draft_closely_matches_existing_article(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo_root = Path(tmp)
+            image_path = repo_root / "content" / "media" / "images" / "sample.jpg"
+            image_path.parent.mkdir(parents=True, exist_ok=True)
+            image_path.write_bytes(b"fake-image")
+            body = "Spent the whole evening drilling the same spin combo until the transitions finally felt smooth and controlled."
+            article_dir = repo_root / "content" / "articles" / "2026" / "03"
+            article_dir.mkdir(parents=True, exist_ok=True)
+            (article_dir / "spin-combo.md").write_text(
+                f"Title: Spin Combo\nDate: 2026-03-01\nSummary: Spin combo night\nCategory: Pole Dance\n\n{body}\n",
+                encoding="utf-8",
+            )
+            generator = FakeGenerator()
+            generator.generate = lambda request: {
+                "title_ideas": ["One", "Two", "Three"],
+                "summary": "Something else entirely",
+                "category": "Pole Dance",
+                "tags": [],
+                "content_markdown": body.replace("controlled", "relaxed"),
+            }
+
+            from content_manager.services import generation_workflow as workflow
+
+            original_extract = workflow.extract_media_metadata
+            workflow.extract_media_metadata = lambda *args, **kwargs: {
+                "captured_at": "2026-03-17T19:00:00",
+                "time_of_day": "night",
+                "location_name": "Seattle, Washington, United States",
+                "metadata_warnings": [],
+                "metadata_status": "ready",
+            }
+            try:
+                result = generate_article_from_sources(
+                    config=self.make_config(repo_root),
+                    generator=generator,
+                    media_paths=["images/sample.jpg"],
+                )
+            finally:
+                workflow.extract_media_metadata = original_extract
+
+            self.assertEqual([match.path for match in result.near_duplicates], ["2026/03/spin-combo.md"])
+            self.assertTrue(any("2026/03/spin-combo.md" in warning for warning in result.warnings))
+            self.assertEqual(result.to_dict()["near_duplicates"][0]["field"], "content")
+
     def test_generate_marks_home_when_gps_is_near_home(self):
         with tempfile.TemporaryDirectory() as tmp:
             repo_root = Path(tmp)
@@ -209,6 +261,54 @@ class GenerationWorkflowTests(unittest.TestCase):
             for frame_path in generator.last_request.media_context[0]["model_input_paths"]:
                 self.assertNotIn(str(repo_root), str(frame_path))
 
+    def test_generate_trims_sampled_frames_to_fit_request_budget(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo_root = Path(tmp)
+            video_path = repo_root / "content" / "media" / "video" / "sample.mp4"
+            video_path.parent.mkdir(parents=True, exist_ok=True)
+            video_path.write_bytes(b"video")
+
+            # Unreadable frames are costed as 765-token images, so this budget fits two of four.
+            config = replace(self.make_config(repo_root), generation_max_input_tokens=2200)
+            generator = FakeGenerator()
+
+            from content_manager.services import generation_workflow as workflow
+
+            original_extract = workflow.extract_media_metadata
+            original_probe = workflow.ffprobe_json
+            original_run = workflow.subprocess.run
+
+            workflow.extract_media_metadata = lambda *args, **kwargs: {
+                "captured_at": "2026-03-17T19:00:00",
+                "time_of_day": "night",
+                "location_name": "Seattle, Washington, United States",
+                "metadata_warnings": [],
+                "metadata_status": "ready",
+            }
+            workflow.ffprobe_json = lambda path: {"format": {"duration": "12.0"}}
+
+            def fake_run(command, capture_output, text, check):
+                output_path = Path(command[-1])
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                output_path.write_bytes(b"frame")
+                return type("Result", (), {"stdout": "", "stderr": ""})()
+
+            workflow.subprocess.run = fake_run
+            try:
+                result = generate_article_from_sources(
+                    config=config,
+                    generator=generator,
+                    media_paths=["video/sample.mp4"],
+                )
+            finally:
+                workflow.extract_media_metadata = original_extract
+                workflow.ffprobe_json = original_probe
+                workflow.subprocess.run = original_run
+
+            frame_names = [path.name for path in generator.last_request.media_context[0]["model_input_paths"]]
+            self.assertEqual(frame_names, ["frame-01.jpg", "frame-04.jpg"])
+            self.assertIn("Reduced sampled video frames to fit the request budget (sample: 4 → 2).", result.warnings)
+
     def test_generate_from_uploaded_video_uses_output_path_for_sampled_frames(self):
         with tempfile.TemporaryDirectory() as tmp:
             repo_root = Path(tmp)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from content_manager.services.http_transport import PooledTransport, parse_retry_after
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict | None = None, request_headers: dict | None = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.request = SimpleNamespace(headers=request_headers or {})
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, outcomes: list):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def post(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class PooledTransportTests(unittest.TestCase):
+    def make_transport(self, outcomes: list, **kwargs) -> tuple[PooledTransport, FakeSession, list[float]]:
+        session = FakeSession(outcomes)
+        sleeps: list[float] = []
+        transport = PooledTransport(
+            session=session,
+            sleep=sleeps.append,
+            jitter=lambda low, high: high,
+            **kwargs,
+        )
+        return transport, session, sleeps
+
+    def test_retries_retryable_status_with_exponential_backoff(self):
+        transport, session, sleeps = self.make_transport(
+            [FakeResponse(503), FakeResponse(502), FakeResponse(200)],
+            backoff_base_seconds=0.5,
+        )
+
+        response = transport("http://stub/v1/responses", json={"a": 1}, timeout=5)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(session.calls), 3)
+        self.assertEqual(sleeps, [0.5, 1.0])
+        timing = transport.last_timing()
+        self.assertEqual(timing.attempts, 3)
+        self.assertEqual(timing.status_code, 200)
+        self.assertEqual(timing.backoff_seconds, 1.5)
+
+    def test_honors_retry_after_header(self):
+        transport, _, sleeps = self.make_transport([FakeResponse(429, {"Retry-After": "2"}), FakeResponse(200)])
+
+        transport("http://stub/v1/responses", json={}, timeout=5)
+
+        self.assertEqual(sleeps, [2.0])
+
+    def test_returns_last_response_when_retries_are_exhausted(self):
+        transport, session, sleeps = self.make_transport(
+            [FakeResponse(500), FakeResponse(500)],
+            max_retries=1,
+        )
+
+        response = transport("http://stub/v1/responses", json={}, timeout=5)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(len(session.calls), 2)
+        self.assertEqual(len(sleeps), 1)
+
+    def test_does_not_retry_client_errors(self):
+        transport, session, sleeps = self.make_transport([FakeResponse(400)])
+
+        response = transport("http://stub/v1/responses", json={}, timeout=5)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(session.calls), 1)
+        self.assertEqual(sleeps, [])
+
+    def test_reraises_connect_failures_after_retries(self):
+        transport, session, _ = self.make_transport(
+            [requests.ConnectTimeout("connect timed out"), requests.ConnectTimeout("connect timed out")],
+            max_retries=1,
+        )
+
+        with self.assertRaises(requests.ConnectionError):
+            transport("http://stub/v1/responses", json={}, timeout=5)
+
+        self.assertEqual(len(session.calls), 2)
+        self.assertEqual(transport.last_timing().error, "connect timed out")
+
+    def test_retries_refused_connections(self):
+        refused = NewConnectionError(None, "Connection refused")
+        transport, session, _ = self.make_transport(
+            [requests.ConnectionError(MaxRetryError(None, "/v1/responses", refused)), FakeResponse(200)],
+        )
+
+        response = transport("http://stub/v1/responses", json={}, timeout=5)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(session.calls), 2)
+
+    def test_does_not_retry_connection_errors_after_the_body_was_sent(self):
+        transport, session, sleeps = self.make_transport([requests.ConnectionError("connection reset by peer")])
+
+        with self.assertRaises(requests.ConnectionError):
+            transport("http://stub/v1/responses", json={}, timeout=5)
+
+        self.assertEqual(len(session.calls), 1)
+        self.assertEqual(sleeps, [])
+
+    def test_does_not_retry_read_timeouts(self):
+        transport, session, sleeps = self.make_transport([requests.ReadTimeout("read timed out")])
+
+        with self.assertRaises(requests.ReadTimeout):
+            transport("http://stub/v1/responses", json={}, timeout=5)
+
+        self.assertEqual(len(session.calls), 1)
+        self.assertEqual(sleeps, [])
+        self.assertEqual(transport.last_timing().error, "read timed out")
+
+    def test_does_not_retry_conflicts(self):
+        transport, session, _ = self.make_transport([FakeResponse(409)])
+
+        response = transport("http://stub/v1/responses", json={}, timeout=5)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(len(session.calls), 1)
+
+    def test_records_body_size_from_the_sent_request(self):
+        transport, _, _ = self.make_transport([FakeResponse(200, request_headers={"Content-Length": "1234"})])
+
+        transport("http://stub/v1/responses", json={"input": "héllo"}, timeout=5)
+
+        self.assertEqual(transport.last_timing().request_bytes, 1234)
+
+    def test_failed_requests_record_sized_bodies_without_iterating_them(self):
+        class SizedBody:
+            def __len__(self):
+                return 4096
+
+            def __iter__(self):
+                raise AssertionError("the body was iterated to measure it")
+
+        transport, _, _ = self.make_transport([requests.ReadTimeout("read timed out")])
+
+        with self.assertRaises(requests.ReadTimeout):
+            transport("http://stub/v1/responses", data=SizedBody(), timeout=5)
+
+        self.assertEqual(transport.last_timing().request_bytes, 4096)
+
+    def test_failed_json_requests_are_not_re_encoded_to_measure_them(self):
+        class LargePayload(dict):
+            def items(self):
+                raise AssertionError("the payload was serialized to measure it")
+
+        transport, _, _ = self.make_transport([requests.ReadTimeout("read timed out")])
+
+        with self.assertRaises(requests.ReadTimeout):
+            transport("http://stub/v1/responses", json=LargePayload(input="x"), timeout=5)
+
+        self.assertIsNone(transport.last_timing().request_bytes)
+
+    def test_parse_retry_after_accepts_http_dates(self):
+        now = datetime(2026, 3, 17, 19, 0, 0, tzinfo=timezone.utc)
+
+        self.assertEqual(parse_retry_after("Tue, 17 Mar 2026 19:00:30 GMT", now=now), 30.0)
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+if __name__ == "__main__":
+    unittest.main()
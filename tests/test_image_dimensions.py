@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pelican-plugins"))
+
+from carousel_embed.image_dimensions import image_dimensions  # noqa: E402
+
+
+def jpeg(width: int, height: int, orientation: int | None = None, byte_order: bytes = b"II") -> bytes:
+    data = b"\xff\xd8"
+    data += b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    if orientation is not None:
+        order = "<" if byte_order == b"II" else ">"
+        tiff = byte_order + struct.pack(order + "HI", 42, 8)
+        tiff += struct.pack(order + "H", 1) + struct.pack(order + "HHIHH", 0x0112, 3, 1, orientation, 0)
+        tiff += struct.pack(order + "I", 0)
+        exif = b"Exif\x00\x00" + tiff
+        data += b"\xff\xe1" + struct.pack(">H", len(exif) + 2) + exif
+    data += b"\xff\xc0" + struct.pack(">HBHHB", 17, 8, height, width, 3) + b"\x01\x22\x00\x02\x11\x01\x03\x11\x01"
+    return data + b"\xff\xda\x00\x0c" + b"\x00" * 10 + b"\xff\xd9"
+
+
+def riff(chunk: bytes, payload: bytes) -> bytes:
+    body = b"WEBP" + chunk + struct.pack("<I", len(payload)) + payload
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def webp_vp8(width: int, height: int) -> bytes:
+    # Frame tag of a key frame, start code, then 14-bit sizes with 2-bit scale in the top bits.
+    payload = b"\x10\x02\x00" + b"\x9d\x01\x2a" + struct.pack("<HH", width | 0x4000, height | 0x8000)
+    return riff(b"VP8 ", payload + b"\x00" * 16)
+
+
+def webp_vp8l(width: int, height: int) -> bytes:
+    bits = (width - 1) | (height - 1) << 14 | 1 << 28  # alpha hint, version 0
+    return riff(b"VP8L", b"\x2f" + struct.pack("<I", bits) + b"\x00" * 16)
+
+
+def webp_vp8x(width: int, height: int) -> bytes:
+    payload = b"\x10\x00\x00\x00" + (width - 1).to_bytes(3, "little") + (height - 1).to_bytes(3, "little")
+    return riff(b"VP8X", payload) + riff(b"VP8 ", b"\x00" * 10)[12:]
+
+
+def box(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload) + 8) + kind + payload
+
+
+def full_box(kind: bytes, payload: bytes, version: int = 0, flags: int = 0) -> bytes:
+    return box(kind, struct.pack(">I", version << 24 | flags) + payload)
+
+
+def avif(width: int, height: int, rotation: int | None = None, rotated_item: int = 1) -> bytes:
+    properties = [full_box(b"ispe", struct.pack(">II", width, height))]
+    associations = {1: [1]}
+    if rotation is not None:
+        properties.append(box(b"irot", bytes([rotation])))
+        associations.setdefault(rotated_item, []).append(2)
+    ipma = struct.pack(">I", len(associations))
+    for item_id, indices in sorted(associations.items()):
+        ipma += struct.pack(">HB", item_id, len(indices)) + bytes(0x80 | index for index in indices)
+    meta = full_box(b"meta", b"".join([
+        full_box(b"hdlr", b"\x00" * 4 + b"pict" + b"\x00" * 13),
+        full_box(b"pitm", struct.pack(">H", 1)),
+        box(b"iprp", box(b"ipco", b"".join(properties)) + full_box(b"ipma", ipma)),
+    ]))
+    ftyp = box(b"ftyp", b"avif" + b"\x00" * 4 + b"avifmif1miaf")
+    return ftyp + meta + box(b"mdat", b"\x00" * 32)
+
+
+class ImageDimensionsTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def dimensions(self, data: bytes, name: str = "image"):
+        path = Path(self.tmp.name) / name
+        path.write_bytes(data)
+        return image_dimensions(path)
+
+    def test_jpeg_frame_size_and_exif_orientation(self):
+        self.assertEqual(self.dimensions(jpeg(400, 300)), (400, 300))
+        self.assertEqual(self.dimensions(jpeg(400, 300, orientation=3)), (400, 300))
+        self.assertEqual(self.dimensions(jpeg(400, 300, orientation=6)), (300, 400))
+        self.assertEqual(self.dimensions(jpeg(400, 300, orientation=8, byte_order=b"MM")), (300, 400))
+
+    def test_png_header(self):
+        ihdr = box(b"IHDR", struct.pack(">IIBBBBB", 1920, 1080, 8, 2, 0, 0, 0) + b"\x00" * 4)
+        self.assertEqual(self.dimensions(b"\x89PNG\r\n\x1a\n" + ihdr), (1920, 1080))
+
+    def test_webp_variants(self):
+        self.assertEqual(self.dimensions(webp_vp8(640, 480)), (640, 480))
+        self.assertEqual(self.dimensions(webp_vp8l(1000, 16384)), (1000, 16384))
+        self.assertEqual(self.dimensions(webp_vp8x(4000, 3000)), (4000, 3000))
+
+    def test_avif_primary_item_size_and_rotation(self):
+        self.assertEqual(self.dimensions(avif(1200, 800)), (1200, 800))
+        self.assertEqual(self.dimensions(avif(1200, 800, rotation=1)), (800, 1200))
+        self.assertEqual(self.dimensions(avif(1200, 800, rotation=2)), (1200, 800))
+        self.assertEqual(self.dimensions(avif(1200, 800, rotation=3)), (800, 1200))
+        # A rotation associated with another item does not apply to the primary one.
+        self.assertEqual(self.dimensions(avif(1200, 800, rotation=1, rotated_item=2)), (1200, 800))
+
+    def test_empty_truncated_or_unknown_input_returns_none(self):
+        samples = {
+            "empty": b"",
+            "unknown": b"GIF89a" + b"\x00" * 32,
+            "jpeg": jpeg(400, 300, orientation=6)[:40],
+            "png": b"\x89PNG\r\n\x1a\n\x00\x00\x00\x0dIHDR\x00\x00",
+            "vp8": webp_vp8(640, 480)[:28],
+            "vp8l": webp_vp8l(1000, 800)[:22],
+            "vp8x": webp_vp8x(4000, 3000)[:26],
+            "avif": avif(1200, 800, rotation=1)[:70],
+        }
+        for name, data in samples.items():
+            with self.subTest(name):
+                self.assertIsNone(self.dimensions(data, name))
+        self.assertIsNone(image_dimensions(Path(self.tmp.name) / "missing.jpg"))
+
+
+if __name__ == "__main__":
+    unittest.main()
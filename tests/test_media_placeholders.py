@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import base64
+import io
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pelican-plugins"))
+
+from media_placeholders.media_placeholders import PlaceholderCache, compute_placeholder  # noqa: E402
+
+PREFIX = "data:image/webp;base64,"
+
+
+def decode(uri: str) -> Image.Image:
+    image = Image.open(io.BytesIO(base64.b64decode(uri[len(PREFIX):])))
+    image.load()
+    return image
+
+
+class PlaceholderTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.cache_path = self.root / "cache" / "media_placeholders.json"
+
+    def write_image(self, name, size, mode="RGB", color="teal"):
+        path = self.root / name
+        Image.new(mode, size, color).save(path)
+        return path
+
+    def test_placeholder_is_a_tiny_webp_with_the_source_aspect_ratio(self):
+        uri = compute_placeholder(self.write_image("wide.jpg", (1200, 600)))
+
+        self.assertTrue(uri.startswith(PREFIX))
+        self.assertLess(len(uri), 400)
+        image = decode(uri)
+        self.assertEqual((image.format, image.size), ("WEBP", (16, 8)))
+        self.assertEqual(decode(compute_placeholder(self.root / "wide.jpg", size=8)).size, (8, 4))
+
+    def test_transparent_or_unreadable_images_get_no_placeholder(self):
+        self.assertIsNone(compute_placeholder(self.write_image("alpha.png", (64, 64), "RGBA", (0, 0, 0, 0))))
+        self.assertIsNotNone(compute_placeholder(self.write_image("opaque.png", (64, 64), "RGB")))
+        broken = self.root / "broken.jpg"
+        broken.write_bytes(b"version https://git-lfs.github.com/spec/v1\n")
+        self.assertIsNone(compute_placeholder(broken))
+        self.assertIsNone(compute_placeholder(self.root / "missing.jpg"))
+
+    def test_cache_reuses_placeholders_by_content_and_drops_unused_files(self):
+        first = self.write_image("first.jpg", (200, 100))
+        copy = shutil.copyfile(first, self.root / "copy.jpg")
+        other = self.write_image("other.jpg", (100, 200), color="orange")
+        cache = PlaceholderCache(self.cache_path, 16, 40)
+        self.assertEqual(cache.placeholder(copy), cache.placeholder(first))
+        cache.placeholder(other)
+        self.assertEqual(cache.computed, 2)
+        cache.save()
+
+        rebuilt = PlaceholderCache(self.cache_path, 16, 40)
+        self.assertIsNotNone(rebuilt.placeholder(first))
+        self.assertEqual(rebuilt.computed, 0)
+        rebuilt.save()
+        stored = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        self.assertEqual(len(stored["sources"]), 1)
+        self.assertEqual(len(stored["placeholders"]), 1)
+
+        resized = PlaceholderCache(self.cache_path, 8, 40)
+        self.assertEqual(decode(resized.placeholder(first)).size, (8, 4))
+        self.assertEqual(resized.computed, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
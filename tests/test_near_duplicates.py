@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from content_manager.config import load_config
+from content_manager.services import article_authoring
+from content_manager.services.near_duplicates import MinHasher, MinHashLSH, near_duplicate_index, text_shingles
+from content_manager.state import AppState
+
+ORIGINAL = (
+    "We went back to the studio after a long break and spent most of the class working on the "
+    "shoulder mount. My grip kept slipping so the instructor suggested chalk and a slower entry. "
+    "By the end of the session the climb felt steady and I even held the invert for a few breaths."
+)
+
+
+def write_article(articles_dir: Path, name: str, summary: str, body: str) -> None:
+    path = articles_dir / "2026" / "03" / f"{name}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"Title: {name}\nDate: 2026-03-05\nSummary: {summary}\nCategory: Self\n\n{body}\n", encoding="utf-8")
+
+
+class MinHashLSHTests(unittest.TestCase):
+    def test_similar_texts_share_a_bucket_and_unrelated_ones_do_not(self):
+        hasher = MinHasher()
+        lsh = MinHashLSH()
+        lsh.add("original", hasher.signature(text_shingles(ORIGINAL, 5)))
+        lsh.add("other", hasher.signature(text_shingles("Pinball league night with a new high score on the crow machine.", 5)))
+
+        edited = ORIGINAL.replace("a few breaths", "three whole seconds")
+        matches = lsh.query(hasher.signature(text_shingles(edited, 5)), 0.5)
+
+        self.assertEqual([key for key, _ in matches], ["original"])
+        self.assertGreater(matches[0][1], 0.7)
+        lsh.remove("original")
+        self.assertEqual(lsh.query(hasher.signature(text_shingles(edited, 5)), 0.5), [])
+
+    def test_media_markers_are_ignored(self):
+        self.assertEqual(text_shingles("[[video:clip-one]] ![x](/media/a.avif)", 5), set())
+
+
+class PublishNearDuplicateTests(unittest.TestCase):
+    def test_publish_warns_with_matching_article_paths(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo_root = Path(tmp)
+            config = replace(
+                load_config(),
+                repo_root=repo_root,
+                articles_dir=repo_root / "content" / "articles",
+                cache_dir=repo_root / ".cache",
+                auto_commit=False,
+            )
+            write_article(config.articles_dir, "mount", "Shoulder mount practice", ORIGINAL)
+            write_article(config.articles_dir, "pinball", "League night", "Pinball league night with a new high score.")
+            command = article_authoring.validate_publish_request({
+                "title": "Mount again",
+                "summary": "Shoulder mount practice",
+                "content": ORIGINAL.replace("chalk", "grip aid"),
+            })
+
+            result = article_authoring.publish_article(config, AppState(), command, lambda *args: None)
+
+            self.assertEqual(
+                [(match["path"], match["field"]) for match in result["near_duplicates"]],
+                [("2026/03/mount.md", "content"), ("2026/03/mount.md", "summary")],
+            )
+            self.assertIn("2026/03/mount.md", result["warnings"][0])
+            # The published article is indexed for later checks.
+            later = near_duplicate_index(config.articles_dir).find(content=ORIGINAL)
+            self.assertEqual(len(later), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+from content_manager.services.article_generation import GenerationRequest
+from content_manager.services.payload_budget import (
+    PayloadBudget,
+    estimate_request,
+    fit_request_to_budget,
+    image_tokens,
+)
+
+
+def noise_image(path: Path, width: int, height: int) -> Path:
+    Image.frombytes("RGB", (width, height), os.urandom(width * height * 3)).save(path, "JPEG", quality=90)
+    return path
+
+
+def make_request(media_context: list[dict], related_articles: list[dict] | None = None) -> GenerationRequest:
+    return GenerationRequest(
+        media_context=media_context,
+        canonical_job={"location_name": "Seattle", "captured_at": "2026-03-17T19:00:00", "time_of_day": "evening"},
+        warnings=[],
+        allowed_categories=["Self"],
+        allowed_tags=[],
+        likely_named_locations=[],
+        related_articles=related_articles,
+    )
+
+
+class PayloadBudgetTests(unittest.TestCase):
+    def test_image_tokens_follow_tile_rules(self):
+        self.assertEqual(image_tokens(1024, 1024), 765)
+        self.assertEqual(image_tokens(4096, 2048), 1105)
+        self.assertEqual(image_tokens(256, 256), 255)
+
+    def test_request_within_budget_is_untouched(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            image = noise_image(Path(tmp) / "small.jpg", 64, 64)
+            request = make_request([{"name": "small", "media_type": "image", "model_input_paths": [image]}])
+
+            trimmed, warnings, temp_dir = fit_request_to_budget(request, PayloadBudget(max_bytes=10**7, max_tokens=10**5))
+
+            self.assertIs(trimmed, request)
+            self.assertEqual(warnings, [])
+            self.assertIsNone(temp_dir)
+
+    def test_video_frames_are_trimmed_before_images_are_downscaled(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = noise_image(Path(tmp) / "frame-0.jpg", 200, 200)
+            frames = [first]
+            for index in range(1, 5):
+                # Identical bytes keep every frame the same estimated size.
+                frames.append(Path(tmp) / f"frame-{index}.jpg")
+                frames[-1].write_bytes(first.read_bytes())
+            request = make_request([{"name": "clip", "media_type": "video", "model_input_paths": frames}])
+            one_frame = estimate_request(make_request([{"name": "clip", "media_type": "video", "model_input_paths": frames[:1]}]))
+            frame_bytes = estimate_request(request).parts[-1].bytes
+
+            trimmed, warnings, temp_dir = fit_request_to_budget(
+                request,
+                PayloadBudget(max_bytes=one_frame.total_bytes + 2 * frame_bytes + 100, max_tokens=0),
+            )
+
+            self.assertIsNone(temp_dir)
+            self.assertEqual(trimmed.media_context[0]["model_input_paths"], [frames[0], frames[2], frames[4]])
+            self.assertEqual(request.media_context[0]["model_input_paths"], frames)
+            self.assertEqual(warnings, ["Reduced sampled video frames to fit the request budget (clip: 5 → 3)."])
+
+    def test_images_are_downscaled_when_frames_cannot_be_cut(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            image = noise_image(Path(tmp) / "large.jpg", 2400, 1200)
+            request = make_request([{"name": "large", "media_type": "image", "model_input_paths": [image]}])
+
+            trimmed, warnings, temp_dir = fit_request_to_budget(request, PayloadBudget(max_bytes=600_000, max_tokens=0))
+            try:
+                resized = trimmed.media_context[0]["model_input_paths"][0]
+                with Image.open(resized) as opened:
+                    self.assertLessEqual(max(opened.size), 1024)
+                self.assertLessEqual(estimate_request(trimmed).total_bytes, 600_000)
+                self.assertRegex(warnings[0], r"^Downscaled images to \d+px")
+                self.assertTrue(image.exists())
+            finally:
+                temp_dir.cleanup()
+
+    def test_related_excerpts_are_shortened_then_dropped(self):
+        related = [{"title": f"Post {index}", "excerpt": "word " * 200} for index in range(3)]
+        request = make_request([], related_articles=related)
+        baseline = estimate_request(make_request([]))
+
+        trimmed, warnings, temp_dir = fit_request_to_budget(
+            request,
+            PayloadBudget(max_bytes=0, max_tokens=baseline.total_tokens + 70),
+        )
+
+        self.assertIsNone(temp_dir)
+        self.assertEqual(len(trimmed.related_articles), 1)
+        self.assertLessEqual(len(trimmed.related_articles[0]["excerpt"]), 123)
+        self.assertEqual(len(related[0]["excerpt"]), 1000)
+        self.assertEqual(warnings, [
+            "Shortened related-post excerpts to fit the request budget.",
+            "Dropped 2 related post(s) to fit the request budget.",
+        ])
+
+    def test_short_excerpts_are_not_reported_as_shortened(self):
+        related = [{"title": f"Post {index}", "excerpt": "short excerpt"} for index in range(3)]
+        request = make_request([], related_articles=related)
+        baseline = estimate_request(make_request([]))
+
+        trimmed, warnings, _ = fit_request_to_budget(
+            request,
+            PayloadBudget(max_bytes=0, max_tokens=baseline.total_tokens + 10),
+        )
+
+        self.assertTrue(all(article["excerpt"] == "short excerpt" for article in trimmed.related_articles or []))
+        self.assertNotIn("Shortened related-post excerpts to fit the request budget.", warnings)
+        self.assertTrue(any(warning.startswith("Dropped ") for warning in warnings))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from content_manager.services.article_corpus import ArticleRecord, shared_corpus_index
+from content_manager.services.related_articles import RelatedArticleIndex, related_article_index
+
+
+def record(path: str, *, title: str, category: str = "Self", tags: list[str] | None = None, body: str = "", date: str = "2026-01-01") -> ArticleRecord:
+    return ArticleRecord(
+        source=Path(path),
+        path=path,
+        mtime_ns=0,
+        size=0,
+        title=title,
+        summary="",
+        category=category,
+        tags=tags or [],
+        date=datetime.strptime(date, "%Y-%m-%d"),
+        body=body,
+        excerpt=body[:40],
+    )
+
+
+class RelatedArticleIndexTests(unittest.TestCase):
+    def test_boosts_outrank_wording_and_bm25_orders_ties(self):
+        index = RelatedArticleIndex([
+            record("a.md", title="Spin practice", category="Pole Dance", body="spin spin climb notes"),
+            record("b.md", title="Climb day", category="Pole Dance", body="climb notes and a long list of other words here"),
+            record("c.md", title="Spin spin spin", category="Self", tags=["Spin"], body="spin spin spin spin"),
+            record("d.md", title="Untagged", category="Self", body="nothing related"),
+            record("e.md", title="", category="Pole Dance", body="untitled articles are skipped"),
+        ])
+
+        ranked = index.search(draft_category="Pole Dance", draft_content="spin climb", limit=3)
+
+        self.assertEqual([item.path for item in ranked], ["a.md", "b.md", "c.md"])
+        self.assertNotIn("e.md", [item.path for item in index.records])
+
+    def test_locations_match_phrases_not_scattered_words(self):
+        index = RelatedArticleIndex([
+            record("phrase.md", title="Studio night", body="Back at Trinity Pole Studio again", date="2025-01-01"),
+            record("scattered.md", title="Words", body="Pole class with Trinity, then a studio visit", date="2026-01-01"),
+        ])
+
+        ranked = index.search(likely_named_locations=["Trinity Pole Studio"], limit=1)
+
+        self.assertEqual([item.path for item in ranked], ["phrase.md"])
+
+    def test_locations_match_whole_words_only(self):
+        index = RelatedArticleIndex([
+            record("inside.md", title="Notes", body="A comparison of Trinity poles, then pole day", date="2026-01-01"),
+            record("paris.md", title="Trip", body="Dancing at Trinity\nPole in Paris", date="2025-01-01"),
+        ])
+
+        self.assertEqual(index._location_matches("paris"), [1])
+        self.assertEqual(index._location_matches("trinity pole"), [1])
+
+    def test_location_and_wording_never_outrank_a_tag(self):
+        words = "seattle climb invert handspring ayesha shoulder mount butterfly jade split"
+        index = RelatedArticleIndex([
+            record("tagged.md", title="Tagged", tags=["Spin"], body="unrelated words", date="2025-01-01"),
+            record("wordy.md", title="Seattle", body=words, date="2026-01-01"),
+            # "spin" is in most articles, so BM25 skips it and the tag match carries no wording score.
+            *(record(f"filler-{index}.md", title="Filler", body="spin notes", date="2024-01-01") for index in range(8)),
+        ])
+
+        ranked = index.search(draft_tags=["Spin"], likely_named_locations=["Seattle"], draft_content=words, limit=2)
+
+        self.assertEqual([item.path for item in ranked], ["tagged.md", "wordy.md"])
+
+    def test_pads_with_most_recent_articles_when_nothing_matches(self):
+        index = RelatedArticleIndex([
+            record("old.md", title="Old", date="2024-01-01"),
+            record("new.md", title="New", date="2026-01-01"),
+            record("mid.md", title="Mid", date="2025-01-01"),
+        ])
+
+        ranked = index.search(draft_content="zzzz", limit=2)
+
+        self.assertEqual([item.path for item in ranked], ["new.md", "mid.md"])
+
+    def test_index_is_rebuilt_only_when_corpus_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            articles_dir = Path(tmp) / "content" / "articles"
+            first = articles_dir / "2026" / "03" / "first.md"
+            first.parent.mkdir(parents=True)
+            first.write_text("Title: First\nCategory: Self\n\nBody.\n", encoding="utf-8")
+
+            index = related_article_index(articles_dir)
+            self.assertIs(related_article_index(articles_dir), index)
+
+            second = articles_dir / "2026" / "03" / "second.md"
+            second.write_text("Title: Second\nCategory: Self\n\nBody.\n", encoding="utf-8")
+            shared_corpus_index(articles_dir).notify_changed(second)
+
+            rebuilt = related_article_index(articles_dir)
+            self.assertIsNot(rebuilt, index)
+            self.assertEqual(len(rebuilt.records), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pelican-plugins"))
+
+from related_posts.related_posts import compute_related  # noqa: E402
+
+FIXTURE_POSTS = {
+    "spin.md": ("Pole Dance", "spin, flow", "Spin combos on a static pole with slow flow between the spins."),
+    "climb.md": ("Pole Dance", "climb", "Climbing drills for grip strength before the first invert."),
+    "invert.md": ("Pole Dance", "invert, climb", "Inverts need grip strength, core drills and patience."),
+    "flexibility.md": ("Training", "stretch", "Stretch routine for shoulders and hamstrings after pole class."),
+    "seattle.md": ("Travel", "seattle, ferry", "Ferry ride across the sound, coffee in Seattle afterwards."),
+    "coffee.md": ("Food", "coffee", "Notes on pour over coffee and the grinders we tried."),
+    "ferry.md": ("Travel", "ferry", "Island hopping by ferry with a thermos of coffee."),
+    "grip.md": ("Training", "grip", "Grip aids compared on chrome and brass poles."),
+}
+
+
+class RelatedPostsIncrementalTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.content_dir = Path(self.tmp.name) / "content"
+        self.content_dir.mkdir()
+        self.settings = {"CACHE_PATH": str(Path(self.tmp.name) / "cache")}
+        self.posts = {name: self.write_post(name, *post) for name, post in FIXTURE_POSTS.items()}
+
+    def write_post(self, name, category, tags, body):
+        path = self.content_dir / name
+        path.write_text(f"Title: {path.stem}\nCategory: {category}\nTags: {tags}\n\n{body}\n", encoding="utf-8")
+        return SimpleNamespace(
+            source_path=str(path),
+            title=path.stem,
+            _summary="",
+            _content=f"<p>{body}</p>",
+            tags=[tag.strip() for tag in tags.split(",")],
+            category=category,
+            date=datetime(2026, 3, len(name)),
+        )
+
+    def assert_matches_clean_build(self):
+        incremental, stats = compute_related(list(self.posts.values()), self.settings)
+        with tempfile.TemporaryDirectory() as clean_cache:
+            clean, _ = compute_related(list(self.posts.values()), {"CACHE_PATH": clean_cache})
+        self.assertEqual(incremental, clean)
+        return stats
+
+    def test_incremental_builds_match_clean_builds(self):
+        self.assertTrue(self.assert_matches_clean_build()["full"])
+
+        edits = [
+            # New vocabulary.
+            ("coffee.md", ("Food", "coffee", "Pour over coffee, espresso grinders and a zebra cafe review.")),
+            # Shared words added, so other posts' lists gain this one.
+            ("grip.md", ("Pole Dance", "grip, climb", "Grip strength drills, climbing and inverts on brass poles.")),
+            # Shared words removed, so posts that listed this one must look further down.
+            ("invert.md", ("Pole Dance", "invert", "Patience.")),
+            ("spin-flow.md", ("Pole Dance", "spin", "Spin flow for a spinning pole.")),
+            ("climb.md", None),
+        ]
+        for name, post in edits:
+            with self.subTest(name):
+                if post is None:
+                    del self.posts[name]
+                else:
+                    self.posts[name] = self.write_post(name, *post)
+                stats = self.assert_matches_clean_build()
+                self.assertFalse(stats["full"])
+                self.assertEqual(stats["changed"], 1)
+                self.assertLess(stats["rescored"], len(self.posts))
+
+        stats = self.assert_matches_clean_build()
+        self.assertEqual((stats["changed"], stats["rescored"]), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
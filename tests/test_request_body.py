@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from content_manager.services.article_generation import ArticleGenerator, GenerationRequest, data_url_for_path
+from content_manager.services.request_body import FileDataURL, StreamingJSONBody
+
+
+class StreamingJSONBodyTests(unittest.TestCase):
+    def test_body_matches_materialized_json_across_chunk_boundaries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = Path(tmp) / "first.jpg"
+            empty = Path(tmp) / "empty.png"
+            first.write_bytes(os.urandom(1000))
+            empty.write_bytes(b"")
+            payload = {
+                "model": "test-model",
+                "input": [
+                    {"type": "input_text", "text": 'quote " and unicode ☃'},
+                    {"type": "input_image", "image_url": FileDataURL(first, "image/jpeg")},
+                    {"type": "input_image", "image_url": FileDataURL(empty, "image/png")},
+                ],
+            }
+
+            body = StreamingJSONBody(payload, raw_chunk_bytes=30)
+            encoded = body.to_bytes()
+
+            expected = json.dumps({
+                "model": "test-model",
+                "input": [
+                    {"type": "input_text", "text": 'quote " and unicode ☃'},
+                    {"type": "input_image", "image_url": data_url_for_path(first)},
+                    {"type": "input_image", "image_url": "data:image/png;base64,"},
+                ],
+            }).encode("utf-8")
+            self.assertEqual(encoded, expected)
+            self.assertEqual(len(body), len(expected))
+            self.assertEqual(b"".join(body), encoded)
+
+    def test_generator_sends_streaming_body_to_capable_transport(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            image_path = Path(tmp) / "sample.jpg"
+            image_path.write_bytes(b"fake-image")
+            captured = {}
+
+            class StreamingTransport:
+                supports_streaming_body = True
+
+                def __call__(self, url, headers, data, timeout):
+                    captured["body"] = json.loads(b"".join(data))
+                    captured["length"] = len(data)
+                    return type("Response", (), {
+                        "raise_for_status": lambda self: None,
+                        "json": lambda self: {"output_text": json.dumps({
+                            "title_ideas": ["One", "Two", "Three"],
+                            "summary": "Summary",
+                            "category": "Self",
+                            "tags": [],
+                            "content_markdown": "Body",
+                        })},
+                    })()
+
+            generator = ArticleGenerator(api_key="test-key", model="test-model", request_fn=StreamingTransport())
+            generator.generate(GenerationRequest(
+                media_context=[{"name": "sample", "media_type": "image", "model_input_paths": [image_path]}],
+                canonical_job={"location_name": "Seattle", "captured_at": "2026-03-17T19:00:00", "time_of_day": "evening"},
+                warnings=[],
+                allowed_categories=["Self"],
+                allowed_tags=[],
+                likely_named_locations=[],
+            ))
+
+            user_content = captured["body"]["input"][1]["content"]
+            image_parts = [item for item in user_content if item["type"] == "input_image"]
+            self.assertEqual(image_parts[0]["image_url"], data_url_for_path(image_path))
+            self.assertGreater(captured["length"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
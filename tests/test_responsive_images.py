@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pelican-plugins"))
+
+from responsive_images import responsive_images  # noqa: E402
+from responsive_images.responsive_images import VariantPlanner  # noqa: E402
+
+
+class VariantPlannerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.images = self.root / "content" / "media" / "images"
+        self.images.mkdir(parents=True)
+        self.output = self.root / "output"
+        self.settings = {
+            "PATH": str(self.root / "content"),
+            "CACHE_PATH": str(self.root / "cache"),
+            "RESPONSIVE_IMAGES_WORKERS": 2,
+        }
+        self.write_image("wide.jpg", (1000, 500))
+        self.write_image("narrow.jpg", (300, 200))
+
+    def write_image(self, name, size):
+        Image.new("RGB", size, "teal").save(self.images / name)
+
+    def test_srcset_lists_only_encoded_variants_narrower_than_the_original(self):
+        planner = VariantPlanner(self.settings)
+        planner.plan('<p><img src="/media/images/wide.jpg"><img src="/media/images/narrow.jpg"></p>')
+
+        self.assertEqual(planner.srcset("images/wide.jpg", "/media/"), "")
+        self.assertEqual(planner.srcset("images/narrow.jpg", "/media/"), "")
+
+        planner.encode_pending()
+
+        self.assertEqual(planner.encoded, 2)
+        self.assertEqual(
+            planner.srcset("images/wide.jpg", "/media/"),
+            "/media/images/wide-360w.jpg 360w, /media/images/wide-720w.jpg 720w, /media/images/wide.jpg 1000w",
+        )
+        self.assertEqual(planner.srcset("images/narrow.jpg", "/media/"), "")
+
+    def test_failed_encodes_are_left_out_of_the_page_and_the_output(self):
+        planner = VariantPlanner(self.settings)
+        real_encode = responsive_images.encode_variant
+
+        def encode(encoder, source, target, width, settings):
+            if width == 720:
+                raise OSError("encoder crashed")
+            real_encode(encoder, source, target, width, settings)
+
+        planner.plan('<img src="/media/images/wide.jpg">')
+        with mock.patch.object(responsive_images, "encode_variant", encode), self.assertLogs(responsive_images.logger):
+            planner.encode_pending()
+
+        self.assertEqual(
+            planner.srcset("images/wide.jpg", "/media/", "/media/images/wide.jpg?v=1"),
+            "/media/images/wide-360w.jpg 360w, /media/images/wide.jpg?v=1 1000w",
+        )
+        stats = planner.publish(self.output)
+        self.assertEqual((stats["variants"], stats["encoded"], stats["failed"], stats["copied"]), (1, 1, 1, 1))
+        self.assertEqual(
+            sorted(path.name for path in (self.output / "media" / "images").iterdir()), ["wide-360w.jpg"]
+        )
+
+    def test_publish_prunes_variants_and_hashes_of_unused_images(self):
+        self.write_image("other.png", (800, 800))
+        first = VariantPlanner(self.settings)
+        first.plan('<img src="/media/images/wide.jpg"><img src="/media/images/other.png">')
+        first.encode_pending()
+        first.srcset("images/wide.jpg", "/media/")
+        first.publish(self.output)
+        cache_dir = self.root / "cache" / "responsive_images"
+        self.assertEqual(len([path for path in cache_dir.iterdir() if path.suffix != ".json"]), 4)
+
+        second = VariantPlanner(self.settings)
+        second.plan('<img src="/media/images/wide.jpg">')
+        second.encode_pending()
+        stats = second.publish(self.output)
+
+        self.assertEqual((stats["encoded"], stats["pruned"]), (0, 2))
+        self.assertEqual(sorted(path.suffix for path in cache_dir.iterdir()), [".jpg", ".jpg", ".json"])
+        index = json.loads((cache_dir / "index.json").read_text(encoding="utf-8"))
+        self.assertEqual(list(index["sources"]), [os.path.abspath(self.images / "wide.jpg")])
+
+
+if __name__ == "__main__":
+    unittest.main()
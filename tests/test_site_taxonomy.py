@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from content_manager.services.article_corpus import ArticleCorpusIndex, parse_article_file
+from content_manager.services.site_taxonomy import SiteTaxonomyIndex, build_site_taxonomy
+
+
+def write_article(path: Path, category: str, tags: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"Title: {path.stem}\nDate: 2026-03-05\nCategory: {category}\nTags: {tags}\n\nBody.\n", encoding="utf-8")
+    return path
+
+
+def touch_later(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class SiteTaxonomyIndexTests(unittest.TestCase):
+    def test_cold_start_reads_snapshot_and_parses_only_changed_articles(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            articles_dir = Path(tmp) / "content" / "articles"
+            snapshot_path = Path(tmp) / ".cache" / "site-taxonomy.json"
+            first = write_article(articles_dir / "2026" / "03" / "first.md", "Pole Dance", "Spin, Climb")
+            second = write_article(articles_dir / "2026" / "03" / "second.md", "pole dance", "spin")
+            write_article(articles_dir / "2026" / "03" / "third.md", "Self", "Notes")
+
+            warm = SiteTaxonomyIndex(ArticleCorpusIndex(articles_dir), snapshot_path=snapshot_path).taxonomy()
+            self.assertTrue(snapshot_path.exists())
+            self.assertEqual(warm.categories, ["Pole Dance", "Self"])
+            self.assertEqual(warm.tags_by_category["Pole Dance"], ["Spin", "Climb"])
+
+            parsed = []
+
+            def counting_parser(path):
+                parsed.append(path.name)
+                return parse_article_file(path)
+
+            cold = SiteTaxonomyIndex(ArticleCorpusIndex(articles_dir, parser=counting_parser), snapshot_path=snapshot_path)
+            self.assertEqual(cold.taxonomy(), warm)
+            self.assertEqual(parsed, [])
+
+            write_article(second, "Self", "Notes")
+            touch_later(second)
+            first.unlink()
+            corpus = ArticleCorpusIndex(articles_dir, parser=counting_parser)
+            taxonomy = SiteTaxonomyIndex(corpus, snapshot_path=snapshot_path).taxonomy()
+
+            self.assertEqual(parsed, ["second.md"])
+            self.assertEqual(taxonomy.categories, ["Self"])
+            self.assertEqual(taxonomy.tags, ["Notes"])
+            self.assertEqual(taxonomy.tags_by_category, {"Self": ["Notes"]})
+
+            # The corpus index keeps what the taxonomy asked it to parse.
+            self.assertEqual([record.source.name for record in corpus.records()], ["second.md", "third.md"])
+            self.assertEqual(parsed, ["second.md", "third.md"])
+
+    def test_notify_changed_applies_delta_matching_full_build(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            articles_dir = Path(tmp) / "content" / "articles"
+            write_article(articles_dir / "2026" / "03" / "a.md", "Travel", "seattle, Ferry")
+            capitalized = write_article(articles_dir / "2026" / "03" / "b.md", "Travel", "Seattle")
+            corpus = ArticleCorpusIndex(articles_dir, refresh_interval=3600)
+            index = SiteTaxonomyIndex(corpus, refresh_interval=3600)
+            self.assertEqual(index.taxonomy().tags, ["Seattle", "Ferry"])
+
+            capitalized.unlink()
+            index.notify_changed(capitalized)
+            published = write_article(articles_dir / "2026" / "04" / "c.md", "Food", "Ferry, Coffee")
+            corpus.notify_changed(published)
+            index.notify_changed(published)
+
+            records = [parse_article_file(path) for path in sorted(articles_dir.rglob("*.md"))]
+            self.assertEqual(index.taxonomy(), build_site_taxonomy(records))
+            self.assertEqual(index.taxonomy().tags, ["Ferry", "Coffee", "seattle"])
+            self.assertEqual(corpus.records(), records)
+
+
+if __name__ == "__main__":
+    unittest.main()
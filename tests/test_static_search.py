@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pelican-plugins"))
+
+from static_search.static_search import BASE36, build_index, plain_text  # noqa: E402
+
+
+def decode_shard(shard: dict) -> dict[str, list[tuple[int, int]]]:
+    """Undo front coding and delta-encoded doc ids, like theme/js/search.js."""
+    postings = {}
+    previous = ""
+    for entry, flat in zip(shard["terms"], shard["postings"]):
+        term = previous[:BASE36.index(entry[0])] + entry[1:]
+        doc_id = 0
+        pairs = []
+        for offset in range(0, len(flat), 2):
+            doc_id += flat[offset]
+            pairs.append((doc_id, flat[offset + 1]))
+        postings[term] = pairs
+        previous = term
+    return postings
+
+
+def document(url: str, title: str, tags: str, body_html: str) -> dict:
+    return {
+        "url": url,
+        "title": plain_text(title),
+        "date": "2026-03-01",
+        "tags": tags,
+        "summary": "",
+        "body": plain_text(body_html),
+    }
+
+
+class StaticSearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        documents = [
+            document("blog/pins.html", "Pins &amp; Patches", "pinball", "<p>Won a tiny pin tournament at Add-a-Ball.</p>"),
+            document("blog/crows.html", "Crow&#x27;s visit", "birds", "<p>The crow didn&#x27;t touch the pinball [[video crows.mp4]].</p>"),
+            document("blog/pinball.html", "Pinball league", "pinball", "<p>Pinball league night: pinball, pinball, pinball, pinball, pinball.</p>"),
+        ]
+        self.files = build_index(documents, docs_per_shard=2)
+        self.postings = {}
+        for name, payload in self.files.items():
+            if name.startswith("t-"):
+                self.postings.update(decode_shard(payload))
+
+    def test_postings_decode_to_weighted_documents(self):
+        self.assertEqual(self.postings["pinball"], [(0, 6), (1, 1), (2, 8 + 6 + 4)])
+        self.assertEqual(self.postings["crow"], [(1, 9)])
+        self.assertEqual(self.files["manifest.json"]["documents"], 3)
+        self.assertEqual(self.files["manifest.json"]["shards"].split(), sorted({term[:2] for term in self.postings}))
+        self.assertEqual([row[0] for row in self.files["d-0.json"] + self.files["d-1.json"]], [
+            "blog/pins.html", "blog/crows.html", "blog/pinball.html",
+        ])
+
+    def test_entities_and_markers_are_not_indexed(self):
+        for fragment in ("amp", "x27", "video", "mp4"):
+            self.assertNotIn(fragment, self.postings)
+        self.assertIn("didn", self.postings)
+        self.assertEqual(self.files["d-0.json"][0][1], "Pins & Patches")
+        self.assertEqual(self.files["d-0.json"][1][1], "Crow's visit")
+
+
+if __name__ == "__main__":
+    unittest.main()
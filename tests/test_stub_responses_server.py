@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import requests
+
+from benchmarks.stub_responses_server import StubResponsesServer, StubSettings
+from content_manager.services.article_generation import ArticleGenerator, GenerationRequest
+from content_manager.services.http_transport import PooledTransport
+
+
+def make_request(image_path: Path) -> GenerationRequest:
+    return GenerationRequest(
+        media_context=[{"name": "sample", "media_type": "image", "model_input_paths": [image_path]}],
+        canonical_job={"location_name": "Seattle", "captured_at": "2026-03-17T19:00:00", "time_of_day": "evening"},
+        warnings=[],
+        allowed_categories=["Self"],
+        allowed_tags=[],
+        likely_named_locations=[],
+    )
+
+
+class StubResponsesServerTests(unittest.TestCase):
+    def test_generator_round_trips_through_stub_and_logs_payload_size(self):
+        with tempfile.TemporaryDirectory() as tmp, StubResponsesServer() as server:
+            image_path = Path(tmp) / "sample.jpg"
+            image_path.write_bytes(b"x" * 3000)
+            generator = ArticleGenerator(api_key="stub", model="test-model", api_base=server.url)
+
+            result = generator.generate(make_request(image_path))
+            events = list(generator.generate_stream(make_request(image_path)))
+
+            self.assertEqual(result["category"], "Self")
+            self.assertEqual(len(result["title_ideas"]), 3)
+            self.assertTrue(any(event["type"] == "delta" for event in events))
+            self.assertEqual(events[-1]["result"]["summary"], result["summary"])
+            self.assertEqual([record.streamed for record in server.records], [False, True])
+            self.assertEqual(server.records[0].image_count, 1)
+            self.assertGreater(server.records[0].request_bytes, 4000)
+
+    def test_injected_errors_are_retried_by_transport(self):
+        with tempfile.TemporaryDirectory() as tmp, StubResponsesServer(
+            settings=StubSettings(error_rate=1.0, error_status=503),
+        ) as server:
+            image_path = Path(tmp) / "sample.jpg"
+            image_path.write_bytes(b"fake-image")
+            transport = PooledTransport(max_retries=2, sleep=lambda seconds: None)
+            generator = ArticleGenerator(api_key="stub", model="test-model", api_base=server.url, request_fn=transport)
+
+            with self.assertRaises(requests.HTTPError):
+                generator.generate(make_request(image_path))
+            self.assertEqual([record.status for record in server.records], [503, 503, 503])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from content_manager import app
+from content_manager.services.article_corpus import ArticleCorpusIndex, parse_article_file
+from content_manager.services.tag_suggestions import TagSuggestionIndex
+
+
+def write_article(articles_dir: Path, name: str, date: str, tags: str) -> Path:
+    path = articles_dir / "2026" / "03" / f"{name}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"Title: {name}\nDate: {date}\nCategory: Self\nTags: {tags}\n\nBody.\n", encoding="utf-8")
+    return path
+
+
+class TagSuggestionIndexTests(unittest.TestCase):
+    def test_recent_and_common_lists_follow_corpus_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            articles_dir = Path(tmp) / "content" / "articles"
+            write_article(articles_dir, "a", "2026-03-01", "Spin, Climb, Studio")
+            write_article(articles_dir, "b", "2026-03-02", "spin, Studio")
+            newest = write_article(articles_dir, "c", "2026-03-03", "Travel")
+            corpus = ArticleCorpusIndex(articles_dir, refresh_interval=3600)
+            index = TagSuggestionIndex(corpus, limit=2)
+
+            payload, etag = index.suggestions()
+            self.assertEqual(payload, {"recent": ["Travel", "spin"], "common": ["Studio", "Climb"]})
+            self.assertEqual(index.suggestions()[1], etag)
+
+            parsed = []
+            corpus.parser = lambda path: parsed.append(path.name) or parse_article_file(path)
+            write_article(articles_dir, "d", "2026-03-04", "Climb, Studio")
+            corpus.notify_changed(articles_dir / "2026" / "03" / "d.md")
+            newest.unlink()
+            corpus.notify_changed(newest)
+
+            payload, new_etag = index.suggestions()
+            self.assertEqual(parsed, ["d.md"])
+            self.assertEqual(payload, {"recent": ["Climb", "Studio"], "common": ["spin"]})
+            self.assertNotEqual(new_etag, etag)
+            self.assertEqual(payload, TagSuggestionIndex(corpus, limit=2).suggestions()[0])
+
+
+class TagSuggestionEndpointTests(unittest.TestCase):
+    def test_matching_etag_returns_not_modified(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            articles_dir = Path(tmp) / "content" / "articles"
+            write_article(articles_dir, "a", "2026-03-01", "Spin")
+            index = TagSuggestionIndex(ArticleCorpusIndex(articles_dir, refresh_interval=3600))
+            with patch.object(app, "tag_suggestions", index):
+                client = app.app.test_client()
+                first = client.get("/api/article/tags/suggestions")
+                self.assertEqual(first.status_code, 200)
+                self.assertEqual(first.get_json(), {"recent": ["Spin"], "common": []})
+                self.assertIn("no-cache", first.headers["Cache-Control"])
+
+                etag = first.headers["ETag"]
+                second = client.get("/api/article/tags/suggestions", headers={"If-None-Match": etag})
+                self.assertEqual(second.status_code, 304)
+                self.assertEqual(second.data, b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import re
+import sys
+import tempfile
+import unittest
+from html.parser import HTMLParser
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pelican-plugins"))
+
+from content_markers import content_markers  # noqa: E402
+from content_markers.content_markers import MarkerPosition, expand_markers, register_marker_handler  # noqa: E402
+from video_embed import video_embed  # noqa: E402
+from video_embed.video_embed import (  # noqa: E402
+    _truncate_blocks,
+    build_video_html,
+    feed_content,
+    finish_feeds,
+    preload_for,
+    render_video_marker,
+)
+
+PRELOAD_PATTERN = re.compile(r'preload="(\w+)"')
+
+
+class PreloadPolicyTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        saved = (dict(content_markers._handlers), dict(content_markers._handler_settings), dict(content_markers._memo))
+
+        def restore():
+            for registry, values in zip(
+                (content_markers._handlers, content_markers._handler_settings, content_markers._memo), saved
+            ):
+                registry.clear()
+                registry.update(values)
+
+        self.addCleanup(restore)
+        register_marker_handler("video", render_video_marker, settings=(
+            "VIDEO_EMBED_PRELOAD", "VIDEO_EMBED_PRELOAD_FIRST", "VIDEO_EMBED_FOLD_CHARS",
+        ))
+
+    def preloads(self, text, **settings):
+        settings = {"PATH": self.tmp.name, "VIDEO_EMBED_PROBE_CACHE": False, **settings}
+        instance = SimpleNamespace(settings=settings, source_path=f"{self.tmp.name}/post.md")
+        return PRELOAD_PATTERN.findall(expand_markers(text, instance))
+
+    def test_only_the_first_videos_keep_the_eager_preload(self):
+        text = "<p>[[video:one]]</p>\n<p>[[video:two]]</p>\n<p>[[video:three]]</p>"
+
+        self.assertEqual(self.preloads(text), ["metadata", "none", "none"])
+        self.assertEqual(
+            self.preloads(text, VIDEO_EMBED_PRELOAD="auto", VIDEO_EMBED_PRELOAD_FIRST=2),
+            ["auto", "auto", "none"],
+        )
+
+    def test_videos_below_the_fold_are_not_preloaded(self):
+        text = "<p>" + "Long intro. " * 200 + "</p>\n<p>[[video:late]]</p>"
+
+        self.assertEqual(self.preloads(text), ["none"])
+        self.assertEqual(self.preloads(text, VIDEO_EMBED_FOLD_CHARS=None), ["metadata"])
+        self.assertEqual(self.preloads(text, VIDEO_EMBED_FOLD_CHARS=5000), ["metadata"])
+
+    def test_preload_for_reads_position_index_and_offset(self):
+        settings = {"VIDEO_EMBED_FOLD_CHARS": 100}
+        self.assertEqual(preload_for(settings, MarkerPosition(0, 100)), "metadata")
+        self.assertEqual(preload_for(settings, MarkerPosition(0, 101)), "none")
+        self.assertEqual(preload_for(settings, MarkerPosition(1, 0)), "none")
+
+
+class OpenTags(HTMLParser):
+    def __init__(self, html):
+        super().__init__()
+        self.stack = []
+        self.feed(html)
+        self.close()
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in video_embed._VOID_ELEMENTS:
+            self.stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        pass
+
+    def handle_endtag(self, tag):
+        assert self.stack and self.stack[-1] == tag, (self.stack, tag)
+        self.stack.pop()
+
+
+class FeedContentTests(unittest.TestCase):
+    def setUp(self):
+        saved = (dict(video_embed._feed_memo), dict(video_embed._feed_stats))
+
+        def restore():
+            video_embed._feed_memo.clear()
+            video_embed._feed_memo.update(saved[0])
+            video_embed._feed_stats.update(saved[1])
+
+        self.addCleanup(restore)
+        finish_feeds(None)
+        self.rendered = []
+
+    def item(self, content, **settings):
+        item = SimpleNamespace(settings=settings, source_path="content/articles/2026/03/post.md", url="2026/03/post/")
+
+        def get_content(siteurl):
+            self.rendered.append(siteurl)
+            return content.replace("{SITEURL}", siteurl)
+
+        return item, get_content
+
+    def test_feed_content_is_memoized_per_item_site_url_and_cap(self):
+        video = build_video_html("clip", "", True, "embedded-video")
+        item, get_content = self.item(f'<p><a href="{{SITEURL}}/x">x</a></p>\n{video}')
+
+        feed = feed_content(item, "https://example.com", get_content)
+        self.assertEqual(feed_content(item, "https://example.com", get_content), feed)
+        self.assertNotIn("<video", feed)
+        self.assertIn('<img src="/media/video/clip.jpg" alt="Video" />', feed)
+        self.assertEqual(self.rendered, ["https://example.com"])
+
+        self.assertIn('href="https://mirror.example/x"', feed_content(item, "https://mirror.example", get_content))
+        item.settings["VIDEO_EMBED_FEED_MAX_CHARS"] = 20
+        self.assertIn("Continue reading", feed_content(item, "https://example.com", get_content))
+        self.assertEqual(len(self.rendered), 3)
+        self.assertEqual(video_embed._feed_stats["memo_hits"], 1)
+
+        finish_feeds(None)
+        feed_content(item, "https://example.com", get_content)
+        self.assertEqual(len(self.rendered), 4)
+
+    def test_truncation_cuts_between_top_level_elements_and_keeps_html_balanced(self):
+        blocks = [
+            "<p>Intro with <em>nested <strong>tags</strong></em> and a <br> break.</p>",
+            "<ul>\n<li>one</li>\n<li><p>two <img src=\"/a.jpg\" /></p></li>\n</ul>",
+            "<figure><img src=\"/b.jpg\"><figcaption>Caption</figcaption></figure>",
+            "<div><div><p>Deep</p></div></div>",
+        ]
+        content = "\n".join(blocks)
+        self.assertIsNone(_truncate_blocks(content, len(content)))
+        for max_chars in range(1, len(content)):
+            with self.subTest(max_chars=max_chars):
+                truncated = _truncate_blocks(content, max_chars)
+                if truncated is None:
+                    continue
+                self.assertEqual(OpenTags(truncated).stack, [])
+                kept = [index for index in range(1, len(blocks)) if "\n".join(blocks[:index]) == truncated]
+                self.assertEqual(len(kept), 1)
+                # The longest run of whole blocks that fits, or just the first block.
+                fits = [index for index in range(1, len(blocks)) if len("\n".join(blocks[:index])) <= max_chars]
+                self.assertEqual(kept[0], max(fits, default=1))
+
+    def test_truncated_feed_entries_end_with_a_continue_reading_link(self):
+        item, get_content = self.item("<p>" + "word " * 30 + "</p>\n<p>Second paragraph.</p>")
+        item.settings["VIDEO_EMBED_FEED_MAX_CHARS"] = 160
+
+        feed = feed_content(item, "https://example.com/", get_content)
+
+        self.assertEqual(OpenTags(feed).stack, [])
+        self.assertNotIn("Second paragraph", feed)
+        self.assertTrue(feed.endswith('<p><a href="https://example.com/2026/03/post/">Continue reading</a></p>'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+/*
+ * Instant search over the static index written by the static_search Pelican plugin.
+ * Nothing is fetched until the search box is used; after that only the manifest,
+ * the term shards for the typed prefixes and the document slices for hits load.
+ */
+(function () {
+    "use strict";
+
+    const form = document.querySelector("[data-static-search]");
+    if (!form) return;
+    const input = form.querySelector("input[type=search]");
+    const results = form.querySelector(".search-results");
+    const indexRoot = form.dataset.indexRoot.replace(/\/?$/, "/");
+    const siteRoot = form.dataset.siteRoot.replace(/\/?$/, "/");
+    const MAX_RESULTS = 8;
+    const MAX_TERM_LENGTH = 35;
+    // Keep in sync with STOP_WORDS in pelican-plugins/static_search/static_search.py.
+    const STOP_WORDS = new Set([
+        "the", "and", "for", "but", "not", "you", "are", "was", "all", "out", "its", "had", "has",
+        "this", "that", "with", "from", "have", "they", "them", "were", "what", "when", "just",
+        "into", "about", "there", "their", "then", "than", "very", "some", "been", "being",
+    ]);
+
+    const requests = new Map();
+    let manifest = null;
+    let sequence = 0;
+    let timer = null;
+
+    function fetchJson(name) {
+        if (!requests.has(name)) {
+            requests.set(name, fetch(indexRoot + name).then((res) => {
+                if (!res.ok) throw new Error(`${name}: ${res.status}`);
+                return res.json();
+            }).catch((err) => {
+                requests.delete(name);
+                throw err;
+            }));
+        }
+        return requests.get(name);
+    }
+
+    function tokenize(text) {
+        const folded = text.normalize("NFKD").replace(/[^\x00-\x7f]/g, "").toLowerCase();
+        return (folded.match(/[a-z0-9]+/g) || [])
+            .filter((term) => term.length >= 2 && term.length <= MAX_TERM_LENGTH && !STOP_WORDS.has(term));
+    }
+
+    async function loadManifest() {
+        if (!manifest) {
+            const data = await fetchJson("manifest.json");
+            manifest = { ...data, shardKeys: new Set(data.shards.split(" ").filter(Boolean)) };
+        }
+        return manifest;
+    }
+
+    async function loadShard(key) {
+        const shard = await fetchJson(`t-${key}.json`);
+        if (!shard.decoded) {
+            // Undo front coding: one base-36 digit of shared prefix, then the suffix.
+            let previous = "";
+            shard.decoded = shard.terms.map((entry) => {
+                const term = previous.slice(0, parseInt(entry[0], 36)) + entry.slice(1);
+                previous = term;
+                return term;
+            });
+        }
+        return shard;
+    }
+
+    async function scoresFor(token, index) {
+        const key = token.slice(0, index.prefix_length);
+        const scores = new Map();
+        if (!index.shardKeys.has(key)) return scores;
+        const shard = await loadShard(key);
+        const terms = shard.decoded;
+        let low = 0;
+        let high = terms.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (terms[mid] < token) low = mid + 1; else high = mid;
+        }
+        for (let position = low; position < terms.length && terms[position].startsWith(token); position += 1) {
+            const exact = terms[position] === token ? 2 : 1;
+            const postings = shard.postings[position];
+            let docId = 0;
+            for (let offset = 0; offset < postings.length; offset += 2) {
+                docId += postings[offset];
+                scores.set(docId, (scores.get(docId) || 0) + postings[offset + 1] * exact);
+            }
+        }
+        return scores;
+    }
+
+    async function search(text) {
+        const tokens = [...new Set(tokenize(text))];
+        if (!tokens.length) return [];
+        const index = await loadManifest();
+        const perToken = await Promise.all(tokens.map((token) => scoresFor(token, index)));
+        perToken.sort((a, b) => a.size - b.size);
+        const [first, ...rest] = perToken;
+        const ranked = [];
+        for (const [docId, score] of first) {
+            let total = score;
+            let matchesAll = true;
+            for (const other of rest) {
+                const value = other.get(docId);
+                if (value === undefined) { matchesAll = false; break; }
+                total += value;
+            }
+            if (matchesAll) ranked.push([docId, total]);
+        }
+        // Documents are stored newest first, so the id breaks ties toward recent posts.
+        ranked.sort((a, b) => b[1] - a[1] || a[0] - b[0]);
+        const top = ranked.slice(0, MAX_RESULTS);
+        const slices = await Promise.all(
+            [...new Set(top.map(([docId]) => Math.floor(docId / index.docs_per_shard)))]
+                .map(async (slice) => [slice, await fetchJson(`d-${slice}.json`)]),
+        );
+        const rows = new Map(slices);
+        return top.map(([docId]) => {
+            const [url, title, date] = rows.get(Math.floor(docId / index.docs_per_shard))[docId % index.docs_per_shard];
+            return { url, title, date };
+        });
+    }
+
+    function render(hits, text) {
+        results.replaceChildren();
+        if (!text.trim()) {
+            results.hidden = true;
+            return;
+        }
+        if (!hits.length) {
+            const empty = document.createElement("li");
+            empty.className = "search-empty";
+            empty.textContent = "No posts found";
+            results.append(empty);
+        }
+        for (const hit of hits) {
+            const item = document.createElement("li");
+            const link = document.createElement("a");
+            link.href = siteRoot + hit.url;
+            link.textContent = hit.title;
+            const date = document.createElement("time");
+            date.dateTime = hit.date;
+            date.textContent = hit.date;
+            item.append(link, " ", date);
+            results.append(item);
+        }
+        results.hidden = false;
+    }
+
+    input.addEventListener("input", () => {
+        clearTimeout(timer);
+        timer = setTimeout(async () => {
+            const current = ++sequence;
+            const text = input.value;
+            try {
+                const hits = await search(text);
+                if (current === sequence) render(hits, text);
+            } catch (err) {
+                if (current === sequence) render([], text);
+            }
+        }, 80);
+    });
+    input.addEventListener("focus", () => { loadManifest().catch(() => {}); }, { once: true });
+    input.addEventListener("keydown", (event) => {
+        if (event.key === "Escape") {
+            input.value = "";
+            render([], "");
+        }
+    });
+    form.addEventListener("submit", (event) => {
+        event.preventDefault();
+        const first = results.querySelector("a");
+        if (first) window.location.href = first.href;
+    });
+})();
@@ -81,11 +81,35 @@ def normalize_path(href: str, source_html: Path, output_dir: Path) -> Path | Non
     return abs_path
 
 
+def split_srcset(value: str) -> list[str]:
+    """Return the URLs of a srcset attribute ("a.jpg 360w, b.jpg 720w" -> [a.jpg, b.jpg])."""
+    urls = []
+    pos = 0
+    while pos < len(value):
+        # Skip separators, then the URL runs to the next whitespace
+        while pos < len(value) and (value[pos].isspace() or value[pos] == ','):
+            pos += 1
+        start = pos
+        while pos < len(value) and not value[pos].isspace():
+            pos += 1
+        url = value[start:pos]
+        if url.endswith(','):
+            # No descriptor: trailing commas end the candidate
+            url = url.rstrip(',')
+        else:
+            # Skip the descriptor up to the comma that ends the candidate
+            while pos < len(value) and value[pos] != ',':
+                pos += 1
+        if url:
+            urls.append(url)
+    return urls
+
+
 def extract_references(html_file: Path, output_dir: Path) -> dict[str, list[str]]:
     """Extract all href/src references from HTML file."""
     refs = {
         'links': [],      # <a href>
-        'images': [],     # <img src>
+        'images': [],     # <img src>, <img srcset>, <source srcset>
         'videos': [],     # <source src> in <video>
         'posters': [],    # <video poster>
         'audio': [],      # <audio src>
@@ -112,6 +136,10 @@ def extract_references(html_file: Path, output_dir: Path) -> dict[str, list[str]
     for img in soup.find_all('img', src=True):
         refs['images'].append(img['src'])
     
+    # Extract every candidate of <img srcset> and <picture><source srcset>
+    for tag in soup.find_all(['img', 'source'], srcset=True):
+        refs['images'].extend(split_srcset(tag['srcset']))
+    
     # Extract <video poster> and <source src>
     for video in soup.find_all('video'):
         if video.get('poster'):